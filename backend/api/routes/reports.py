@@ -1,22 +1,26 @@
 """Routes relatives à l'export des rapports."""
 from __future__ import annotations
 
-from pathlib import Path
-
 from fastapi import APIRouter
+from fastapi.responses import Response
 
 from backend.api.routes.projects import _build_sci
 from backend.api.schemas.project_schema import SCIProjectSchema
-from backend.api.schemas.response_schema import ReportResponse
 from backend.services.export_service import ExportService
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
 
-@router.post("/excel", response_model=ReportResponse)
-async def export_excel(payload: SCIProjectSchema) -> ReportResponse:
+@router.post("/excel", response_class=Response)
+async def export_excel(payload: SCIProjectSchema) -> Response:
     sci = _build_sci(payload)
     service = ExportService.from_sci(sci)
-    dossier = Path("/tmp/sci-exports")
-    chemin = service.export_excel(dossier)
-    return ReportResponse(fichier=chemin.name, chemin=str(chemin))
+    # Construit en mémoire : ni fichier temporaire ni collision entre requêtes
+    contenu = service.export_excel_flux().getvalue()
+    return Response(
+        content=contenu,
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="analyse_sci.xlsx"'},
+    )
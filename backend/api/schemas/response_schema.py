@@ -7,8 +7,3 @@ from pydantic import BaseModel
 class AnalysisResponse(BaseModel):
     message: str
     projection: List[Dict[str, Any]]
-
-
-class ReportResponse(BaseModel):
-    fichier: str
-    chemin: str
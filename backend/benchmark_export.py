@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'export Excel : exporteur de référence, mode standard et mode écriture seule
+Construit un portefeuille fictif de N biens financés à crédit et mesure la
+génération complète du classeur en mémoire : meilleur temps, pic de mémoire
+Python (tracemalloc, sur une exécution séparée) et taille du fichier.
+
+L'exporteur de référence est un exporteur_sci.py antérieur à l'écriture par
+colonnes et aux styles nommés, extrait par exemple avec
+``git show <commit>:backend/exporteur_sci.py > /tmp/exporteur_reference.py`` ;
+sans lui, seuls les deux modes actuels sont comparés.
+
+Usage : python benchmark_export.py [nombre_biens] [duree_annees] [repetitions] [exporteur_reference]
+"""
+
+import importlib.util
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+from openpyxl import Workbook
+
+from sci_analyser import SCI, Bien, Credit, AppartementLocation
+from exporteur_sci import ExporteurSCI
+
+
+def creer_portefeuille(nombre_biens: int) -> SCI:
+    """Crée une SCI de ``nombre_biens`` biens, chacun avec un crédit de 20 à 25 ans"""
+    sci = SCI(
+        nom="SCI Benchmark",
+        annee_creation=2025,
+        capital_social=1000,
+        nombre_associes=2,
+        crl_taux=0.025,
+        frais_comptable_annuel=1500,
+        frais_bancaire_annuel=500
+    )
+    for numero in range(1, nombre_biens + 1):
+        prix = 100000 + 5000 * (numero % 20)
+        sci.ajouter_bien(Bien(
+            numero=numero,
+            nom=f"Bien {numero}",
+            annee_achat=2025 + numero % 5,
+            prix_achat=prix,
+            frais_agence=5000,
+            frais_notaire=prix * 0.08,
+            travaux=10000,
+            apport_sci=10000,
+            credit=Credit(
+                capital_emprunte=prix,
+                taux_annuel=0.035,
+                duree_annees=20 + numero % 6,
+                frais_dossier=1000,
+                frais_garantie=1500
+            ),
+            appartements=[AppartementLocation(lot, 450 + 25 * lot, 35) for lot in range(1, 5)],
+            taxe_fonciere=1500,
+            charges_copro=600
+        ))
+    return sci
+
+
+def charger_reference(chemin: str):
+    """Module exporteur_sci de référence chargé depuis son chemin"""
+    spec = importlib.util.spec_from_file_location("exporteur_sci_reference", chemin)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def generer_reference(module, sci: SCI, duree_annees: int) -> BytesIO:
+    """Classeur de l'exporteur de référence, construit comme generer_excel_complet mais enregistré en mémoire"""
+    exporteur = module.ExporteurSCI(sci)
+    exporteur.workbook = Workbook()
+    exporteur.workbook.remove(exporteur.workbook.active)
+    exporteur._creer_onglet_synthese_generale()
+    exporteur._creer_onglet_synthese_biens()
+    exporteur._creer_onglet_projection_financiere(duree_annees)
+    exporteur._creer_onglet_compte_resultat(duree_annees)
+    exporteur._creer_onglet_tresorerie(duree_annees)
+    for bien in sci.biens:
+        exporteur._creer_onglet_bien_detail(bien)
+        if bien.credit:
+            exporteur._creer_onglet_credit_bien(bien)
+    exporteur._creer_onglet_graphiques(duree_annees)
+    flux = BytesIO()
+    exporteur.workbook.save(flux)
+    return flux
+
+
+def mesurer(generer, repetitions: int):
+    """Meilleur temps de génération (secondes), pic de mémoire et taille du classeur (octets)"""
+    meilleur, taille = float("inf"), 0
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        flux = generer()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+        taille = len(flux.getbuffer())
+
+    tracemalloc.start()
+    generer()
+    pic = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return meilleur, pic, taille
+
+
+def main():
+    nombre_biens = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    duree_annees = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    repetitions = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    reference = charger_reference(sys.argv[4]) if len(sys.argv) > 4 else None
+
+    sci = creer_portefeuille(nombre_biens)
+    # Projection et tableaux d'amortissement mis en cache avant les mesures
+    ExporteurSCI(sci, ecriture_seule=True).generer_excel_flux(duree_annees)
+
+    variantes = []
+    if reference is not None:
+        variantes.append(("Exporteur de référence", lambda: generer_reference(reference, sci, duree_annees)))
+    variantes += [
+        ("Mode standard", lambda: ExporteurSCI(sci).generer_excel_flux(duree_annees)),
+        ("Mode écriture seule", lambda: ExporteurSCI(sci, ecriture_seule=True).generer_excel_flux(duree_annees)),
+    ]
+
+    print(f"📊 Export Excel - {nombre_biens} biens, {duree_annees} ans, meilleur de {repetitions}")
+    base = None
+    for libelle, generer in variantes:
+        duree, pic, taille = mesurer(generer, repetitions)
+        base = base or duree
+        print(
+            f"   {libelle + ':':<24}{duree:>8.2f} s  x{base / duree:>4.1f}  "
+            f"pic {pic / 2**20:>7.1f} Mo  ({taille / 1024:,.0f} Ko)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 """Amortissement calculator module."""
 """Amortissement calculator for SCI assets."""
 from dataclasses import dataclass
-from typing import Dict, TYPE_CHECKING
+from typing import Dict, Sequence, TYPE_CHECKING
+
+import numpy as np
 
 if TYPE_CHECKING:  # pragma: no cover - used for type checking only
     from backend.core.models.bien import Bien
@@ -18,6 +20,28 @@ class AmortissementConfig:
     FRAIS_AGENCE: int = 30
 
 
+COMPOSANTES = ("murs", "travaux", "meubles", "frais_notaire", "frais_agence")
+
+
+@dataclass
+class MatriceAmortissements:
+    """Amortissements de plusieurs biens, de forme ``(biens, années, composantes)``.
+
+    L'ordre des composantes est celui de :data:`COMPOSANTES`.
+    """
+
+    annees: np.ndarray
+    bases: np.ndarray
+    dotations: np.ndarray
+    cumuls: np.ndarray
+    valeurs_nettes: np.ndarray
+
+    @property
+    def dotations_annuelles(self) -> np.ndarray:
+        """Total des dotations de tous les biens, par année."""
+        return self.dotations.sum(axis=(0, 2))
+
+
 class AmortissementCalculator:
     """Calculateur d'amortissements isolé et testable."""
 
@@ -35,6 +59,53 @@ class AmortissementCalculator:
             "frais_agence": self._amortir_frais_agence(bien, annees_depuis_achat),
         }
 
+    def calculer_annees(self, bien: "Bien", annees) -> Dict[str, np.ndarray]:
+        """Calcule les amortissements d'un bien pour un tableau d'années."""
+        dotations = self.calculer_matrice([bien], annees).dotations[0]
+        return {composante: dotations[:, i] for i, composante in enumerate(COMPOSANTES)}
+
+    def calculer_matrice(self, biens: Sequence["Bien"], annees) -> MatriceAmortissements:
+        """Calcule les dotations de plusieurs biens sur plusieurs années en une passe.
+
+        Les bases amortissables ``(biens, composantes)`` sont diffusées sur les
+        années écoulées depuis l'achat ``(biens, années)`` ; les cumuls se
+        déduisent directement du nombre d'annuités déjà passées.
+        """
+        annees = np.atleast_1d(np.asarray(annees))
+        config = self.config
+        durees = np.array(
+            [config.MURS, config.TRAVAUX, config.MEUBLES, config.FRAIS_NOTAIRE, config.FRAIS_AGENCE],
+            dtype=float,
+        )
+        bases = np.array(
+            [
+                (
+                    bien.prix_achat - bien.travaux,
+                    bien.travaux if bien.travaux > 0 else 0.0,
+                    bien.meubles if bien.meubles > 0 else 0.0,
+                    bien.frais_notaire,
+                    bien.frais_agence,
+                )
+                for bien in biens
+            ],
+            dtype=float,
+        ).reshape(len(biens), len(COMPOSANTES))
+        annees_achat = np.array([bien.annee_achat for bien in biens], dtype=float)
+
+        annees_depuis_achat = (annees[np.newaxis, :] - annees_achat[:, np.newaxis] + 1)[..., np.newaxis]
+        annuites = bases[:, np.newaxis, :] / durees
+        actives = (annees_depuis_achat >= 1) & (annees_depuis_achat <= durees)
+        dotations = np.where(actives, annuites, 0.0)
+        cumuls = annuites * np.clip(annees_depuis_achat, 0, durees)
+
+        return MatriceAmortissements(
+            annees=annees,
+            bases=bases,
+            dotations=dotations,
+            cumuls=cumuls,
+            valeurs_nettes=bases[:, np.newaxis, :] - cumuls,
+        )
+
     def _amortir_murs(self, bien: "Bien", annees: int) -> float:
         if 1 <= annees <= self.config.MURS:
             return (bien.prix_achat - bien.travaux) / self.config.MURS
@@ -1,24 +1,134 @@
 """Fiscal projection helpers for the SCI analyser."""
 from __future__ import annotations
 
-from typing import Dict, TYPE_CHECKING
+import math
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
 
 if TYPE_CHECKING:  # pragma: no cover
     from backend.core.models.sci import SCI
 
 
+@dataclass(frozen=True)
+class BaremeIS:
+    """Barème progressif de l'IS : taux marginal applicable au-delà de chaque seuil."""
+
+    seuils: Tuple[float, ...]
+    taux: Tuple[float, ...]
+
+    def __post_init__(self) -> None:
+        if len(self.seuils) != len(self.taux) or not self.seuils:
+            raise ValueError("Un barème IS doit avoir autant de seuils que de taux")
+        if self.seuils[0] != 0 or any(b <= a for a, b in zip(self.seuils, self.seuils[1:])):
+            raise ValueError("Les seuils d'un barème IS doivent partir de 0 et être croissants")
+
+
+# Barèmes PME (taux réduit sur la première tranche), par premier exercice d'application
+BAREMES_IS_HISTORIQUES: Dict[int, BaremeIS] = {
+    2019: BaremeIS((0, 38_120, 500_000), (0.15, 0.28, 0.31)),
+    2020: BaremeIS((0, 38_120), (0.15, 0.28)),
+    2021: BaremeIS((0, 38_120), (0.15, 0.265)),
+    2022: BaremeIS((0, 38_120), (0.15, 0.25)),
+    2023: BaremeIS((0, 42_500), (0.15, 0.25)),
+}
+
+
 class FiscalCalculator:
-    """Gestion des calculs fiscaux (IS et compte de résultat)."""
+    """Gestion des calculs fiscaux (IS et compte de résultat).
+
+    ``baremes`` associe à chaque exercice le barème qui s'applique à partir de
+    celui-ci (le premier couvre aussi les exercices antérieurs) ; par défaut,
+    le barème en vigueur (15 % jusqu'à ``seuil_taux_reduit``, 25 % au-delà)
+    pour toutes les années. Avec ``report_deficits``, les déficits sont
+    reportés sans limite de durée sur les bénéfices suivants ; le plafond
+    d'imputation (1 M€ plus 50 % de l'excédent) n'est pas modélisé.
+    """
 
     seuil_taux_reduit: float = 42_500
 
-    def calculer_is(self, resultat_avant_impot: float) -> float:
-        """Calcule l'impôt sur les sociétés selon les tranches en vigueur."""
-        if resultat_avant_impot <= 0:
-            return 0.0
-        if resultat_avant_impot <= self.seuil_taux_reduit:
-            return resultat_avant_impot * 0.15
-        return self.seuil_taux_reduit * 0.15 + (resultat_avant_impot - self.seuil_taux_reduit) * 0.25
+    def __init__(
+        self, baremes: Optional[Mapping[int, BaremeIS]] = None, report_deficits: bool = False
+    ) -> None:
+        self.baremes = dict(sorted(baremes.items())) if baremes else None
+        self.report_deficits = report_deficits
+        self._cache_tables: Tuple = (None, None)
+
+    def bareme(self, annee: Optional[int] = None) -> BaremeIS:
+        """Barème applicable à l'exercice ``annee``."""
+        if not self.baremes:
+            return BaremeIS((0, self.seuil_taux_reduit), (0.15, 0.25))
+        exercices = list(self.baremes)
+        if annee is None:
+            return self.baremes[exercices[-1]]
+        return self.baremes[exercices[max(bisect_right(exercices, annee) - 1, 0)]]
+
+    def _tranches(self, annees: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Seuils, taux et largeurs des tranches, de forme ``(tranches,)`` ou ``(tranches, années)``."""
+        exercices, seuils, taux, largeurs = self._tables()
+        if annees is None or len(exercices) == 1:
+            return seuils[-1], taux[-1], largeurs[-1]
+        indices = np.maximum(np.searchsorted(exercices, annees, side="right") - 1, 0)
+        return seuils[indices].T, taux[indices].T, largeurs[indices].T
+
+    def _tables(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Barèmes complétés à un même nombre de tranches, mémorisés tant qu'ils ne changent pas."""
+        cle = (self.seuil_taux_reduit, tuple(self.baremes.items()) if self.baremes else None)
+        if self._cache_tables[0] != cle:
+            baremes = self.baremes or {0: self.bareme()}
+            nombre_tranches = max(len(bareme.seuils) for bareme in baremes.values())
+            seuils = np.full((len(baremes), nombre_tranches), np.inf)
+            taux = np.zeros((len(baremes), nombre_tranches))
+            for i, bareme in enumerate(baremes.values()):
+                seuils[i, : len(bareme.seuils)] = bareme.seuils
+                taux[i, : len(bareme.taux)] = bareme.taux
+            with np.errstate(invalid="ignore"):
+                largeurs = np.nan_to_num(np.diff(seuils, axis=1, append=np.inf), nan=np.inf)
+            exercices = np.fromiter(baremes, dtype=float)
+            self._cache_tables = (cle, (exercices, seuils, taux, largeurs))
+        return self._cache_tables[1]
+
+    def imputer_deficits(self, resultats_avant_impot: np.ndarray) -> np.ndarray:
+        """Bases imposables après report des déficits antérieurs, le long du dernier axe (les années).
+
+        Le cumul des bases imposables est le maximum courant du cumul
+        (positif) des résultats : une somme cumulée puis un maximum cumulé.
+        """
+        resultats = np.asarray(resultats_avant_impot, dtype=float)
+        cumul = np.maximum.accumulate(np.maximum(np.cumsum(resultats, axis=-1), 0.0), axis=-1)
+        return np.diff(cumul, axis=-1, prepend=0.0)
+
+    def calculer_is(self, resultat_avant_impot: float, annee: Optional[int] = None) -> float:
+        """Calcule l'impôt sur les sociétés selon le barème de l'exercice ``annee``."""
+        bareme = self.bareme(annee)
+        base = max(float(resultat_avant_impot), 0.0)
+        impot = 0.0
+        for seuil, taux, seuil_suivant in zip(bareme.seuils, bareme.taux, (*bareme.seuils[1:], math.inf)):
+            impot += taux * min(max(base - seuil, 0.0), seuil_suivant - seuil)
+        return impot
+
+    def calculer_is_tableau(
+        self, resultats_avant_impot: np.ndarray, annees: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Version vectorisée de :meth:`calculer_is` pour un tableau de résultats.
+
+        ``annees`` (dernier axe) sélectionne le barème de chaque colonne ; le
+        report des déficits éventuel est appliqué le long de ce même axe.
+        """
+        resultats = np.asarray(resultats_avant_impot, dtype=float)
+        if self.report_deficits:
+            resultats = self.imputer_deficits(resultats)
+        return self._appliquer_bareme(resultats, annees)
+
+    def _appliquer_bareme(self, resultats: np.ndarray, annees: Optional[np.ndarray]) -> np.ndarray:
+        seuils, taux, largeurs = self._tranches(annees)
+        bases = np.maximum(resultats, 0.0)
+        impot = np.zeros_like(bases)
+        for seuil, taux_tranche, largeur in zip(seuils, taux, largeurs):
+            impot += taux_tranche * np.clip(bases - seuil, 0.0, largeur)
+        return impot
 
     def calculer_resultat_annuel(self, sci: "SCI", annee: int) -> Dict[str, float]:
         """Construit le compte de résultat d'une année donnée."""
@@ -27,14 +137,18 @@ class FiscalCalculator:
         interets = sci.calculer_interets_credits(annee)
         amortissements = sci.calculer_amortissements_annee(annee)
 
-        frais_exceptionnels = 0.0
-        for bien in sci.biens:
-            if annee == bien.annee_achat and bien.credit:
-                frais_exceptionnels += bien.credit.frais_dossier + bien.credit.frais_garantie
+        frais_exceptionnels = sci.index_acquisitions().frais_credit.get(annee, 0.0)
 
         resultat_exploitation = revenus - charges_exploitation - amortissements - frais_exceptionnels
         resultat_avant_impot = resultat_exploitation - interets
-        impot_societes = self.calculer_is(resultat_avant_impot)
+        if self.report_deficits and annee > sci.annee_creation:
+            # Le report des déficits dépend des exercices précédents : on les reprend de la projection
+            anterieurs = sci.calculer_projection(annee - sci.annee_creation).colonnes["resultat_avant_impot"]
+            resultats = np.append(anterieurs, resultat_avant_impot)
+            annees = sci.annee_creation + np.arange(len(resultats))
+            impot_societes = float(self.calculer_is_tableau(resultats, annees)[-1])
+        else:
+            impot_societes = self.calculer_is(resultat_avant_impot, annee)
         resultat_net = resultat_avant_impot - impot_societes
 
         return {
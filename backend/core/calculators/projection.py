@@ -0,0 +1,228 @@
+"""Columnar multi-year projection engine for SCI projects."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Sequence, TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from backend.core.calculators.fiscal import FiscalCalculator
+
+if TYPE_CHECKING:  # pragma: no cover
+    from backend.core.models.bien import Bien
+    from backend.core.models.sci import SCI
+
+
+COLONNES_COMPTE_RESULTAT = (
+    "annee",
+    "revenus_locatifs",
+    "charges_exploitation",
+    "frais_exceptionnels",
+    "amortissements",
+    "resultat_exploitation",
+    "interets_credits",
+    "resultat_avant_impot",
+    "impot_societes",
+    "resultat_net",
+)
+
+COLONNES_TRESORERIE = (
+    "annee",
+    "encaissements",
+    "decaissements",
+    "mensualites_credit",
+    "cashflow",
+    "apport_initial",
+    "tresorerie_realisee",
+    "reserves_debut",
+    "resultat_net",
+    "reserves_fin",
+)
+
+COLONNES_PROJECTION = COLONNES_COMPTE_RESULTAT + tuple(
+    colonne for colonne in COLONNES_TRESORERIE if colonne not in COLONNES_COMPTE_RESULTAT
+)
+
+# Montants additifs bien par bien, à partir desquels toutes les colonnes sont dérivées
+COLONNES_FLUX = (
+    "revenus",
+    "charges_biens",
+    "interets",
+    "amortissements",
+    "frais_exceptionnels",
+    "mensualites",
+    "sorties_apport",
+)
+
+
+@dataclass
+class ProjectionAnnuelle:
+    """Résultat d'une projection : une colonne NumPy par indicateur, une valeur par année.
+
+    ``flux`` conserve les sommes additives des biens pour permettre une mise à
+    jour incrémentale lors de l'ajout d'un bien ou d'un apport.
+    """
+
+    colonnes: Dict[str, np.ndarray]
+    flux: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def duree_annees(self) -> int:
+        return len(self.colonnes["annee"])
+
+    def tronquer(self, duree_annees: int) -> "ProjectionAnnuelle":
+        """Restreint la projection à ses ``duree_annees`` premières années (vues sans copie)."""
+        return ProjectionAnnuelle(
+            {nom: colonne[:duree_annees] for nom, colonne in self.colonnes.items()},
+            {nom: colonne[:duree_annees] for nom, colonne in self.flux.items()},
+        )
+
+    def _vue(self, colonnes: tuple) -> pd.DataFrame:
+        if self.duree_annees == 0:
+            return pd.DataFrame()
+        return pd.DataFrame({colonne: self.colonnes[colonne] for colonne in colonnes})
+
+    def projection(self) -> pd.DataFrame:
+        """Compte de résultat et trésorerie réunis (format de ``generer_projection``)."""
+        return self._vue(COLONNES_PROJECTION)
+
+    def compte_resultat(self) -> pd.DataFrame:
+        """Compte de résultat pluriannuel."""
+        return self._vue(COLONNES_COMPTE_RESULTAT)
+
+    def tresorerie(self) -> pd.DataFrame:
+        """Évolution de la trésorerie."""
+        return self._vue(COLONNES_TRESORERIE)
+
+
+class ProjectionCalculator:
+    """Construit toutes les années d'une projection en une seule passe vectorisée.
+
+    Chaque bien est parcouru une fois et contribue à des colonnes couvrant
+    l'ensemble de l'horizon ; seul le report des réserves est séquentiel
+    (une somme cumulée).
+    """
+
+    def __init__(self, fiscal_calculator: FiscalCalculator | None = None) -> None:
+        self.fiscal_calculator = fiscal_calculator or FiscalCalculator()
+
+    def calculer(self, sci: "SCI", duree_annees: int = 20) -> ProjectionAnnuelle:
+        """Calcule la projection de ``sci`` sur ``duree_annees`` années."""
+        duree_annees = max(int(duree_annees), 0)
+        annees = sci.annee_creation + np.arange(duree_annees)
+        flux = {nom: np.zeros(duree_annees) for nom in COLONNES_FLUX}
+        self._cumuler_biens(sci, sci.biens, annees, flux)
+        return self.completer(sci, annees, flux)
+
+    def ajouter_biens(
+        self, sci: "SCI", projection: ProjectionAnnuelle, biens: Sequence["Bien"]
+    ) -> ProjectionAnnuelle:
+        """Met à jour une projection existante avec des biens ajoutés à ``sci``.
+
+        Seules les années postérieures à l'achat de chaque nouveau bien sont
+        modifiées ; l'IS, le cash-flow et les réserves sont ensuite redérivés.
+        """
+        annees = projection.colonnes["annee"]
+        flux = {nom: colonne.copy() for nom, colonne in projection.flux.items()}
+        self._cumuler_biens(sci, biens, annees, flux)
+        return self.completer(sci, annees, flux)
+
+    def actualiser(self, sci: "SCI", projection: ProjectionAnnuelle) -> ProjectionAnnuelle:
+        """Redérive les colonnes d'une projection après un changement d'apports CCA."""
+        return self.completer(sci, projection.colonnes["annee"], projection.flux)
+
+    def _cumuler_biens(
+        self, sci: "SCI", biens: Sequence["Bien"], annees: np.ndarray, flux: Dict[str, np.ndarray]
+    ) -> None:
+        for bien in biens:
+            debut = int(np.searchsorted(annees, bien.annee_achat))
+            if debut >= len(annees):
+                continue
+            periode = annees[debut:]
+            annee_achat = periode == bien.annee_achat
+
+            flux["revenus"][debut:] += bien.revenus_annuels
+            flux["charges_biens"][debut:] += bien.charges_annuelles
+            flux["sorties_apport"][debut:] += np.where(annee_achat, bien.apport_sci, 0.0)
+
+            if bien.credit:
+                credit = bien.credit
+                flux["interets"][debut:] += credit.agreger_annees(periode - bien.annee_achat + 1)["interets"]
+                flux["frais_exceptionnels"][debut:] += np.where(
+                    annee_achat, credit.frais_dossier + credit.frais_garantie, 0.0
+                )
+                flux["mensualites"][debut:] += credit.calculer_mensualite() * 12
+
+        if biens:
+            matrice = sci.amortissement_calculator.calculer_matrice(biens, annees)
+            flux["amortissements"] += matrice.dotations_annuelles
+
+    def completer(
+        self,
+        sci: "SCI",
+        annees: np.ndarray,
+        flux: Dict[str, np.ndarray],
+        charges_fixes: np.ndarray | float | None = None,
+    ) -> ProjectionAnnuelle:
+        """Dérive toutes les colonnes de la projection à partir des flux additifs.
+
+        Les flux peuvent porter des dimensions supplémentaires devant l'axe des
+        années (par exemple ``(scénarios, années)``) : le calcul est alors fait
+        pour toutes les lignes à la fois. ``charges_fixes`` remplace les
+        charges fixes annuelles de la SCI, par exemple pour les indexer sur
+        l'inflation de chaque scénario.
+        """
+        revenus = flux["revenus"]
+        frais_exceptionnels = flux["frais_exceptionnels"]
+        sorties_apport = flux["sorties_apport"]
+        if charges_fixes is None:
+            charges_fixes = sci.charges_fixes_annuelles
+
+        charges = charges_fixes + flux["charges_biens"] + revenus * sci.crl_taux
+        resultat_exploitation = revenus - charges - flux["amortissements"] - frais_exceptionnels
+        resultat_avant_impot = resultat_exploitation - flux["interets"]
+        impot_societes = self.fiscal_calculator.calculer_is_tableau(resultat_avant_impot, annees)
+        resultat_net = resultat_avant_impot - impot_societes
+
+        apport_initial = np.zeros_like(revenus)
+        # Fonds apportés par les associés chaque année : capital à la création,
+        # apports CCA de l'année et apports de la SCI aux acquisitions
+        apports_associes = sorties_apport.copy()
+        if len(annees):
+            apports_cca = sci.index_acquisitions().apports_cca
+            apports_associes += np.array([apports_cca.get(int(annee), 0.0) for annee in annees])
+            apports_associes[..., 0] += sci.capital_social
+            apports_creation = apports_cca.get(sci.annee_creation, 0.0)
+            apport_initial[..., 0] = sci.capital_social + apports_creation + sorties_apport[..., 0]
+
+        decaissements = charges + frais_exceptionnels + impot_societes + flux["mensualites"]
+        cashflow = revenus - decaissements
+        reserves_fin = np.cumsum(resultat_net, axis=-1)
+        reserves_debut = np.zeros_like(reserves_fin)
+        reserves_debut[..., 1:] = reserves_fin[..., :-1]
+
+        return ProjectionAnnuelle(
+            {
+                "annee": annees,
+                "revenus_locatifs": revenus,
+                "charges_exploitation": charges,
+                "frais_exceptionnels": frais_exceptionnels,
+                "amortissements": flux["amortissements"],
+                "resultat_exploitation": resultat_exploitation,
+                "interets_credits": flux["interets"],
+                "resultat_avant_impot": resultat_avant_impot,
+                "impot_societes": impot_societes,
+                "resultat_net": resultat_net,
+                "encaissements": revenus,
+                "decaissements": decaissements,
+                "mensualites_credit": flux["mensualites"],
+                "cashflow": cashflow,
+                "apport_initial": apport_initial,
+                "apports_associes": apports_associes,
+                "tresorerie_realisee": cashflow + apport_initial - sorties_apport,
+                "reserves_debut": reserves_debut,
+                "reserves_fin": reserves_fin,
+            },
+            flux,
+        )
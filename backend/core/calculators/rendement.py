@@ -0,0 +1,165 @@
+"""Investment-return metrics (TRI, VAN, multiple, payback) on equity cash flows."""
+from __future__ import annotations
+
+from typing import Dict, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover
+    from backend.core.calculators.projection import ProjectionAnnuelle
+    from backend.core.models.sci import SCI
+
+# Borne basse de recherche du TRI (-99 %) : au-delà, l'actualisation n'a plus de sens
+TRI_MINIMUM = -0.99
+
+
+def _actualisation(taux: np.ndarray | float, nombre_annees: int) -> np.ndarray:
+    """Facteurs d'actualisation ``(1 + r_t) ** -t`` pour t = 0 .. nombre_annees - 1."""
+    periodes = np.arange(nombre_annees)
+    return (1.0 + np.asarray(taux, dtype=float)) ** -periodes
+
+
+def calculer_van(flux: np.ndarray, taux: np.ndarray | float) -> np.ndarray:
+    """Valeur actuelle nette de flux annuels ``(..., années)``, le premier à t = 0.
+
+    ``taux`` est un taux unique ou une courbe de taux zéro-coupon, un par
+    échéance (dernier axe de même longueur que les flux).
+    """
+    flux = np.asarray(flux, dtype=float)
+    return np.sum(flux * _actualisation(taux, flux.shape[-1]), axis=-1)
+
+
+def calculer_tri(flux: np.ndarray, precision: float = 1e-10, iterations_max: int = 100) -> np.ndarray:
+    """Taux de rendement interne de chaque vecteur de flux ``(..., années)``.
+
+    Hybride Newton / dichotomie appliqué à tout le lot à la fois : un pas de
+    Newton est retenu s'il reste dans l'intervalle d'encadrement, sinon on
+    prend son milieu. ``NaN`` lorsque la VAN ne change pas de signe sur
+    ]-99 %, +∞[ (pas de TRI) ; en cas de racines multiples, l'une d'elles.
+    """
+    flux = np.asarray(flux, dtype=float)
+    forme = flux.shape[:-1]
+    flux = flux.reshape(-1, flux.shape[-1])
+    periodes = np.arange(flux.shape[-1])
+    echelle = np.maximum(np.abs(flux).sum(axis=-1), 1.0)
+
+    def van(taux: np.ndarray, lignes=slice(None)) -> np.ndarray:
+        return np.sum(flux[lignes] * (1.0 + taux[:, np.newaxis]) ** -periodes, axis=-1)
+
+    def derivee(taux: np.ndarray, lignes=slice(None)) -> np.ndarray:
+        return np.sum(-periodes * flux[lignes] * (1.0 + taux[:, np.newaxis]) ** (-periodes - 1), axis=-1)
+
+    bas = np.full(len(flux), TRI_MINIMUM)
+    haut = np.ones(len(flux))
+    van_bas, van_haut = van(bas), van(haut)
+    for _ in range(8):
+        sans_encadrement = np.sign(van_bas) == np.sign(van_haut)
+        if not sans_encadrement.any():
+            break
+        haut = np.where(sans_encadrement, haut * 10, haut)
+        van_haut = van(haut)
+    encadre = np.sign(van_bas) != np.sign(van_haut)
+
+    taux = np.where(encadre, np.clip(0.05, bas, haut), np.nan)
+    actifs = encadre.copy()
+    for _ in range(iterations_max):
+        if not actifs.any():
+            break
+        valeur = van(taux[actifs], actifs)
+        meme_signe = np.sign(valeur) == np.sign(van_bas[actifs])
+        bas[actifs] = np.where(meme_signe, taux[actifs], bas[actifs])
+        van_bas[actifs] = np.where(meme_signe, valeur, van_bas[actifs])
+        haut[actifs] = np.where(meme_signe, haut[actifs], taux[actifs])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = taux[actifs] - valeur / derivee(taux[actifs], actifs)
+        milieu = (bas[actifs] + haut[actifs]) / 2
+        dans_intervalle = np.isfinite(newton) & (newton > bas[actifs]) & (newton < haut[actifs])
+        converge = (np.abs(valeur) <= precision * echelle[actifs]) | (haut[actifs] - bas[actifs] <= precision)
+
+        taux[actifs] = np.where(converge, taux[actifs], np.where(dans_intervalle, newton, milieu))
+        actifs[actifs] = ~converge
+    return taux.reshape(forme)
+
+
+def calculer_multiple(flux: np.ndarray) -> np.ndarray:
+    """Multiple sur fonds propres : flux reçus / flux investis (``NaN`` sans investissement)."""
+    flux = np.asarray(flux, dtype=float)
+    investis = -np.where(flux < 0, flux, 0.0).sum(axis=-1)
+    recus = np.where(flux > 0, flux, 0.0).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(investis > 0, recus / investis, np.nan)
+
+
+def calculer_delai_recuperation(flux: np.ndarray) -> np.ndarray:
+    """Années nécessaires pour que le cumul des flux redevienne positif.
+
+    Interpolé linéairement dans l'année de retour à l'équilibre ; 0 si le
+    cumul n'est jamais négatif, ``NaN`` s'il ne redevient jamais positif.
+    """
+    flux = np.asarray(flux, dtype=float)
+    cumul = np.cumsum(flux, axis=-1)
+    negatif = cumul < 0
+    # Dernière année de cumul négatif : l'équilibre est atteint l'année suivante
+    derniere = flux.shape[-1] - 1 - np.argmax(negatif[..., ::-1], axis=-1)
+    jamais_negatif = ~negatif.any(axis=-1)
+    jamais_recupere = negatif[..., -1]
+
+    suivante = np.minimum(derniere + 1, flux.shape[-1] - 1)
+    manque = -np.take_along_axis(cumul, derniere[..., np.newaxis], axis=-1)[..., 0]
+    flux_suivant = np.take_along_axis(flux, suivante[..., np.newaxis], axis=-1)[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delai = derniere + manque / flux_suivant
+    return np.where(jamais_negatif, 0.0, np.where(jamais_recupere, np.nan, delai))
+
+
+class RendementCalculator:
+    """Indicateurs de rendement pour les associés à partir d'une projection.
+
+    Les flux des associés sont, chaque année, le cash-flow de la SCI diminué
+    des apports de l'année (capital à la création, apports CCA et apports de
+    la SCI aux acquisitions), plus une éventuelle valeur terminale la
+    dernière année.
+    Les projections à plusieurs dimensions (balayages, scénarios) sont
+    traitées ligne à ligne sans boucle Python.
+    """
+
+    def apports(self, projection: "ProjectionAnnuelle") -> np.ndarray:
+        """Apports des associés par année (colonne ``apports_associes`` de la projection)."""
+        return projection.colonnes["apports_associes"].copy()
+
+    def flux_fonds_propres(
+        self, projection: "ProjectionAnnuelle", valeur_terminale: np.ndarray | float = 0.0
+    ) -> np.ndarray:
+        """Flux annuels des associés, de forme ``(..., années)``."""
+        flux = projection.colonnes["cashflow"] - self.apports(projection)
+        if flux.shape[-1]:
+            flux[..., -1] += valeur_terminale
+        return flux
+
+    def valeur_revente_nette(
+        self, sci: "SCI", annee: int, revalorisation_annuelle: float = 0.0, frais_vente: float = 0.0
+    ) -> float:
+        """Produit de la revente fin ``annee`` des biens détenus, net des frais et des capitaux restant dus."""
+        valeur = 0.0
+        for bien in sci.index_acquisitions().biens_detenus(annee):
+            annees_detention = annee - bien.annee_achat + 1
+            valeur += bien.prix_achat * (1 + revalorisation_annuelle) ** annees_detention * (1 - frais_vente)
+            if bien.credit:
+                valeur -= bien.credit.capital_restant_fin_annee(annees_detention)
+        return valeur
+
+    def calculer(
+        self,
+        projection: "ProjectionAnnuelle",
+        taux_actualisation: np.ndarray | float = 0.05,
+        valeur_terminale: np.ndarray | float = 0.0,
+    ) -> Dict[str, np.ndarray]:
+        """TRI, VAN, multiple sur fonds propres et délai de récupération."""
+        flux = self.flux_fonds_propres(projection, valeur_terminale)
+        return {
+            "tri": calculer_tri(flux),
+            "van": calculer_van(flux, taux_actualisation),
+            "multiple": calculer_multiple(flux),
+            "delai_recuperation": calculer_delai_recuperation(flux),
+        }
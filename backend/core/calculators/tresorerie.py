@@ -26,26 +26,17 @@ class TresorerieCalculator:
             + resultat["impot_societes"]
         )
 
-        mensualites_annuelles = 0.0
-        for bien in sci.biens:
-            if bien.credit and annee >= bien.annee_achat:
-                mensualites_annuelles += bien.credit.calculer_mensualite() * 12
+        index = sci.index_acquisitions()
+        mensualites_annuelles = index.mensualites(annee)
         decaissements += mensualites_annuelles
 
         apport_initial = 0.0
         if annee == sci.annee_creation:
             apport_initial = sci.capital_social
-            for apport in sci.apports_cca:
-                if apport["annee"] == annee:
-                    apport_initial += apport["montant"]
-            for bien in sci.biens:
-                if bien.annee_achat == annee:
-                    apport_initial += bien.apport_sci
+            apport_initial += index.apports_cca.get(annee, 0.0)
+            apport_initial += index.apports_sci.get(annee, 0.0)
 
-        sortie_apport_bien = 0.0
-        for bien in sci.biens:
-            if bien.annee_achat == annee:
-                sortie_apport_bien += bien.apport_sci
+        sortie_apport_bien = index.apports_sci.get(annee, 0.0)
 
         cashflow = encaissements - decaissements
         tresorerie_realisee = cashflow + apport_initial - sortie_apport_bien
@@ -1,6 +1,17 @@
 """Definitions for rental units managed by the SCI analyser."""
-from dataclasses import dataclass
-from typing import Optional
+from __future__ import annotations
+
+from array import array
+from collections.abc import MutableSequence
+from dataclasses import dataclass, field
+from math import fsum, isnan
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from backend.core.models.versions import nouvelle_version
+
+CHAMPS_LOT = ("numero", "loyer_mensuel", "surface")
 
 
 @dataclass
@@ -10,8 +21,172 @@ class AppartementLocation:
     numero: int
     loyer_mensuel: float
     surface: Optional[float] = None
+    _lots: Optional["LotsLocation"] = field(default=None, init=False, repr=False, compare=False)
+    # Rang du lot dans son conteneur, tenu à jour par celui-ci
+    _position: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __setattr__(self, nom: str, valeur) -> None:
+        lots = self.__dict__.get("_lots")
+        if lots is not None and nom in CHAMPS_LOT:
+            lots._modifier(self, nom, valeur)
+        super().__setattr__(nom, valeur)
 
     @property
     def loyer_annuel(self) -> float:
         """Retourne le loyer annuel généré par l'appartement."""
         return self.loyer_mensuel * 12
+
+
+class LotsLocation(MutableSequence):
+    """Lots d'un bien stockés par colonnes (numéro, loyer, surface).
+
+    Se manipule comme une liste d'``AppartementLocation`` ; les colonnes
+    sont tenues à jour à chaque ajout, suppression ou modification d'un lot,
+    y compris par affectation directe d'un attribut
+    (``lot.loyer_mensuel = 450``), et les totaux recalculés par
+    :func:`math.fsum` à la première lecture qui suit. Un appartement
+    n'appartient qu'à un seul conteneur.
+    """
+
+    def __init__(self, appartements: Iterable[AppartementLocation] = ()) -> None:
+        self._appartements: List[AppartementLocation] = []
+        self._numeros = array("q")
+        self._loyers = array("d")
+        self._surfaces = array("d")
+        self._version = nouvelle_version()
+        self._totaux_version: Optional[int] = None
+        self._totaux = (0.0, 0.0)
+        self.extend(appartements)
+
+    def __setstate__(self, etat: Dict) -> None:
+        self.__dict__.update(etat, _version=nouvelle_version())
+
+    @property
+    def version(self) -> int:
+        """Version des lots, renouvelée à chaque ajout, suppression ou modification."""
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._appartements)
+
+    def __getitem__(self, index):
+        return self._appartements[index]
+
+    def __setitem__(self, index, appartement) -> None:
+        appartements = list(self._appartements)
+        appartements[index] = appartement
+        self._remplacer(appartements)
+
+    def __delitem__(self, index) -> None:
+        positions = range(len(self))[index]
+        positions = sorted(positions if isinstance(index, slice) else [positions], reverse=True)
+        for position in positions:
+            appartement = self._appartements.pop(position)
+            del self._numeros[position], self._loyers[position], self._surfaces[position]
+            object.__setattr__(appartement, "_lots", None)
+        if positions:
+            self._numeroter(positions[-1])
+        self._version = nouvelle_version()
+
+    def insert(self, index: int, appartement: AppartementLocation) -> None:
+        self._verifier_appartenance([appartement], deplacables=set())
+        index = max(0, min(len(self), index if index >= 0 else len(self) + index))
+        self._appartements.insert(index, appartement)
+        self._numeros.insert(index, appartement.numero)
+        self._loyers.insert(index, appartement.loyer_mensuel)
+        self._surfaces.insert(index, np.nan if appartement.surface is None else appartement.surface)
+        self._version = nouvelle_version()
+        object.__setattr__(appartement, "_lots", self)
+        self._numeroter(index)
+
+    def reverse(self) -> None:
+        self._remplacer(self._appartements[::-1])
+
+    def sort(self, *, key=None, reverse: bool = False) -> None:
+        self._remplacer(sorted(self._appartements, key=key, reverse=reverse))
+
+    def _verifier_appartenance(self, appartements: List[AppartementLocation], deplacables: Set[int]) -> None:
+        """Refuse, avant toute modification, un lot d'un autre conteneur ou présent deux fois.
+
+        ``deplacables`` contient l'``id`` des lots du conteneur qui peuvent être
+        replacés (réordonnancement, sélection de ses propres lots).
+        """
+        vus = set()
+        for appartement in appartements:
+            if id(appartement) in vus:
+                raise ValueError(f"L'appartement {appartement.numero} figure deux fois dans le bien")
+            vus.add(id(appartement))
+            proprietaire = appartement._lots
+            if proprietaire is self and id(appartement) not in deplacables:
+                raise ValueError(f"L'appartement {appartement.numero} figure déjà dans le bien")
+            if proprietaire is not None and proprietaire is not self:
+                raise ValueError(f"L'appartement {appartement.numero} appartient déjà à un autre bien")
+
+    def _remplacer(self, appartements: List[AppartementLocation]) -> None:
+        """Remplace l'ensemble des lots et reconstruit colonnes et totaux."""
+        self._verifier_appartenance(appartements, {id(appartement) for appartement in self._appartements})
+        conserves = {id(appartement) for appartement in appartements}
+        for appartement in self._appartements:
+            if id(appartement) not in conserves:
+                object.__setattr__(appartement, "_lots", None)
+
+        self._appartements = list(appartements)
+        self._numeros = array("q", (lot.numero for lot in appartements))
+        self._loyers = array("d", (lot.loyer_mensuel for lot in appartements))
+        self._surfaces = array("d", (np.nan if lot.surface is None else lot.surface for lot in appartements))
+        self._version = nouvelle_version()
+        for appartement in appartements:
+            object.__setattr__(appartement, "_lots", self)
+        self._numeroter(0)
+
+    def _numeroter(self, debut: int) -> None:
+        """Met à jour le rang des lots à partir de ``debut``."""
+        for position in range(debut, len(self._appartements)):
+            object.__setattr__(self._appartements[position], "_position", position)
+
+    def _modifier(self, appartement: AppartementLocation, nom: str, valeur) -> None:
+        """Répercute la modification d'un attribut d'un lot sur les colonnes et les totaux."""
+        position = appartement._position
+        if nom == "numero":
+            self._numeros[position] = valeur
+        elif nom == "loyer_mensuel":
+            self._loyers[position] = valeur
+        else:
+            self._surfaces[position] = np.nan if valeur is None else valeur
+        self._version = nouvelle_version()
+
+    def __eq__(self, autre) -> bool:
+        if isinstance(autre, (LotsLocation, list, tuple)):
+            return list(self) == list(autre)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LotsLocation({self._appartements!r})"
+
+    def _calculer_totaux(self) -> Tuple[float, float]:
+        """Sommes exactement arrondies des loyers et des surfaces, mémorisées pour la version courante."""
+        if self._totaux_version != self._version:
+            self._totaux = (fsum(self._loyers), fsum(surface for surface in self._surfaces if not isnan(surface)))
+            self._totaux_version = self._version
+        return self._totaux
+
+    @property
+    def loyer_mensuel_total(self) -> float:
+        return self._calculer_totaux()[0]
+
+    @property
+    def loyer_annuel_total(self) -> float:
+        return self.loyer_mensuel_total * 12
+
+    @property
+    def surface_totale(self) -> float:
+        """Somme des surfaces renseignées."""
+        return self._calculer_totaux()[1]
+
+    def colonnes(self) -> Dict[str, np.ndarray]:
+        """Copie NumPy des colonnes ; surface à ``NaN`` lorsqu'elle n'est pas renseignée."""
+        return {
+            "numero": np.array(self._numeros, dtype=np.int64),
+            "loyer_mensuel": np.array(self._loyers, dtype=float),
+            "surface": np.array(self._surfaces, dtype=float),
+        }
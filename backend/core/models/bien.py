@@ -2,12 +2,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Tuple
 
 from backend.core.calculators.amortissement import AmortissementCalculator
 from backend.core.calculators.rentabilite import RentabiliteCalculator
-from backend.core.models.appartement import AppartementLocation
+from backend.core.models.appartement import LotsLocation
 from backend.core.models.credit import Credit
+from backend.core.models.versions import nouvelle_version
 
 
 @dataclass
@@ -24,7 +25,7 @@ class Bien:
     meubles: float = 0.0
     apport_sci: float = 0.0
     credit: Optional[Credit] = None
-    appartements: List[AppartementLocation] = field(default_factory=list)
+    appartements: LotsLocation = field(default_factory=LotsLocation)
     assurance_pno_taux: float = 0.02
     assurance_emprunt_taux: float = 0.0015
     taxe_fonciere: float = 0.0
@@ -36,38 +37,84 @@ class Bien:
     _rentabilite_calculator: RentabiliteCalculator = field(
         default_factory=RentabiliteCalculator, init=False, repr=False
     )
+    _version: int = field(default_factory=nouvelle_version, init=False, repr=False, compare=False)
+    _cache_version: Optional[Tuple] = field(default=None, init=False, repr=False, compare=False)
+    _cache_agregats: Optional[Dict[str, float]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, nom: str, valeur) -> None:
+        if nom == "appartements" and not isinstance(valeur, LotsLocation):
+            actuels = self.__dict__.get("appartements")
+            if actuels is None:
+                valeur = LotsLocation(valeur)
+            else:
+                # Réutilise le conteneur : ses propres lots peuvent être réaffectés
+                actuels[:] = valeur
+                valeur = actuels
+        super().__setattr__(nom, valeur)
+        if not nom.startswith("_"):
+            super().__setattr__("_version", nouvelle_version())
+
+    def __setstate__(self, etat: Dict) -> None:
+        # Une copie ou un objet désérialisé ne partage pas la version de l'original
+        self.__dict__.update(etat, _version=nouvelle_version())
+
+    @property
+    def version(self) -> Tuple:
+        """Version du bien, de son crédit et de ses appartements.
+
+        Elle change à chaque modification de l'un d'eux et n'est jamais
+        partagée par deux biens dans des états différents : les caches de
+        niveau supérieur (index de la SCI, projection mémorisée) s'en servent
+        pour savoir quand recalculer.
+        """
+        credit = self.credit.version if self.credit else None
+        return (self._version, credit, self.appartements.version)
+
+    def _agregats(self) -> Dict[str, float]:
+        """Montants dérivés du bien, mémorisés pour sa version courante."""
+        version = self.version
+        if self._cache_agregats is None or self._cache_version != version:
+            prix_total = self.prix_achat + self.frais_agence + self.frais_notaire + self.travaux + self.meubles
+            frais_credit = 0.0
+            assurance_emprunt = 0.0
+            if self.credit:
+                frais_credit = self.credit.frais_dossier + self.credit.frais_garantie
+                assurance_emprunt = self.credit.capital_emprunte * self.assurance_emprunt_taux
+            assurance_pno = self.prix_achat * self.assurance_pno_taux
+            self._cache_agregats = {
+                "prix_total": prix_total,
+                "besoin_financement": prix_total + frais_credit - self.apport_sci,
+                "charges_annuelles": (
+                    assurance_pno + assurance_emprunt + self.taxe_fonciere + self.charges_copro + self.autres_charges
+                ),
+            }
+            self._cache_version = version
+        return self._cache_agregats
 
     @property
     def prix_total(self) -> float:
         """Prix total d'acquisition."""
-        return self.prix_achat + self.frais_agence + self.frais_notaire + self.travaux + self.meubles
+        return self._agregats()["prix_total"]
 
     @property
     def besoin_financement(self) -> float:
         """Montant à financer par crédit."""
-        frais_credit = 0.0
-        if self.credit:
-            frais_credit = self.credit.frais_dossier + self.credit.frais_garantie
-        return self.prix_total + frais_credit - self.apport_sci
+        return self._agregats()["besoin_financement"]
 
     @property
     def revenus_annuels(self) -> float:
         """Total des loyers annuels."""
-        return sum(app.loyer_annuel for app in self.appartements)
+        return self.appartements.loyer_annuel_total
 
     @property
     def revenus_mensuels(self) -> float:
         """Total des loyers mensuels."""
-        return sum(app.loyer_mensuel for app in self.appartements)
+        return self.appartements.loyer_mensuel_total
 
     @property
     def charges_annuelles(self) -> float:
         """Total des charges annuelles (hors crédit et hors taxes de la SCI)."""
-        assurance_pno = self.prix_achat * self.assurance_pno_taux
-        assurance_emprunt = 0.0
-        if self.credit:
-            assurance_emprunt = self.credit.capital_emprunte * self.assurance_emprunt_taux
-        return assurance_pno + assurance_emprunt + self.taxe_fonciere + self.charges_copro + self.autres_charges
+        return self._agregats()["charges_annuelles"]
 
     def calculer_amortissements_annee(self, annee: int) -> Dict[str, float]:
         """Calcule les amortissements pour une année donnée."""
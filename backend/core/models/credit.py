@@ -1,8 +1,137 @@
 """Credit model and amortisation logic."""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from backend.core.models.versions import nouvelle_version
+
+PARAMETRES_ECHEANCIER = (
+    "capital_emprunte",
+    "taux_annuel",
+    "duree_annees",
+    "differe_partiel_mois",
+    "differe_total_mois",
+    "frais_dossier",
+    "frais_garantie",
+)
+
+COLONNES_TABLEAU = (
+    "Mois",
+    "Capital restant début",
+    "Mensualité",
+    "Intérêts",
+    "Capital amorti",
+    "Capital restant fin",
+)
+
+
+def _soldes_fin_mois(capital, taux_mensuel, mensualite, differe_partiel, differe_total, mois):
+    """Capital restant dû à la fin de chaque mois, calculé en forme fermée.
+
+    Les paramètres acceptent des scalaires ou des tableaux NumPy compatibles par
+    broadcasting. Pendant le différé total les intérêts sont capitalisés
+    (``C * (1 + t)^m``), pendant le différé partiel le capital reste constant,
+    puis le solde suit la formule de l'annuité. Les soldes négatifs dus aux
+    arrondis de la dernière échéance sont ramenés à zéro.
+    """
+    mois = np.asarray(mois, dtype=float)
+    taux_mensuel = np.asarray(taux_mensuel, dtype=float)
+    differe_total = np.asarray(differe_total, dtype=float)
+    fin_differe = np.maximum(differe_partiel, differe_total)
+    log_facteur = np.log1p(taux_mensuel)
+    forme = np.broadcast_shapes(
+        mois.shape, taux_mensuel.shape, differe_total.shape, fin_differe.shape, np.shape(capital), np.shape(mensualite)
+    )
+
+    # Les grands lots (échéanciers mensuels) sont calculés dans trois tampons
+    # réutilisés en place plutôt qu'à coups de temporaires intermédiaires.
+    capital_differe = np.minimum(mois, differe_total, out=np.empty(forme))
+    capital_differe *= log_facteur
+    hors_differe = capital_differe == 0.0
+    np.exp(capital_differe, out=capital_differe, where=~hors_differe)
+    np.copyto(capital_differe, 1.0, where=hors_differe)
+    capital_differe *= capital
+
+    croissance = np.subtract(mois, fin_differe, out=np.empty(forme))
+    np.maximum(croissance, 0.0, out=croissance)
+    facteur_annuite = np.empty(forme)
+    sans_taux = taux_mensuel == 0
+    if sans_taux.any():
+        np.copyto(facteur_annuite, croissance, where=sans_taux)
+    croissance *= log_facteur
+    np.expm1(croissance, out=croissance)
+    np.divide(croissance, taux_mensuel, out=facteur_annuite, where=~sans_taux)
+
+    croissance += 1.0
+    soldes = np.multiply(capital_differe, croissance, out=capital_differe)
+    facteur_annuite *= mensualite
+    soldes -= facteur_annuite
+    np.maximum(soldes, 0.0, out=soldes)
+    return soldes if soldes.ndim else soldes[()]
+
+
+
+def _cumuls_fin_mois(capital, taux_mensuel, mensualite, differe_partiel, differe_total, mois):
+    """Solde, intérêts cumulés et capital amorti cumulé à la fin du mois ``mois``.
+
+    Chaque phase du crédit a sa forme fermée : les intérêts capitalisés du
+    différé total sont la croissance du solde, ceux du différé partiel un
+    montant constant par mois, et en phase d'amortissement les intérêts
+    cumulés valent les échéances versées moins le capital remboursé.
+    """
+    mois = np.asarray(mois, dtype=float)
+    taux_mensuel = np.asarray(taux_mensuel, dtype=float)
+    differe_total = np.asarray(differe_total, dtype=float)
+    fin_differe = np.maximum(differe_partiel, differe_total)
+
+    soldes = _soldes_fin_mois(capital, taux_mensuel, mensualite, differe_partiel, differe_total, mois)
+    log_facteur = np.log1p(taux_mensuel)
+    capital_differe = capital * np.exp(differe_total * log_facteur)
+
+    interets_differe_total = capital * np.expm1(np.minimum(mois, differe_total) * log_facteur)
+    mois_differe_partiel = np.maximum(np.minimum(mois, fin_differe) - differe_total, 0.0)
+    interets_differe_partiel = mois_differe_partiel * capital_differe * taux_mensuel
+
+    mois_amortis = np.maximum(mois - fin_differe, 0.0)
+    capital_amorti = np.where(mois_amortis > 0, capital_differe - soldes, 0.0)
+    interets_amortissement = mois_amortis * mensualite - capital_amorti
+
+    interets = interets_differe_total + interets_differe_partiel + interets_amortissement
+    return soldes, interets, capital_amorti
+
+
+def agreger_par_annee(
+    capital,
+    taux_mensuel,
+    mensualite,
+    duree_mois,
+    annees,
+    differe_partiel_mois=0,
+    differe_total_mois=0,
+) -> Dict[str, np.ndarray]:
+    """Agrège un ou plusieurs crédits par année de crédit sans construire l'échéancier.
+
+    ``annees`` est numérotée à partir de 1 (première année du crédit). Les
+    années postérieures à la durée n'ont ni intérêts ni amortissement et
+    conservent le solde final ; les années antérieures à 1 valent zéro.
+    Tous les paramètres sont compatibles par broadcasting NumPy.
+    """
+    annees = np.asarray(annees, dtype=float)
+    mois_fin = np.clip(annees * 12, 0, duree_mois)
+    mois_debut = np.clip((annees - 1) * 12, 0, duree_mois)
+    arguments = (capital, taux_mensuel, mensualite, differe_partiel_mois, differe_total_mois)
+
+    soldes_fin, interets_fin, amorti_fin = _cumuls_fin_mois(*arguments, mois_fin)
+    _, interets_debut, amorti_debut = _cumuls_fin_mois(*arguments, mois_debut)
+
+    actives = annees >= 1
+    return {
+        "interets": np.where(actives, interets_fin - interets_debut, 0.0),
+        "capital_amorti": np.where(actives, amorti_fin - amorti_debut, 0.0),
+        "capital_restant_fin": np.where(actives, soldes_fin, 0.0),
+    }
 
 @dataclass
 class Credit:
@@ -15,6 +144,63 @@ class Credit:
     differe_total_mois: int = 0  # Différé total (intérêts capitalisés)
     frais_dossier: float = 0
     frais_garantie: float = 0
+    _cache_cle: Optional[Tuple] = field(default=None, init=False, repr=False, compare=False)
+    _cache_echeancier: Optional[Dict[str, np.ndarray]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _cache_tableau: Optional[pd.DataFrame] = field(default=None, init=False, repr=False, compare=False)
+    _version: int = field(default_factory=nouvelle_version, init=False, repr=False, compare=False)
+
+    def __setattr__(self, nom: str, valeur) -> None:
+        super().__setattr__(nom, valeur)
+        if nom in PARAMETRES_ECHEANCIER:
+            self.invalider_cache()
+        if not nom.startswith("_"):
+            super().__setattr__("_version", nouvelle_version())
+
+    def __setstate__(self, etat: Dict) -> None:
+        # Une copie ou un objet désérialisé ne partage pas la version de l'original
+        self.__dict__.update(etat, _version=nouvelle_version())
+
+    @property
+    def version(self) -> int:
+        """Version du crédit, renouvelée à chaque modification d'un de ses paramètres."""
+        return self._version
+
+    def invalider_cache(self) -> None:
+        """Oublie l'échéancier mémorisé (appelé à chaque modification d'un paramètre)."""
+        object.__setattr__(self, "_cache_cle", None)
+        object.__setattr__(self, "_cache_echeancier", None)
+        object.__setattr__(self, "_cache_tableau", None)
+
+    @property
+    def cle_echeancier(self) -> Tuple:
+        """Tuple des paramètres qui déterminent l'échéancier."""
+        return tuple(getattr(self, nom) for nom in PARAMETRES_ECHEANCIER)
+
+    @property
+    def echeancier(self) -> Dict[str, np.ndarray]:
+        """Colonnes mémorisées du tableau d'amortissement (tableaux en lecture seule, sans copie)."""
+        cle = self.cle_echeancier
+        if self._cache_echeancier is None or self._cache_cle != cle:
+            echeancier = self.generer_echeancier()
+            for colonne in echeancier.values():
+                colonne.setflags(write=False)
+            self.invalider_cache()
+            object.__setattr__(self, "_cache_echeancier", echeancier)
+            object.__setattr__(self, "_cache_cle", cle)
+        return self._cache_echeancier
+
+    @property
+    def tableau_amortissement(self) -> pd.DataFrame:
+        """Tableau d'amortissement mémorisé, partagé entre appelants : ne pas le modifier."""
+        echeancier = self.echeancier
+        if self._cache_tableau is None:
+            tableau = pd.DataFrame()
+            if self.capital_emprunte != 0:
+                tableau = pd.DataFrame(echeancier, columns=COLONNES_TABLEAU, copy=False)
+            object.__setattr__(self, "_cache_tableau", tableau)
+        return self._cache_tableau
 
     @property
     def taux_mensuel(self) -> float:
@@ -40,68 +226,72 @@ class Credit:
             self.taux_mensuel / (1 - (1 + self.taux_mensuel) ** -duree_effective)
         )
 
-    def generer_tableau_amortissement(self) -> pd.DataFrame:
-        """Génère le tableau d'amortissement complet du crédit."""
+    def generer_echeancier(self) -> Dict[str, np.ndarray]:
+        """Calcule les colonnes du tableau d'amortissement sous forme de tableaux NumPy."""
         if self.capital_emprunte == 0:
-            return pd.DataFrame()
+            return {colonne: np.empty(0) for colonne in COLONNES_TABLEAU}
 
+        taux = self.taux_mensuel
+        mois = np.arange(1, self.duree_mois + 1)
         mensualite = self.calculer_mensualite()
-        capital_restant = self.capital_emprunte
-
-        tableau = []
-        mois_total = self.duree_mois
-
-        for mois in range(1, mois_total + 1):
-            # Période de différé total : intérêts capitalisés
-            if mois <= self.differe_total_mois:
-                interets = capital_restant * self.taux_mensuel
-                capital_restant += interets
-                tableau.append(
-                    {
-                        "Mois": mois,
-                        "Capital restant début": capital_restant - interets,
-                        "Mensualité": 0,
-                        "Intérêts": interets,
-                        "Capital amorti": 0,
-                        "Capital restant fin": capital_restant,
-                    }
-                )
-            elif mois <= self.differe_partiel_mois:
-                # Différé partiel : paiement des intérêts uniquement
-                interets = capital_restant * self.taux_mensuel
-                tableau.append(
-                    {
-                        "Mois": mois,
-                        "Capital restant début": capital_restant,
-                        "Mensualité": interets,
-                        "Intérêts": interets,
-                        "Capital amorti": 0,
-                        "Capital restant fin": capital_restant,
-                    }
-                )
-            else:
-                interets = capital_restant * self.taux_mensuel
-                capital_amorti = mensualite - interets
-                capital_restant -= capital_amorti
-
-                if capital_restant < 0:
-                    capital_amorti += capital_restant
-                    capital_restant = 0
-
-                tableau.append(
-                    {
-                        "Mois": mois,
-                        "Capital restant début": capital_restant + capital_amorti,
-                        "Mensualité": mensualite,
-                        "Intérêts": interets,
-                        "Capital amorti": capital_amorti,
-                        "Capital restant fin": capital_restant,
-                    }
-                )
-
-        return pd.DataFrame(tableau)
+
+        capital_restant_fin = _soldes_fin_mois(
+            self.capital_emprunte,
+            taux,
+            mensualite,
+            self.differe_partiel_mois,
+            self.differe_total_mois,
+            mois,
+        )
+        capital_restant_debut = np.empty_like(capital_restant_fin)
+        capital_restant_debut[0] = self.capital_emprunte
+        capital_restant_debut[1:] = capital_restant_fin[:-1]
+
+        interets = capital_restant_debut * taux
+        en_differe_total = mois <= self.differe_total_mois
+        en_differe = mois <= max(self.differe_partiel_mois, self.differe_total_mois)
+
+        mensualites = np.where(en_differe, interets, mensualite)
+        mensualites[en_differe_total] = 0.0
+        capital_amorti = np.where(en_differe, 0.0, capital_restant_debut - capital_restant_fin)
+
+        return {
+            "Mois": mois,
+            "Capital restant début": capital_restant_debut,
+            "Mensualité": mensualites,
+            "Intérêts": interets,
+            "Capital amorti": capital_amorti,
+            "Capital restant fin": capital_restant_fin,
+        }
+
+    def generer_tableau_amortissement(self) -> pd.DataFrame:
+        """Génère le tableau d'amortissement complet du crédit (copie modifiable)."""
+        return self.tableau_amortissement.copy()
+
+    def agreger_annees(self, annees_credit) -> Dict[str, np.ndarray]:
+        """Intérêts, capital amorti et capital restant dû pour des années de crédit (1 = première)."""
+        return agreger_par_annee(
+            self.capital_emprunte,
+            self.taux_mensuel,
+            self.calculer_mensualite(),
+            self.duree_mois,
+            annees_credit,
+            self.differe_partiel_mois,
+            self.differe_total_mois,
+        )
+
+    def interets_annee(self, annee_credit: int) -> float:
+        """Intérêts payés ou capitalisés pendant une année de crédit."""
+        return float(self.agreger_annees(annee_credit)["interets"])
+
+    def capital_amorti_annee(self, annee_credit: int) -> float:
+        """Capital remboursé pendant une année de crédit."""
+        return float(self.agreger_annees(annee_credit)["capital_amorti"])
+
+    def capital_restant_fin_annee(self, annee_credit: int) -> float:
+        """Capital restant dû à la fin d'une année de crédit."""
+        return float(self.agreger_annees(annee_credit)["capital_restant_fin"])
 
     def calculer_total_interets(self) -> float:
         """Calcule le montant total des intérêts sur toute la durée."""
-        tableau = self.generer_tableau_amortissement()
-        return tableau["Intérêts"].sum() if not tableau.empty else 0
+        return float(self.echeancier["Intérêts"].sum())
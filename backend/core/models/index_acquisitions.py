@@ -0,0 +1,81 @@
+"""Acquisition-year index used to answer per-year SCI queries quickly."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Dict, List, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from backend.core.models.bien import Bien
+
+
+@dataclass
+class IndexAcquisitions:
+    """Biens triés par année d'achat avec sommes préfixes des montants récurrents.
+
+    Les totaux des biens détenus une année donnée s'obtiennent par recherche
+    dichotomique dans ``annees_achat`` ; les événements propres à l'année
+    d'achat (apport, frais de crédit) par simple lecture de dictionnaire.
+    """
+
+    biens: List["Bien"]
+    annees_achat: List[int]
+    revenus_cumules: List[float]
+    charges_cumulees: List[float]
+    mensualites_cumulees: List[float]
+    apports_sci: Dict[int, float]
+    frais_credit: Dict[int, float]
+    apports_cca: Dict[int, float]
+
+    @classmethod
+    def construire(cls, biens: Sequence["Bien"], apports_cca: Sequence[Dict] = ()) -> "IndexAcquisitions":
+        """Construit l'index à partir des biens et des apports CCA d'une SCI."""
+        biens_tries = sorted(biens, key=lambda bien: bien.annee_achat)
+
+        apports_sci: Dict[int, float] = defaultdict(float)
+        frais_credit: Dict[int, float] = defaultdict(float)
+        mensualites: List[float] = []
+        for bien in biens_tries:
+            apports_sci[bien.annee_achat] += bien.apport_sci
+            if bien.credit:
+                frais_credit[bien.annee_achat] += bien.credit.frais_dossier + bien.credit.frais_garantie
+                mensualites.append(bien.credit.calculer_mensualite() * 12)
+            else:
+                mensualites.append(0.0)
+
+        apports_par_annee: Dict[int, float] = defaultdict(float)
+        for apport in apports_cca:
+            apports_par_annee[apport["annee"]] += apport["montant"]
+
+        return cls(
+            biens=biens_tries,
+            annees_achat=[bien.annee_achat for bien in biens_tries],
+            revenus_cumules=[0.0, *accumulate(bien.revenus_annuels for bien in biens_tries)],
+            charges_cumulees=[0.0, *accumulate(bien.charges_annuelles for bien in biens_tries)],
+            mensualites_cumulees=[0.0, *accumulate(mensualites)],
+            apports_sci=dict(apports_sci),
+            frais_credit=dict(frais_credit),
+            apports_cca=dict(apports_par_annee),
+        )
+
+    def nombre_detenus(self, annee: int) -> int:
+        """Nombre de biens achetés au plus tard en ``annee``."""
+        return bisect_right(self.annees_achat, annee)
+
+    def biens_detenus(self, annee: int) -> List["Bien"]:
+        """Biens détenus pendant ``annee``."""
+        return self.biens[: self.nombre_detenus(annee)]
+
+    def revenus(self, annee: int) -> float:
+        """Loyers annuels des biens détenus pendant ``annee``."""
+        return self.revenus_cumules[self.nombre_detenus(annee)]
+
+    def charges(self, annee: int) -> float:
+        """Charges annuelles des biens détenus pendant ``annee``."""
+        return self.charges_cumulees[self.nombre_detenus(annee)]
+
+    def mensualites(self, annee: int) -> float:
+        """Annuités de crédit des biens détenus pendant ``annee``."""
+        return self.mensualites_cumulees[self.nombre_detenus(annee)]
@@ -0,0 +1,171 @@
+"""Batch amortisation engine for whole loan books."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from backend.core.models.credit import Credit, _cumuls_fin_mois, _soldes_fin_mois
+
+
+@dataclass
+class EcheanciersCredits:
+    """Échéanciers d'un portefeuille de crédits, une ligne par crédit.
+
+    Les matrices ont la forme ``(crédits, périodes)`` ; une période est un mois
+    ou une année de crédit selon ``par_annee``. Au-delà de la durée d'un crédit
+    les flux sont nuls, le capital restant conserve le solde final et le masque
+    ``actifs`` vaut ``False``.
+    """
+
+    interets: np.ndarray
+    capital_amorti: np.ndarray
+    capital_restant: np.ndarray
+    actifs: np.ndarray
+    mensualites: np.ndarray
+    par_annee: bool = False
+
+    @property
+    def nombre_credits(self) -> int:
+        return self.interets.shape[0]
+
+    @property
+    def nombre_periodes(self) -> int:
+        return self.interets.shape[1]
+
+
+def colonnes_credits(credits: Iterable[Credit]) -> Dict[str, np.ndarray]:
+    """Convertit une liste de :class:`Credit` en colonnes NumPy."""
+    credits = list(credits)
+    return {
+        "capital": np.array([c.capital_emprunte for c in credits], dtype=float),
+        "taux_annuel": np.array([c.taux_annuel for c in credits], dtype=float),
+        "duree_annees": np.array([c.duree_annees for c in credits], dtype=int),
+        "differe_partiel_mois": np.array([c.differe_partiel_mois for c in credits], dtype=int),
+        "differe_total_mois": np.array([c.differe_total_mois for c in credits], dtype=int),
+    }
+
+
+def calculer_mensualites(
+    capital,
+    taux_annuel,
+    duree_annees,
+    differe_partiel_mois=0,
+    differe_total_mois=0,
+) -> np.ndarray:
+    """Mensualités constantes de chaque crédit (même formule que :meth:`Credit.calculer_mensualite`)."""
+    capital, taux_mensuel, duree_mois, differe_partiel, differe_total = _normaliser(
+        capital, taux_annuel, duree_annees, differe_partiel_mois, differe_total_mois
+    )
+    duree_effective = duree_mois - np.maximum(differe_partiel, differe_total)
+    if np.any((duree_effective <= 0) & (capital != 0)):
+        raise ValueError("La durée d'amortissement doit dépasser la durée du différé.")
+
+    duree_effective = np.maximum(duree_effective, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mensualites = np.where(
+            taux_mensuel == 0,
+            capital / duree_effective,
+            capital * taux_mensuel / -np.expm1(-duree_effective * np.log1p(taux_mensuel)),
+        )
+    return np.where(capital == 0, 0.0, mensualites)
+
+
+def calculer_echeanciers(
+    capital,
+    taux_annuel,
+    duree_annees,
+    differe_partiel_mois=0,
+    differe_total_mois=0,
+    par_annee: bool = False,
+    nombre_periodes: Optional[int] = None,
+) -> EcheanciersCredits:
+    """Calcule en une passe vectorisée les échéanciers d'un ensemble de crédits.
+
+    Les paramètres sont des colonnes (ou des scalaires diffusés) décrivant
+    chaque crédit. Les durées peuvent différer : la matrice couvre le crédit
+    le plus long, ou ``nombre_periodes`` si précisé.
+    """
+    capital, taux_mensuel, duree_mois, differe_partiel, differe_total = _normaliser(
+        capital, taux_annuel, duree_annees, differe_partiel_mois, differe_total_mois
+    )
+    mensualites = calculer_mensualites(
+        capital, taux_annuel, duree_annees, differe_partiel_mois, differe_total_mois
+    )
+    mois_par_periode = 12 if par_annee else 1
+    if nombre_periodes is None:
+        duree_max = int(duree_mois.max()) if duree_mois.size else 0
+        nombre_periodes = -(-duree_max // mois_par_periode)
+
+    colonne = (slice(None), np.newaxis)
+    periodes = np.arange(1, nombre_periodes + 1)[np.newaxis, :]
+    actifs = (periodes - 1) * mois_par_periode < duree_mois[colonne]
+
+    if par_annee:
+        bornes = np.minimum(np.arange(0, nombre_periodes + 1)[np.newaxis, :] * 12, duree_mois[colonne])
+        soldes, interets_cumules, amorti_cumule = _cumuls_fin_mois(
+            capital[colonne],
+            taux_mensuel[colonne],
+            mensualites[colonne],
+            differe_partiel[colonne],
+            differe_total[colonne],
+            bornes,
+        )
+        return EcheanciersCredits(
+            interets=np.diff(interets_cumules, axis=1),
+            capital_amorti=np.diff(amorti_cumule, axis=1),
+            capital_restant=soldes[:, 1:],
+            actifs=actifs,
+            mensualites=mensualites,
+            par_annee=True,
+        )
+
+    mois = np.minimum(periodes.astype(float), duree_mois[colonne])
+    capital_restant = _soldes_fin_mois(
+        capital[colonne],
+        taux_mensuel[colonne],
+        mensualites[colonne],
+        differe_partiel[colonne],
+        differe_total[colonne],
+        mois,
+    )
+    # Le solde de début de mois est celui de la fin du mois précédent : les
+    # flux sont écrits directement dans leurs matrices, sans copie décalée.
+    interets = np.empty_like(capital_restant)
+    interets[:, 0] = capital * taux_mensuel
+    np.multiply(capital_restant[:, :-1], taux_mensuel[colonne], out=interets[:, 1:])
+    capital_amorti = np.empty_like(capital_restant)
+    capital_amorti[:, 0] = capital - capital_restant[:, 0]
+    np.subtract(capital_restant[:, :-1], capital_restant[:, 1:], out=capital_amorti[:, 1:])
+
+    inactifs = ~actifs
+    np.copyto(capital_amorti, 0.0, where=periodes <= np.maximum(differe_partiel, differe_total)[colonne])
+    np.copyto(interets, 0.0, where=inactifs)
+    np.copyto(capital_amorti, 0.0, where=inactifs)
+
+    return EcheanciersCredits(
+        interets=interets,
+        capital_amorti=capital_amorti,
+        capital_restant=capital_restant,
+        actifs=actifs,
+        mensualites=mensualites,
+        par_annee=False,
+    )
+
+
+def _normaliser(capital, taux_annuel, duree_annees, differe_partiel_mois, differe_total_mois):
+    capital, taux_annuel, duree_annees, differe_partiel, differe_total = np.broadcast_arrays(
+        np.asarray(capital, dtype=float),
+        np.asarray(taux_annuel, dtype=float),
+        np.asarray(duree_annees, dtype=int),
+        np.asarray(differe_partiel_mois, dtype=int),
+        np.asarray(differe_total_mois, dtype=int),
+    )
+    return (
+        np.atleast_1d(capital),
+        np.atleast_1d(taux_annuel / 12),
+        np.atleast_1d(duree_annees * 12),
+        np.atleast_1d(differe_partiel),
+        np.atleast_1d(differe_total),
+    )
@@ -1,15 +1,30 @@
 """SCI aggregate model orchestrating calculators and biens."""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, List
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from backend.core.calculators.amortissement import AmortissementCalculator
 from backend.core.calculators.fiscal import FiscalCalculator
+from backend.core.calculators.projection import ProjectionAnnuelle, ProjectionCalculator
 from backend.core.calculators.tresorerie import TresorerieCalculator
 from backend.core.models.bien import Bien
+from backend.core.models.index_acquisitions import IndexAcquisitions
+from backend.core.models.portefeuille_credits import calculer_echeanciers, colonnes_credits
+from backend.core.models.versions import derniere_version, nouvelle_version
+
+COLONNES_CREDITS_ANNUELS = (
+    "N°",
+    "Bien",
+    "Année crédit",
+    "Année",
+    "Intérêts",
+    "Capital amorti",
+    "Capital restant fin",
+)
 
 
 @dataclass
@@ -31,18 +46,75 @@ class SCI:
     )
     _fiscal_calculator: FiscalCalculator = field(default_factory=FiscalCalculator, init=False, repr=False)
     _tresorerie_calculator: TresorerieCalculator = field(init=False, repr=False)
+    _projection_calculator: ProjectionCalculator = field(init=False, repr=False)
+    _index_acquisitions: Optional[IndexAcquisitions] = field(default=None, init=False, repr=False)
+    _index_cle: Optional[Tuple] = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         self._tresorerie_calculator = TresorerieCalculator(self._fiscal_calculator)
+        self._projection_calculator = ProjectionCalculator(self._fiscal_calculator)
+
+    def __setattr__(self, nom: str, valeur) -> None:
+        super().__setattr__(nom, valeur)
+        if not nom.startswith("_"):
+            nouvelle_version()
+
+    def __setstate__(self, etat: Dict) -> None:
+        # Les numéros de version d'un autre processus ne disent rien de l'index copié
+        self.__dict__.update(etat, _index_acquisitions=None, _index_cle=None)
+
+    @property
+    def amortissement_calculator(self) -> AmortissementCalculator:
+        """Calculateur des dotations aux amortissements des biens de la SCI."""
+        return self._amortissement_calculator
 
     @property
     def charges_fixes_annuelles(self) -> float:
         """Charges fixes annuelles de la SCI."""
         return self.frais_comptable_annuel + self.frais_bancaire_annuel
 
+    def empreinte(self) -> Tuple:
+        """Tuple hashable décrivant les paramètres de la SCI, ses biens et ses apports CCA.
+
+        Les biens y figurent par leur :attr:`Bien.version` : toute modification
+        d'un bien, de son crédit ou de ses appartements change l'empreinte.
+        """
+        valeurs = tuple(
+            getattr(self, champ.name)
+            for champ in fields(self)
+            if not champ.name.startswith("_") and champ.name not in ("biens", "apports_cca")
+        )
+        biens = tuple(bien.version for bien in self.biens)
+        return valeurs + (biens, self._empreinte_apports())
+
+    def _empreinte_apports(self) -> Tuple:
+        return tuple(tuple(sorted(apport.items())) for apport in self.apports_cca)
+
+    def index_acquisitions(self) -> IndexAcquisitions:
+        """Index des biens par année d'achat, reconstruit dès qu'un bien ou un apport change.
+
+        Toute modification d'un bien, de son crédit ou de ses appartements fait
+        avancer :func:`derniere_version` : la clé de l'index se vérifie donc
+        sans parcourir les biens. :meth:`ajouter_bien` et
+        :meth:`ajouter_apport_cca` invalident l'index et les longueurs des
+        listes détectent les ajouts directs ; un apport modifié en place ou un
+        bien remplacé dans la liste demande un appel à :meth:`invalider_index`.
+        """
+        cle = (derniere_version(), len(self.biens), len(self.apports_cca))
+        if self._index_acquisitions is None or self._index_cle != cle:
+            self._index_acquisitions = IndexAcquisitions.construire(self.biens, self.apports_cca)
+            self._index_cle = cle
+        return self._index_acquisitions
+
+    def invalider_index(self) -> None:
+        """Force la reconstruction de l'index des acquisitions."""
+        self._index_acquisitions = None
+        self._index_cle = None
+
     def ajouter_bien(self, bien: Bien) -> None:
         """Ajoute un bien immobilier à la SCI."""
         self.biens.append(bien)
+        self.invalider_index()
 
     def ajouter_apport_cca(self, annee: int, nom_associe: str, montant: float, taux_interet: float = 0.0) -> None:
         """Ajoute un apport en compte courant d'associé."""
@@ -54,70 +126,56 @@ class SCI:
                 "taux_interet": taux_interet,
             }
         )
+        self.invalider_index()
 
     def calculer_revenus_annuels(self, annee: int) -> float:
         """Calcule les revenus locatifs totaux pour une année."""
-        revenus = 0.0
-        for bien in self.biens:
-            if annee >= bien.annee_achat:
-                revenus += bien.revenus_annuels
-        return revenus
+        return self.index_acquisitions().revenus(annee)
 
     def calculer_charges_annuelles(self, annee: int) -> float:
         """Calcule les charges d'exploitation (hors amortissements et intérêts)."""
-        charges = self.charges_fixes_annuelles
-        for bien in self.biens:
-            if annee >= bien.annee_achat:
-                charges += bien.charges_annuelles
-        revenus = self.calculer_revenus_annuels(annee)
-        charges += revenus * self.crl_taux
-        return charges
+        index = self.index_acquisitions()
+        revenus = index.revenus(annee)
+        return self.charges_fixes_annuelles + index.charges(annee) + revenus * self.crl_taux
 
     def calculer_interets_credits(self, annee: int) -> float:
         """Calcule les intérêts de crédit pour une année."""
         interets_total = 0.0
-        for bien in self.biens:
-            if bien.credit and annee >= bien.annee_achat:
-                tableau = bien.credit.generer_tableau_amortissement()
-                if not tableau.empty:
+        for bien in self.index_acquisitions().biens_detenus(annee):
+            if bien.credit:
+                interets = bien.credit.echeancier["Intérêts"]
+                if len(interets):
                     annee_credit = annee - bien.annee_achat + 1
                     mois_debut = (annee_credit - 1) * 12
-                    mois_fin = min(annee_credit * 12, len(tableau))
-                    interets_total += tableau.iloc[mois_debut:mois_fin]["Intérêts"].sum()
+                    mois_fin = min(annee_credit * 12, len(interets))
+                    interets_total += float(interets[mois_debut:mois_fin].sum())
         return interets_total
 
     def calculer_amortissements_annee(self, annee: int) -> float:
         """Calcule le total des amortissements pour une année."""
-        amort_total = 0.0
-        for bien in self.biens:
-            if annee >= bien.annee_achat:
-                amortissements = bien.calculer_amortissements_annee(annee)
-                amort_total += sum(amortissements.values())
-        return amort_total
+        biens = self.index_acquisitions().biens_detenus(annee)
+        matrice = self._amortissement_calculator.calculer_matrice(biens, [annee])
+        return float(matrice.dotations_annuelles[0])
 
     def calculer_resultat_annee(self, annee: int) -> Dict[str, float]:
         """Calcule le compte de résultat pour une année donnée."""
         return self._fiscal_calculator.calculer_resultat_annuel(self, annee)
 
-    def calculer_is(self, resultat_avant_impot: float) -> float:
+    def calculer_is(self, resultat_avant_impot: float, annee: Optional[int] = None) -> float:
         """Expose le calcul de l'impôt sur les sociétés."""
-        return self._fiscal_calculator.calculer_is(resultat_avant_impot)
+        return self._fiscal_calculator.calculer_is(resultat_avant_impot, annee)
 
     def calculer_tresorerie_annee(self, annee: int, reserves_precedentes: float = 0.0) -> Dict[str, float]:
         """Calcule la trésorerie pour une année donnée."""
         return self._tresorerie_calculator.calculer_annee(self, annee, reserves_precedentes)
 
+    def calculer_projection(self, duree_annees: int = 20) -> ProjectionAnnuelle:
+        """Calcule toutes les années de la projection sous forme de colonnes."""
+        return self._projection_calculator.calculer(self, duree_annees)
+
     def generer_projection(self, duree_annees: int = 20) -> pd.DataFrame:
         """Génère une projection financière complète sur plusieurs années."""
-        projections: List[Dict[str, float]] = []
-        reserves = 0.0
-        for i in range(duree_annees):
-            annee = self.annee_creation + i
-            resultat = self.calculer_resultat_annee(annee)
-            tresorerie = self.calculer_tresorerie_annee(annee, reserves)
-            projections.append({**resultat, **tresorerie})
-            reserves = tresorerie["reserves_fin"]
-        return pd.DataFrame(projections)
+        return self.calculer_projection(duree_annees).projection()
 
     def generer_synthese_biens(self) -> pd.DataFrame:
         """Génère une synthèse des biens immobiliers."""
@@ -149,3 +207,29 @@ class SCI:
                 }
             )
         return pd.DataFrame(synthese)
+
+    def generer_credits_annuels(self) -> pd.DataFrame:
+        """Tableau consolidé des crédits : une ligne par bien et par année de crédit.
+
+        Les échéanciers de tous les biens sont agrégés par année en une seule
+        passe vectorisée, sans construire les tableaux mensuels.
+        """
+        biens = [bien for bien in self.biens if bien.credit and bien.credit.capital_emprunte]
+        if not biens:
+            return pd.DataFrame(columns=COLONNES_CREDITS_ANNUELS)
+
+        echeanciers = calculer_echeanciers(**colonnes_credits(bien.credit for bien in biens), par_annee=True)
+        lignes, periodes = np.nonzero(echeanciers.actifs)
+        annees_achat = np.array([bien.annee_achat for bien in biens], dtype=int)
+        return pd.DataFrame(
+            {
+                "N°": np.array([bien.numero for bien in biens], dtype=int)[lignes],
+                "Bien": np.array([bien.nom for bien in biens], dtype=object)[lignes],
+                "Année crédit": periodes + 1,
+                "Année": annees_achat[lignes] + periodes,
+                "Intérêts": echeanciers.interets[lignes, periodes],
+                "Capital amorti": echeanciers.capital_amorti[lignes, periodes],
+                "Capital restant fin": echeanciers.capital_restant[lignes, periodes],
+            },
+            columns=COLONNES_CREDITS_ANNUELS,
+        )
@@ -0,0 +1,21 @@
+"""Process-wide version counter shared by the mutable models."""
+from itertools import count
+
+_compteur = count(1)
+_derniere = 0
+
+
+def nouvelle_version() -> int:
+    """Numéro strictement croissant et unique dans le processus.
+
+    Chaque modification d'un modèle lui attribue un nouveau numéro : deux
+    états distincts, même d'objets différents, n'ont jamais la même version.
+    """
+    global _derniere
+    _derniere = next(_compteur)
+    return _derniere
+
+
+def derniere_version() -> int:
+    """Dernier numéro attribué : il change dès qu'un modèle, quel qu'il soit, est modifié."""
+    return _derniere
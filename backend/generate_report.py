@@ -148,8 +148,14 @@ def afficher_menu():
     return choix
 
 
-def generer_rapport(sci, duree_projection=20):
-    """Génère un rapport complet pour une SCI"""
+def generer_rapport(sci, duree_projection=20, credits_annuels=False, detail_mensuel=()):
+    """
+    Génère un rapport complet pour une SCI
+    
+    Avec ``credits_annuels``, les crédits sont consolidés dans un seul onglet
+    annuel et seuls les biens listés dans ``detail_mensuel`` (numéros) gardent
+    leur tableau d'amortissement mensuel, ce qui allège les gros portefeuilles.
+    """
     
     print("\n" + "="*80)
     print(f"📊 GÉNÉRATION DU RAPPORT POUR: {sci.nom}")
@@ -195,7 +201,7 @@ def generer_rapport(sci, duree_projection=20):
     
     # Générer le fichier Excel
     print("\n📄 GÉNÉRATION DU FICHIER EXCEL...")
-    exporteur = ExporteurSCI(sci)
+    exporteur = ExporteurSCI(sci, credits_annuels=credits_annuels, detail_mensuel=detail_mensuel)
     chemin_excel = exporteur.generer_excel_complet(duree_annees=duree_projection)
     
     print("\n" + "="*80)
@@ -209,7 +215,12 @@ def generer_rapport(sci, duree_projection=20):
     print("  • 💰 Compte de Résultat")
     print("  • 💵 Trésorerie")
     print("  • 🏠 Détail de chaque bien")
-    print("  • 💳 Tableaux d'amortissement des crédits")
+    if credits_annuels:
+        print("  • 💳 Crédits par année (tous les biens)")
+        if detail_mensuel:
+            print("  • 💳 Tableaux d'amortissement mensuels des biens sélectionnés")
+    else:
+        print("  • 💳 Tableaux d'amortissement des crédits")
     print()
 
 
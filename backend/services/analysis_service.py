@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
 from backend.core.calculators.fiscal import FiscalCalculator
+from backend.core.calculators.projection import ProjectionAnnuelle, ProjectionCalculator
+from backend.core.calculators.rendement import RendementCalculator
 from backend.core.calculators.tresorerie import TresorerieCalculator
 from backend.core.models.sci import SCI
 from backend.core.validators.bien_validator import validate_bien
@@ -20,10 +22,16 @@ class AnalysisService:
     sci: SCI
     fiscal_calculator: FiscalCalculator = field(default_factory=FiscalCalculator)
     tresorerie_calculator: TresorerieCalculator = field(default_factory=TresorerieCalculator)
+    projection_calculator: ProjectionCalculator = field(default_factory=ProjectionCalculator)
+    rendement_calculator: RendementCalculator = field(default_factory=RendementCalculator)
+    incremental: bool = True
+    _cache_empreinte: Optional[Tuple] = field(default=None, init=False, repr=False)
+    _cache_projection: Optional[ProjectionAnnuelle] = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         # Garantit que les calculateurs partagent les mêmes règles fiscales
         self.tresorerie_calculator.fiscal_calculator = self.fiscal_calculator
+        self.projection_calculator.fiscal_calculator = self.fiscal_calculator
 
     def validate(self) -> List[str]:
         """Valide la SCI et l'ensemble de ses biens."""
@@ -32,37 +40,98 @@ class AnalysisService:
             erreurs.extend(validate_bien(bien))
         return erreurs
 
+    def calculer_projection(self, duree_annees: int = 20) -> ProjectionAnnuelle:
+        """Calcule en une passe toutes les colonnes de la projection.
+
+        Le résultat est mémorisé pour l'état courant de la SCI : les trois vues
+        (projection, compte de résultat, trésorerie) le partagent, et un
+        horizon plus court réutilise la projection déjà calculée. Toute
+        modification de la SCI, de ses biens ou de ses apports l'invalide ; en
+        mode incrémental, un simple ajout de biens ou d'apports CCA met à jour
+        la projection mémorisée au lieu de la recalculer.
+        """
+        empreinte = self.sci.empreinte()
+        cache = self._cache_projection
+        if cache is not None and self._cache_empreinte != empreinte and self.incremental:
+            cache = self._mettre_a_jour(cache, self._cache_empreinte, empreinte)
+        elif cache is not None and self._cache_empreinte != empreinte:
+            cache = None
+
+        if cache is None or cache.duree_annees < duree_annees:
+            cache = self.projection_calculator.calculer(self.sci, duree_annees)
+        self._memoriser(cache, empreinte)
+
+        if cache.duree_annees == duree_annees:
+            return cache
+        return cache.tronquer(duree_annees)
+
+    def _mettre_a_jour(
+        self, cache: ProjectionAnnuelle, ancienne: Tuple, nouvelle: Tuple
+    ) -> Optional[ProjectionAnnuelle]:
+        """Applique les ajouts de biens ou d'apports à ``cache`` ; ``None`` si un recalcul est nécessaire."""
+        anciens_biens, anciens_apports = ancienne[-2], ancienne[-1]
+        nouveaux_biens, nouveaux_apports = nouvelle[-2], nouvelle[-1]
+        if (
+            ancienne[:-2] != nouvelle[:-2]
+            or nouveaux_biens[: len(anciens_biens)] != anciens_biens
+            or nouveaux_apports[: len(anciens_apports)] != anciens_apports
+        ):
+            return None
+
+        biens_ajoutes = self.sci.biens[len(anciens_biens):]
+        if biens_ajoutes:
+            return self.projection_calculator.ajouter_biens(self.sci, cache, biens_ajoutes)
+        return self.projection_calculator.actualiser(self.sci, cache)
+
+    def _memoriser(self, projection: ProjectionAnnuelle, empreinte: Tuple) -> None:
+        for colonne in (*projection.colonnes.values(), *projection.flux.values()):
+            colonne.setflags(write=False)
+        self._cache_projection = projection
+        self._cache_empreinte = empreinte
+
+    def invalider_cache(self) -> None:
+        """Oublie la projection mémorisée."""
+        self._cache_empreinte = None
+        self._cache_projection = None
+
     def generer_projection(self, duree_annees: int = 20) -> pd.DataFrame:
         """Retourne la projection financière en utilisant le modèle."""
-        projections: List[Dict[str, float]] = []
-        reserves = 0.0
-        for i in range(duree_annees):
-            annee = self.sci.annee_creation + i
-            resultat = self.fiscal_calculator.calculer_resultat_annuel(self.sci, annee)
-            tresorerie = self.tresorerie_calculator.calculer_annee(self.sci, annee, reserves)
-            projections.append({**resultat, **tresorerie})
-            reserves = tresorerie["reserves_fin"]
-        return pd.DataFrame(projections)
+        return self.calculer_projection(duree_annees).projection()
+
+    def calculer_rendements(
+        self,
+        duree_annees: int = 20,
+        taux_actualisation: float = 0.05,
+        revente: bool = True,
+        revalorisation_annuelle: float = 0.0,
+        frais_vente: float = 0.0,
+    ) -> Dict[str, float]:
+        """TRI, VAN, multiple et délai de récupération des associés sur l'horizon.
+
+        Avec ``revente``, les biens sont supposés revendus à la fin de la
+        dernière année, nets des frais de vente et des capitaux restant dus.
+        """
+        projection = self.calculer_projection(duree_annees)
+        valeur_terminale = 0.0
+        if revente and duree_annees > 0:
+            valeur_terminale = self.rendement_calculator.valeur_revente_nette(
+                self.sci, int(projection.colonnes["annee"][-1]), revalorisation_annuelle, frais_vente
+            )
+        indicateurs = self.rendement_calculator.calculer(projection, taux_actualisation, valeur_terminale)
+        return {nom: float(valeur) for nom, valeur in indicateurs.items()}
 
     def generer_synthese_biens(self) -> pd.DataFrame:
         """Expose la synthèse des biens via le modèle."""
         return self.sci.generer_synthese_biens()
 
+    def generer_credits_annuels(self) -> pd.DataFrame:
+        """Expose le tableau consolidé des crédits par année via le modèle."""
+        return self.sci.generer_credits_annuels()
+
     def generer_compte_resultat(self, duree_annees: int = 20) -> pd.DataFrame:
         """Produit un compte de résultat pluriannuel."""
-        resultats = [
-            self.fiscal_calculator.calculer_resultat_annuel(self.sci, self.sci.annee_creation + i)
-            for i in range(duree_annees)
-        ]
-        return pd.DataFrame(resultats)
+        return self.calculer_projection(duree_annees).compte_resultat()
 
     def generer_tresorerie(self, duree_annees: int = 20) -> pd.DataFrame:
         """Produit l'évolution de la trésorerie."""
-        tresoreries: List[Dict[str, float]] = []
-        reserves = 0.0
-        for i in range(duree_annees):
-            annee = self.sci.annee_creation + i
-            tresorerie = self.tresorerie_calculator.calculer_annee(self.sci, annee, reserves)
-            tresoreries.append(tresorerie)
-            reserves = tresorerie["reserves_fin"]
-        return pd.DataFrame(tresoreries)
+        return self.calculer_projection(duree_annees).tresorerie()
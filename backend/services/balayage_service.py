@@ -0,0 +1,234 @@
+"""Parameter sweeps (sensitivity grids) over the SCI projection."""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.core.calculators.projection import ProjectionAnnuelle
+from backend.core.models.credit import agreger_par_annee
+from backend.core.models.portefeuille_credits import calculer_mensualites
+from backend.core.models.sci import SCI
+from backend.services.analysis_service import AnalysisService
+
+AXES = ("prix_achat", "taux_annuel", "duree_annees", "facteur_loyer", "apport_sci")
+
+
+def calculer_indicateurs(projection: ProjectionAnnuelle) -> Dict[str, np.ndarray]:
+    """Indicateurs clés d'une projection, éventuellement à plusieurs dimensions."""
+    colonnes = projection.colonnes
+    cashflow = colonnes["cashflow"]
+    tresorerie = np.cumsum(colonnes["tresorerie_realisee"], axis=-1)
+    return {
+        "cashflow_premiere_annee": cashflow[..., 0],
+        "cashflow_minimal": cashflow.min(axis=-1),
+        "cashflow_cumule": cashflow.sum(axis=-1),
+        "tresorerie_minimale": tresorerie.min(axis=-1),
+        "tresorerie_finale": tresorerie[..., -1],
+        "resultat_net_cumule": colonnes["resultat_net"].sum(axis=-1),
+        "impot_total": colonnes["impot_societes"].sum(axis=-1),
+    }
+
+
+class EvaluateurBien:
+    """Réévalue la projection d'une SCI pour de nombreuses variantes d'un de ses biens.
+
+    La contribution du bien étudié est retirée une fois pour toutes des flux
+    de la projection ; chaque variante (prix d'achat, taux et durée du crédit,
+    niveau de loyer, apport de la SCI) est ensuite recalculée en bloc sous
+    forme de tableaux ``(variantes, années)``. Une hausse du prix d'achat est
+    financée par le crédit du bien lorsqu'il en a un, une hausse de l'apport
+    le réduit d'autant. Les flux du crédit sont mémorisés lorsque ses
+    paramètres sont identiques pour toutes les variantes (balayage du loyer
+    seul, itérations successives d'un solveur).
+    """
+
+    def __init__(self, analysis_service: AnalysisService, indice_bien: int = 0, duree_annees: int = 20) -> None:
+        self.sci = analysis_service.sci
+        self.projection_calculator = analysis_service.projection_calculator
+        self.bien = self.sci.biens[indice_bien]
+
+        projection = analysis_service.calculer_projection(duree_annees)
+        self.annees = projection.colonnes["annee"]
+        self.actif = self.annees >= self.bien.annee_achat
+
+        config = self.sci.amortissement_calculator.config
+        self.duree_murs = config.MURS
+        annees_depuis_achat = self.annees - self.bien.annee_achat + 1
+        self.actif_murs = (annees_depuis_achat >= 1) & (annees_depuis_achat <= config.MURS)
+        matrice = self.sci.amortissement_calculator.calculer_matrice([self.bien], self.annees)
+        self.amortissements_hors_murs = matrice.dotations[0, :, 1:].sum(axis=1)
+        self._cache_credit: Dict[Tuple[float, float, int], Tuple[float, np.ndarray]] = {}
+
+        contribution = self._contribution(self.parametres_defaut())
+        self.flux_fixes = {
+            nom: colonne - contribution[nom] if nom in contribution else colonne
+            for nom, colonne in projection.flux.items()
+        }
+
+    def parametres_defaut(self) -> Dict[str, float]:
+        """Valeurs actuelles des paramètres du bien étudié."""
+        credit = self.bien.credit
+        return {
+            "prix_achat": self.bien.prix_achat,
+            "taux_annuel": credit.taux_annuel if credit else 0.0,
+            "duree_annees": credit.duree_annees if credit else 0,
+            "facteur_loyer": 1.0,
+            "apport_sci": self.bien.apport_sci,
+        }
+
+    def projeter(self, **parametres) -> ProjectionAnnuelle:
+        """Projection de chaque variante ; les paramètres sont des tableaux compatibles entre eux."""
+        inconnus = set(parametres) - set(AXES)
+        if inconnus:
+            raise ValueError(f"Paramètres inconnus : {', '.join(sorted(inconnus))}")
+        if not self.bien.credit and ({"taux_annuel", "duree_annees"} & set(parametres)):
+            raise ValueError("Le bien étudié n'a pas de crédit : taux et durée ne peuvent pas varier.")
+
+        valeurs = {**self.parametres_defaut(), **parametres}
+        contribution = self._contribution(valeurs)
+        flux = {
+            nom: colonne + contribution[nom] if nom in contribution else colonne
+            for nom, colonne in self.flux_fixes.items()
+        }
+        return self.projection_calculator.completer(self.sci, self.annees, flux)
+
+    def evaluer(self, **parametres) -> Dict[str, np.ndarray]:
+        """Indicateurs clés de chaque variante."""
+        return calculer_indicateurs(self.projeter(**parametres))
+
+    def _contribution(self, valeurs: Mapping[str, object]) -> Dict[str, np.ndarray]:
+        bien = self.bien
+        prix_achat, taux_annuel, duree_annees, facteur_loyer, apport_sci = np.broadcast_arrays(
+            *(np.asarray(valeurs[axe], dtype=float) for axe in AXES)
+        )
+        ligne = (..., np.newaxis)
+        forme = prix_achat.shape + self.annees.shape
+
+        capital = np.zeros_like(prix_achat)
+        contribution = {"interets": np.zeros(forme), "mensualites": np.zeros(forme)}
+        if bien.credit:
+            capital = bien.credit.capital_emprunte + (prix_achat - bien.prix_achat) - (apport_sci - bien.apport_sci)
+            mensualites, interets = self._flux_credit(capital, taux_annuel, duree_annees.astype(int))
+            contribution["interets"] = np.broadcast_to(interets, forme)
+            contribution["mensualites"] = np.where(self.actif, mensualites * 12, 0.0)
+
+        charges = (
+            prix_achat * bien.assurance_pno_taux
+            + capital * bien.assurance_emprunt_taux
+            + bien.taxe_fonciere
+            + bien.charges_copro
+            + bien.autres_charges
+        )
+        murs = np.where(self.actif_murs, (prix_achat[ligne] - bien.travaux) / self.duree_murs, 0.0)
+        contribution["revenus"] = np.where(self.actif, bien.revenus_annuels * facteur_loyer[ligne], 0.0)
+        contribution["charges_biens"] = np.where(self.actif, charges[ligne], 0.0)
+        contribution["amortissements"] = murs + self.amortissements_hors_murs
+        contribution["sorties_apport"] = np.where(self.annees == bien.annee_achat, apport_sci[ligne], 0.0)
+        return contribution
+
+    def _flux_credit(
+        self, capital: np.ndarray, taux_annuel: np.ndarray, duree_annees: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Mensualités ``(variantes, 1)`` et intérêts annuels ``(variantes, années)`` du crédit."""
+        uniforme = capital.size > 0 and all(
+            np.all(valeurs == valeurs.flat[0]) for valeurs in (capital, taux_annuel, duree_annees)
+        )
+        if uniforme:
+            cle = (float(capital.flat[0]), float(taux_annuel.flat[0]), int(duree_annees.flat[0]))
+            if cle not in self._cache_credit:
+                mensualite, interets = self._calculer_flux_credit(
+                    np.array(cle[:1]), np.array(cle[1:2]), np.array(cle[2:], dtype=int)
+                )
+                self._cache_credit = {cle: (mensualite[0], interets[0])}
+            mensualite, interets = self._cache_credit[cle]
+            return np.full(capital.shape + (1,), mensualite[0]), interets
+        return self._calculer_flux_credit(capital, taux_annuel, duree_annees)
+
+    def _calculer_flux_credit(
+        self, capital: np.ndarray, taux_annuel: np.ndarray, duree_annees: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        credit = self.bien.credit
+        mensualites = calculer_mensualites(
+            capital, taux_annuel, duree_annees, credit.differe_partiel_mois, credit.differe_total_mois
+        ).reshape(capital.shape + (1,))
+        interets = agreger_par_annee(
+            capital[..., np.newaxis],
+            taux_annuel[..., np.newaxis] / 12,
+            mensualites,
+            duree_annees[..., np.newaxis] * 12,
+            self.annees - self.bien.annee_achat + 1,
+            credit.differe_partiel_mois,
+            credit.differe_total_mois,
+        )["interets"]
+        return mensualites, interets
+
+
+@dataclass
+class ResultatBalayage:
+    """Indicateurs d'un balayage, un tableau à N dimensions (une par axe) par indicateur."""
+
+    axes: Dict[str, np.ndarray]
+    indicateurs: Dict[str, np.ndarray]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Format long : une ligne par combinaison de paramètres."""
+        grilles = np.meshgrid(*self.axes.values(), indexing="ij")
+        donnees = {nom: grille.ravel() for nom, grille in zip(self.axes, grilles)}
+        donnees.update({nom: valeurs.ravel() for nom, valeurs in self.indicateurs.items()})
+        return pd.DataFrame(donnees)
+
+
+@dataclass
+class BalayageService:
+    """Évalue des grilles de sensibilité sur un bien d'une SCI."""
+
+    analysis_service: AnalysisService
+
+    def balayer(
+        self,
+        axes: Mapping[str, Sequence[float]],
+        indice_bien: int = 0,
+        duree_annees: int = 20,
+        taille_bloc: int = 20_000,
+        nombre_processus: Optional[int] = None,
+    ) -> ResultatBalayage:
+        """Évalue le produit cartésien des ``axes`` (voir :data:`AXES`).
+
+        Les combinaisons sont évaluées par blocs vectorisés de ``taille_bloc``,
+        répartis sur un pool de processus si ``nombre_processus`` > 1.
+        """
+        evaluateur = EvaluateurBien(self.analysis_service, indice_bien, duree_annees)
+        axes = {nom: np.asarray(valeurs) for nom, valeurs in axes.items()}
+        forme = tuple(len(valeurs) for valeurs in axes.values())
+        grilles = np.meshgrid(*axes.values(), indexing="ij")
+        points = {nom: grille.ravel() for nom, grille in zip(axes, grilles)}
+
+        nombre_points = int(np.prod(forme)) if forme else 1
+        blocs = [
+            {nom: valeurs[debut:debut + taille_bloc] for nom, valeurs in points.items()}
+            for debut in range(0, nombre_points, taille_bloc)
+        ]
+        if nombre_processus and nombre_processus > 1 and len(blocs) > 1:
+            with ProcessPoolExecutor(max_workers=nombre_processus) as executor:
+                resultats = list(executor.map(_evaluer_bloc, [evaluateur] * len(blocs), blocs))
+        else:
+            resultats = [_evaluer_bloc(evaluateur, bloc) for bloc in blocs]
+
+        indicateurs = {
+            nom: np.concatenate([np.atleast_1d(resultat[nom]) for resultat in resultats]).reshape(forme)
+            for nom in resultats[0]
+        }
+        return ResultatBalayage(axes=axes, indicateurs=indicateurs)
+
+    @classmethod
+    def from_sci(cls, sci: SCI) -> "BalayageService":
+        """Crée un service de balayage directement depuis un modèle de SCI."""
+        return cls(AnalysisService(sci))
+
+
+def _evaluer_bloc(evaluateur: EvaluateurBien, parametres: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    return evaluateur.evaluer(**parametres)
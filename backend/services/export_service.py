@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from io import BytesIO
 from pathlib import Path
+from typing import BinaryIO, Iterable, Union
 
 import pandas as pd
 
@@ -16,17 +18,20 @@ class ExportService:
 
     analysis_service: AnalysisService
 
-    def export_excel(
+    def ecrire_excel(
         self,
-        dossier: Path,
-        nom_fichier: str = "analyse_sci.xlsx",
+        destination: Union[Path, BinaryIO],
         duree_annees: int = 20,
-    ) -> Path:
-        """Exporte la projection, le compte de résultat et la trésorerie en Excel."""
-        dossier.mkdir(parents=True, exist_ok=True)
-        chemin = dossier / nom_fichier
+        credits_annuels: bool = False,
+        detail_mensuel: Iterable[int] = (),
+    ) -> None:
+        """Écrit la projection, le compte de résultat et la trésorerie dans un fichier ou un flux binaire.
 
-        with pd.ExcelWriter(chemin) as writer:
+        Avec ``credits_annuels``, ajoute la feuille consolidée « Crédits » (une
+        ligne par bien et par année de crédit) et le tableau d'amortissement
+        mensuel des seuls biens dont le numéro figure dans ``detail_mensuel``.
+        """
+        with pd.ExcelWriter(destination) as writer:
             projection = self.analysis_service.generer_projection(duree_annees)
             projection.to_excel(writer, sheet_name="Projection", index=False)
 
@@ -39,6 +44,43 @@ class ExportService:
             synthese_biens = self.analysis_service.generer_synthese_biens()
             synthese_biens.to_excel(writer, sheet_name="Biens", index=False)
 
+            if credits_annuels:
+                self._ecrire_credits(writer, set(detail_mensuel))
+
+    def _ecrire_credits(self, writer: pd.ExcelWriter, detail_mensuel: set) -> None:
+        """Feuille consolidée des crédits par année, puis détail mensuel des biens demandés."""
+        credits = self.analysis_service.generer_credits_annuels()
+        credits.to_excel(writer, sheet_name="Crédits", index=False)
+
+        for bien in self.analysis_service.sci.biens:
+            if bien.numero in detail_mensuel and bien.credit and bien.credit.capital_emprunte:
+                tableau = bien.credit.tableau_amortissement
+                tableau.to_excel(writer, sheet_name=f"Crédit bien {bien.numero}", index=False)
+
+    def export_excel_flux(
+        self,
+        duree_annees: int = 20,
+        credits_annuels: bool = False,
+        detail_mensuel: Iterable[int] = (),
+    ) -> BytesIO:
+        """Classeur Excel construit en mémoire, positionné au début pour être servi tel quel."""
+        flux = BytesIO()
+        self.ecrire_excel(flux, duree_annees, credits_annuels, detail_mensuel)
+        flux.seek(0)
+        return flux
+
+    def export_excel(
+        self,
+        dossier: Path,
+        nom_fichier: str = "analyse_sci.xlsx",
+        duree_annees: int = 20,
+        credits_annuels: bool = False,
+        detail_mensuel: Iterable[int] = (),
+    ) -> Path:
+        """Exporte la projection, le compte de résultat et la trésorerie dans ``dossier``."""
+        dossier.mkdir(parents=True, exist_ok=True)
+        chemin = dossier / nom_fichier
+        self.ecrire_excel(chemin, duree_annees, credits_annuels, detail_mensuel)
         return chemin
 
     @classmethod
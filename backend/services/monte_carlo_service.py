@@ -0,0 +1,237 @@
+"""Monte Carlo risk analysis on top of the columnar SCI projection."""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backend.core.calculators.projection import COLONNES_FLUX, ProjectionAnnuelle, ProjectionCalculator
+from backend.core.calculators.rendement import (
+    RendementCalculator,
+    calculer_multiple,
+    calculer_tri,
+    calculer_van,
+)
+from backend.core.models.sci import SCI
+from backend.services.analysis_service import AnalysisService
+
+TAILLE_BLOC = 10_000
+
+
+@dataclass
+class HypothesesMonteCarlo:
+    """Lois des aléas simulés, tirés indépendamment pour chaque année.
+
+    Les taux sont exprimés en décimal. Le choc de taux suit une marche
+    aléatoire appliquée à tous les crédits (taux variables) : il s'ajoute au
+    taux contractuel sur le capital restant dû moyen de l'année et augmente
+    d'autant les intérêts et les échéances.
+    """
+
+    vacance_moyenne: float = 0.05
+    vacance_ecart_type: float = 0.03
+    indexation_moyenne: float = 0.015
+    indexation_ecart_type: float = 0.01
+    inflation_moyenne: float = 0.02
+    inflation_ecart_type: float = 0.01
+    volatilite_taux: float = 0.0
+
+
+@dataclass
+class ResultatMonteCarlo:
+    """Trajectoires simulées, une ligne par scénario et une colonne par année."""
+
+    annees: np.ndarray
+    cashflow: np.ndarray
+    reserves: np.ndarray
+    tresorerie: np.ndarray
+    apports: Optional[np.ndarray] = None
+
+    @property
+    def nombre_scenarios(self) -> int:
+        return self.cashflow.shape[0]
+
+    @property
+    def tresorerie_minimale(self) -> np.ndarray:
+        """Point bas de trésorerie de chaque scénario."""
+        return self.tresorerie.min(axis=1)
+
+    @property
+    def probabilite_tresorerie_negative(self) -> float:
+        """Part des scénarios dont la trésorerie passe sous zéro au moins une année (``NaN`` sans scénario)."""
+        if self.nombre_scenarios == 0:
+            return float("nan")
+        return float((self.tresorerie_minimale < 0).mean())
+
+    def _percentiles(self, valeurs: np.ndarray, centiles: Sequence[float]) -> np.ndarray:
+        """Percentiles sur l'axe des scénarios, ``NaN`` lorsqu'il n'y en a aucun."""
+        if self.nombre_scenarios == 0:
+            return np.full((len(centiles),) + valeurs.shape[1:], np.nan)
+        return np.percentile(valeurs, centiles, axis=0)
+
+    def flux_fonds_propres(self, valeur_terminale: np.ndarray | float = 0.0) -> np.ndarray:
+        """Flux des associés de chaque scénario, calculés par :class:`RendementCalculator`."""
+        apports = self.apports if self.apports is not None else np.zeros(len(self.annees))
+        scenarios = ProjectionAnnuelle(
+            {"annee": self.annees, "cashflow": self.cashflow, "apports_associes": apports}
+        )
+        return RendementCalculator().flux_fonds_propres(scenarios, valeur_terminale)
+
+    def rendements(
+        self, taux_actualisation: np.ndarray | float = 0.05, valeur_terminale: np.ndarray | float = 0.0
+    ) -> Dict[str, np.ndarray]:
+        """TRI, VAN et multiple sur fonds propres de chaque scénario."""
+        flux = self.flux_fonds_propres(valeur_terminale)
+        return {
+            "tri": calculer_tri(flux),
+            "van": calculer_van(flux, taux_actualisation),
+            "multiple": calculer_multiple(flux),
+        }
+
+    def percentiles(self, centiles: Sequence[float] = (5, 25, 50, 75, 95)) -> pd.DataFrame:
+        """Percentiles annuels du cash-flow, des réserves et de la trésorerie."""
+        donnees: Dict[str, np.ndarray] = {"annee": self.annees}
+        for nom, valeurs in (
+            ("cashflow", self.cashflow),
+            ("reserves", self.reserves),
+            ("tresorerie", self.tresorerie),
+        ):
+            quantiles = self._percentiles(valeurs, centiles)
+            for centile, quantile in zip(centiles, quantiles):
+                donnees[f"{nom}_p{centile:g}"] = quantile
+        return pd.DataFrame(donnees)
+
+    def synthese(self, centiles: Sequence[float] = (5, 25, 50, 75, 95)) -> Dict[str, float]:
+        """Indicateurs de risque agrégés sur l'horizon (``NaN`` sans scénario)."""
+        synthese = {
+            f"tresorerie_minimale_p{centile:g}": float(valeur)
+            for centile, valeur in zip(centiles, self._percentiles(self.tresorerie_minimale, centiles))
+        }
+        synthese["probabilite_tresorerie_negative"] = self.probabilite_tresorerie_negative
+        return synthese
+
+
+@dataclass
+class MonteCarloService:
+    """Évalue des milliers de scénarios de marché sur la projection d'une SCI."""
+
+    analysis_service: AnalysisService
+    hypotheses: HypothesesMonteCarlo = field(default_factory=HypothesesMonteCarlo)
+
+    def simuler(
+        self,
+        nombre_scenarios: int = 10_000,
+        duree_annees: int = 20,
+        graine: Optional[int] = None,
+        nombre_processus: Optional[int] = None,
+    ) -> ResultatMonteCarlo:
+        """Simule ``nombre_scenarios`` trajectoires sur ``duree_annees`` années.
+
+        Les scénarios sont traités par blocs de :data:`TAILLE_BLOC` ayant chacun
+        leur propre générateur, de sorte que le résultat ne dépend pas du
+        nombre de processus utilisés.
+        """
+        if nombre_scenarios < 1:
+            raise ValueError("nombre_scenarios doit valoir au moins 1")
+        base = self._base(duree_annees)
+        graines = np.random.SeedSequence(graine).spawn(-(-nombre_scenarios // TAILLE_BLOC))
+        tailles = [
+            min(TAILLE_BLOC, nombre_scenarios - i * TAILLE_BLOC) for i in range(len(graines))
+        ]
+        sci = self.analysis_service.sci
+        projection_calculator = self.analysis_service.projection_calculator
+        arguments = [
+            (base, self.hypotheses, sci, projection_calculator, taille, g) for taille, g in zip(tailles, graines)
+        ]
+
+        if nombre_processus and nombre_processus > 1 and len(arguments) > 1:
+            with ProcessPoolExecutor(max_workers=nombre_processus) as executor:
+                blocs = list(executor.map(_simuler_bloc, *zip(*arguments)))
+        else:
+            blocs = [_simuler_bloc(*args) for args in arguments]
+
+        return ResultatMonteCarlo(
+            annees=base["annee"],
+            cashflow=np.concatenate([bloc["cashflow"] for bloc in blocs]),
+            reserves=np.concatenate([bloc["reserves"] for bloc in blocs]),
+            tresorerie=np.concatenate([bloc["tresorerie"] for bloc in blocs]),
+            apports=base["apports"],
+        )
+
+    def _base(self, duree_annees: int) -> Dict[str, np.ndarray]:
+        """Colonnes déterministes dont les scénarios sont des perturbations."""
+        sci = self.analysis_service.sci
+        projection = self.analysis_service.calculer_projection(duree_annees)
+        annees = projection.colonnes["annee"]
+
+        encours_moyen = np.zeros(len(annees))
+        for bien in sci.biens:
+            if bien.credit:
+                annees_credit = annees - bien.annee_achat + 1
+                fin = bien.credit.agreger_annees(annees_credit)["capital_restant_fin"]
+                debut = bien.credit.agreger_annees(annees_credit - 1)["capital_restant_fin"]
+                debut = np.where(annees_credit == 1, bien.credit.capital_emprunte, debut)
+                encours_moyen += np.where(annees_credit >= 1, (debut + fin) / 2, 0.0)
+
+        return {
+            **projection.flux,
+            "annee": annees,
+            "apports": self.analysis_service.rendement_calculator.apports(projection),
+            "encours_moyen": encours_moyen,
+        }
+
+    @classmethod
+    def from_sci(cls, sci: SCI, hypotheses: Optional[HypothesesMonteCarlo] = None) -> "MonteCarloService":
+        """Crée un service de simulation directement depuis un modèle de SCI."""
+        return cls(AnalysisService(sci), hypotheses or HypothesesMonteCarlo())
+
+
+def _trajectoire_cumulee(taux: np.ndarray) -> np.ndarray:
+    """Facteurs ``prod(1 + taux)`` par année, la première année valant 1."""
+    facteurs = np.ones_like(taux)
+    np.cumprod(1.0 + taux[:, 1:], axis=1, out=facteurs[:, 1:])
+    return facteurs
+
+
+def _simuler_bloc(
+    base: Dict[str, np.ndarray],
+    hypotheses: HypothesesMonteCarlo,
+    sci: SCI,
+    projection_calculator: ProjectionCalculator,
+    nombre: int,
+    graine: np.random.SeedSequence,
+) -> Dict[str, np.ndarray]:
+    generateur = np.random.default_rng(graine)
+    forme = (nombre, len(base["annee"]))
+
+    vacance = np.clip(
+        generateur.normal(hypotheses.vacance_moyenne, hypotheses.vacance_ecart_type, forme), 0.0, 1.0
+    )
+    indexation = _trajectoire_cumulee(
+        generateur.normal(hypotheses.indexation_moyenne, hypotheses.indexation_ecart_type, forme)
+    )
+    inflation = _trajectoire_cumulee(
+        generateur.normal(hypotheses.inflation_moyenne, hypotheses.inflation_ecart_type, forme)
+    )
+    choc_taux = np.cumsum(generateur.normal(0.0, hypotheses.volatilite_taux, forme), axis=1)
+
+    # Flux perturbés de chaque scénario ; les autres colonnes en sont dérivées comme pour la projection
+    surcout_taux = base["encours_moyen"] * choc_taux
+    flux = {
+        **{nom: base[nom] for nom in COLONNES_FLUX},
+        "revenus": base["revenus"] * indexation * (1.0 - vacance),
+        "charges_biens": base["charges_biens"] * inflation,
+        "interets": base["interets"] + surcout_taux,
+        "mensualites": base["mensualites"] + surcout_taux,
+    }
+    colonnes = projection_calculator.completer(
+        sci, base["annee"], flux, charges_fixes=sci.charges_fixes_annuelles * inflation
+    ).colonnes
+    return {
+        "cashflow": colonnes["cashflow"],
+        "reserves": colonnes["reserves_fin"],
+        "tresorerie": np.cumsum(colonnes["tresorerie_realisee"], axis=1),
+    }
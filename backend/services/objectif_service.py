@@ -0,0 +1,251 @@
+"""Goal-seek solver: boundary value of one bien parameter for a projection constraint."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from backend.core.calculators.projection import ProjectionAnnuelle
+from backend.core.models.sci import SCI
+from backend.services.analysis_service import AnalysisService
+from backend.services.balayage_service import AXES, EvaluateurBien
+
+# Points évalués en un seul appel vectorisé à chaque itération
+POINTS_PAR_ITERATION = 16
+
+Marge = Callable[[ProjectionAnnuelle, EvaluateurBien, Dict[str, np.ndarray]], np.ndarray]
+
+
+@dataclass(frozen=True)
+class Contrainte:
+    """Condition sur la projection, satisfaite lorsque la marge est positive ou nulle.
+
+    ``marge`` reçoit la projection de toutes les variantes, l'évaluateur et les
+    valeurs des paramètres, et renvoie une marge par variante.
+    """
+
+    description: str
+    marge: Marge
+
+
+def _periode_detention(evaluateur: EvaluateurBien) -> np.ndarray:
+    """Années de détention du bien étudié (tout l'horizon s'il est acheté après)."""
+    return evaluateur.actif if evaluateur.actif.any() else np.ones_like(evaluateur.actif)
+
+
+def cashflow_minimal(seuil: float = 0.0) -> Contrainte:
+    """Cash-flow de la SCI au moins égal à ``seuil`` chaque année dès l'achat du bien."""
+
+    def marge(projection, evaluateur, valeurs):
+        cashflow = projection.colonnes["cashflow"][..., _periode_detention(evaluateur)]
+        return cashflow.min(axis=-1) - seuil
+
+    return Contrainte(f"cash-flow >= {seuil:g} dès l'achat", marge)
+
+
+def rendement_net_minimal(seuil: float = 5.0) -> Contrainte:
+    """Rentabilité nette après IS de la SCI (en %) au moins égale à ``seuil`` chaque année dès l'achat.
+
+    Même définition que :meth:`RentabiliteCalculator.calculer_nette`, au
+    niveau de la SCI et après impôt : loyers moins charges, annuités de crédit
+    et IS, rapportés au prix total des biens détenus.
+    """
+
+    def marge(projection, evaluateur, valeurs):
+        colonnes = projection.colonnes
+        annees = evaluateur.annees
+        prix_detenus = sum(
+            np.where(annees >= bien.annee_achat, bien.prix_total, 0.0) for bien in evaluateur.sci.biens
+        )
+        ecart_prix = np.asarray(valeurs["prix_achat"])[..., np.newaxis] - evaluateur.bien.prix_achat
+        prix_detenus = prix_detenus + np.where(evaluateur.actif, ecart_prix, 0.0)
+
+        revenus_nets = (
+            colonnes["revenus_locatifs"]
+            - colonnes["charges_exploitation"]
+            - colonnes["mensualites_credit"]
+            - colonnes["impot_societes"]
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rendement = np.where(prix_detenus > 0, revenus_nets / prix_detenus * 100, 0.0)
+        return rendement[..., _periode_detention(evaluateur)].min(axis=-1) - seuil
+
+    return Contrainte(f"rentabilité nette après IS >= {seuil:g} %", marge)
+
+
+def tresorerie_positive(seuil: float = 0.0) -> Contrainte:
+    """Trésorerie cumulée de la SCI jamais inférieure à ``seuil``."""
+
+    def marge(projection, evaluateur, valeurs):
+        tresorerie = np.cumsum(projection.colonnes["tresorerie_realisee"], axis=-1)
+        return tresorerie.min(axis=-1) - seuil
+
+    return Contrainte(f"trésorerie >= {seuil:g} chaque année", marge)
+
+
+@dataclass
+class ResultatObjectif:
+    """Valeur limite trouvée par le solveur.
+
+    ``valeur`` vaut ``None`` si aucune valeur de l'intervalle ne satisfait la
+    contrainte ; si toutes la satisfont, c'est la borne la plus favorable.
+    """
+
+    variable: str
+    contrainte: str
+    valeur: Optional[float]
+    marge: Optional[float]
+    iterations: int
+    evaluations: int
+
+    @property
+    def atteint(self) -> bool:
+        return self.valeur is not None
+
+
+class SolveurObjectif:
+    """Recherche la valeur limite d'un paramètre d'un bien respectant une contrainte.
+
+    La contrainte est supposée monotone en ce paramètre (une seule frontière
+    dans l'intervalle) ; sinon la frontière trouvée est la première rencontrée
+    depuis la borne favorable, qui doit la respecter. Chaque itération évalue en un appel vectorisé une
+    subdivision régulière de l'intervalle d'encadrement plus le point de la
+    sécante, puis conserve le plus petit intervalle où la marge change de
+    signe. Les flux de la projection, des amortissements et, lorsqu'il ne
+    varie pas, du crédit sont réutilisés d'une itération à l'autre.
+    """
+
+    def __init__(self, evaluateur: EvaluateurBien, points_par_iteration: int = POINTS_PAR_ITERATION) -> None:
+        self.evaluateur = evaluateur
+        self.points_par_iteration = points_par_iteration
+
+    def resoudre(
+        self,
+        variable: str,
+        contrainte: Contrainte,
+        borne_min: float,
+        borne_max: float,
+        cherche: str = "max",
+        tolerance: Optional[float] = None,
+        iterations_max: int = 20,
+    ) -> ResultatObjectif:
+        """Plus grande (``cherche="max"``) ou plus petite (``"min"``) valeur de ``variable`` respectant la contrainte.
+
+        ``tolerance`` est la largeur finale de l'encadrement (par défaut un
+        milliardième de l'intervalle initial) ; la valeur renvoyée est toujours
+        du côté où la contrainte est respectée. Lève :class:`ValueError` si la
+        contrainte est enfreinte à la borne de départ mais respectée plus loin.
+        """
+        if variable not in AXES:
+            raise ValueError(f"Variable inconnue : {variable}")
+        if cherche not in ("max", "min"):
+            raise ValueError("cherche doit valoir 'max' ou 'min'")
+        if borne_min > borne_max:
+            raise ValueError("borne_min doit être inférieure à borne_max")
+        tolerance = tolerance if tolerance is not None else (borne_max - borne_min) * 1e-9
+
+        # Parcours depuis la borne où la contrainte est attendue satisfaite
+        depart, arrivee = (borne_min, borne_max) if cherche == "max" else (borne_max, borne_min)
+        points = np.linspace(depart, arrivee, self.points_par_iteration + 1)
+        marges = self._marges(variable, contrainte, points)
+        evaluations = 1
+
+        respectees = marges >= 0
+        if not respectees.any():
+            return ResultatObjectif(variable, contrainte.description, None, None, 0, evaluations)
+        if respectees.all():
+            return ResultatObjectif(
+                variable, contrainte.description, float(arrivee), float(marges[-1]), 0, evaluations
+            )
+
+        encadrement = self._encadrement(points, marges)
+        if encadrement is None:
+            raise ValueError(
+                f"Contrainte « {contrainte.description} » non respectée en {variable} = {depart:g} mais "
+                f"respectée plus loin dans l'intervalle : elle n'est pas monotone en {variable}"
+            )
+
+        iterations = 0
+        a, marge_a, b, marge_b = encadrement
+        while abs(b - a) > tolerance and iterations < iterations_max:
+            # Subdivision régulière et point de la sécante, exprimés en fraction de [a, b]
+            fractions = np.linspace(0.0, 1.0, self.points_par_iteration + 2)[1:-1]
+            fractions = np.sort(np.append(fractions, marge_a / (marge_a - marge_b)))
+            points = np.concatenate(([a], a + (b - a) * fractions, [b]))
+            marges = np.concatenate(([marge_a], self._marges(variable, contrainte, points[1:-1]), [marge_b]))
+            evaluations += 1
+            iterations += 1
+            # a est respecté et b ne l'est pas : l'encadrement existe toujours
+            a, marge_a, b, marge_b = self._encadrement(points, marges)
+
+        return ResultatObjectif(variable, contrainte.description, float(a), float(marge_a), iterations, evaluations)
+
+    def _marges(self, variable: str, contrainte: Contrainte, points: np.ndarray) -> np.ndarray:
+        valeurs = {**self.evaluateur.parametres_defaut(), variable: points}
+        projection = self.evaluateur.projeter(**{variable: points})
+        return np.asarray(contrainte.marge(projection, self.evaluateur, valeurs), dtype=float)
+
+    @staticmethod
+    def _encadrement(points: np.ndarray, marges: np.ndarray) -> Optional[Tuple[float, float, float, float]]:
+        """Premier point non respecté dans l'ordre de parcours et point respecté qui le précède.
+
+        ``None`` si le premier point ne respecte pas la contrainte ou si aucun
+        point ne l'enfreint : il n'y a pas de frontière à encadrer.
+        """
+        echecs = np.flatnonzero(marges < 0)
+        if echecs.size == 0 or echecs[0] == 0:
+            return None
+        premier_echec = int(echecs[0])
+        return (
+            float(points[premier_echec - 1]),
+            float(marges[premier_echec - 1]),
+            float(points[premier_echec]),
+            float(marges[premier_echec]),
+        )
+
+
+@dataclass
+class ObjectifService:
+    """Questions usuelles de comité : prix maximal, loyer minimal, apport minimal."""
+
+    analysis_service: AnalysisService
+
+    def solveur(self, indice_bien: int = 0, duree_annees: int = 20) -> SolveurObjectif:
+        """Solveur réutilisable pour plusieurs recherches sur le même bien."""
+        return SolveurObjectif(EvaluateurBien(self.analysis_service, indice_bien, duree_annees))
+
+    def prix_achat_maximal(
+        self, contrainte: Contrainte, indice_bien: int = 0, duree_annees: int = 20, facteur_max: float = 3.0
+    ) -> ResultatObjectif:
+        """Prix d'achat le plus élevé respectant la contrainte (surcoût financé par le crédit)."""
+        bien = self.analysis_service.sci.biens[indice_bien]
+        return self.solveur(indice_bien, duree_annees).resoudre(
+            "prix_achat", contrainte, 0.0, bien.prix_achat * facteur_max, cherche="max"
+        )
+
+    def loyer_minimal(
+        self, contrainte: Contrainte, indice_bien: int = 0, duree_annees: int = 20, facteur_max: float = 5.0
+    ) -> ResultatObjectif:
+        """Loyers annuels les plus bas respectant la contrainte."""
+        bien = self.analysis_service.sci.biens[indice_bien]
+        resultat = self.solveur(indice_bien, duree_annees).resoudre(
+            "facteur_loyer", contrainte, 0.0, facteur_max, cherche="min"
+        )
+        if resultat.valeur is not None:
+            resultat.variable = "loyers_annuels"
+            resultat.valeur *= bien.revenus_annuels
+        return resultat
+
+    def apport_minimal(self, contrainte: Contrainte, indice_bien: int = 0, duree_annees: int = 20) -> ResultatObjectif:
+        """Apport de la SCI le plus faible respectant la contrainte (il réduit le crédit d'autant)."""
+        bien = self.analysis_service.sci.biens[indice_bien]
+        apport_max = bien.apport_sci + (bien.credit.capital_emprunte if bien.credit else 0.0)
+        return self.solveur(indice_bien, duree_annees).resoudre(
+            "apport_sci", contrainte, 0.0, apport_max, cherche="min"
+        )
+
+    @classmethod
+    def from_sci(cls, sci: SCI) -> "ObjectifService":
+        """Crée un service de recherche d'objectif directement depuis un modèle de SCI."""
+        return cls(AnalysisService(sci))
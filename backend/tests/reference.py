@@ -0,0 +1,294 @@
+"""Implémentations de référence, boucle par boucle, reprises du moteur d'origine.
+
+Elles reproduisent les formules du moteur avant sa vectorisation et ne
+s'appuient sur aucun cache ni agrégat des modèles : les tests comparent les
+moteurs actuels à ces résultats.
+"""
+from __future__ import annotations
+
+from typing import Dict, List
+
+import pandas as pd
+
+from backend.core.calculators.amortissement import AmortissementConfig
+
+
+def tableau_amortissement(
+    capital: float,
+    taux_annuel: float,
+    duree_annees: int,
+    differe_partiel_mois: int = 0,
+    differe_total_mois: int = 0,
+) -> pd.DataFrame:
+    """Tableau d'amortissement calculé mois par mois."""
+    if capital == 0:
+        return pd.DataFrame()
+
+    taux = taux_annuel / 12
+    duree_mois = duree_annees * 12
+    duree_effective = duree_mois - max(differe_partiel_mois, differe_total_mois)
+    if taux == 0:
+        mensualite = capital / duree_effective
+    else:
+        mensualite = capital * (taux / (1 - (1 + taux) ** -duree_effective))
+
+    capital_restant = capital
+    lignes: List[Dict[str, float]] = []
+    for mois in range(1, duree_mois + 1):
+        interets = capital_restant * taux
+        if mois <= differe_total_mois:
+            capital_restant += interets
+            lignes.append(
+                {
+                    "Mois": mois,
+                    "Capital restant début": capital_restant - interets,
+                    "Mensualité": 0,
+                    "Intérêts": interets,
+                    "Capital amorti": 0,
+                    "Capital restant fin": capital_restant,
+                }
+            )
+        elif mois <= differe_partiel_mois:
+            lignes.append(
+                {
+                    "Mois": mois,
+                    "Capital restant début": capital_restant,
+                    "Mensualité": interets,
+                    "Intérêts": interets,
+                    "Capital amorti": 0,
+                    "Capital restant fin": capital_restant,
+                }
+            )
+        else:
+            capital_amorti = mensualite - interets
+            capital_restant -= capital_amorti
+            if capital_restant < 0:
+                capital_amorti += capital_restant
+                capital_restant = 0
+            lignes.append(
+                {
+                    "Mois": mois,
+                    "Capital restant début": capital_restant + capital_amorti,
+                    "Mensualité": mensualite,
+                    "Intérêts": interets,
+                    "Capital amorti": capital_amorti,
+                    "Capital restant fin": capital_restant,
+                }
+            )
+    return pd.DataFrame(lignes)
+
+
+def tableau_credit(credit) -> pd.DataFrame:
+    """Tableau de référence d'un :class:`Credit`."""
+    return tableau_amortissement(
+        credit.capital_emprunte,
+        credit.taux_annuel,
+        credit.duree_annees,
+        credit.differe_partiel_mois,
+        credit.differe_total_mois,
+    )
+
+
+def agregats_annee(tableau: pd.DataFrame, annee_credit: int) -> Dict[str, float]:
+    """Intérêts, capital amorti et solde d'une année de crédit, sommés sur le tableau mensuel."""
+    if tableau.empty or annee_credit < 1:
+        return {"interets": 0.0, "capital_amorti": 0.0, "capital_restant_fin": 0.0}
+    lignes = tableau.iloc[(annee_credit - 1) * 12 : annee_credit * 12]
+    return {
+        "interets": float(lignes["Intérêts"].sum()),
+        "capital_amorti": float(lignes["Capital amorti"].sum()),
+        "capital_restant_fin": float(tableau["Capital restant fin"].iloc[min(annee_credit * 12, len(tableau)) - 1]),
+    }
+
+
+def calculer_is(resultat_avant_impot: float, seuil_taux_reduit: float = 42_500) -> float:
+    """IS à deux tranches (15 % puis 25 %)."""
+    if resultat_avant_impot <= 0:
+        return 0.0
+    if resultat_avant_impot <= seuil_taux_reduit:
+        return resultat_avant_impot * 0.15
+    return seuil_taux_reduit * 0.15 + (resultat_avant_impot - seuil_taux_reduit) * 0.25
+
+
+def impot_bareme(resultat_avant_impot: float, seuils, taux) -> float:
+    """IS d'un barème progressif quelconque, tranche par tranche."""
+    impot = 0.0
+    bornes = list(seuils[1:]) + [float("inf")]
+    for seuil, taux_tranche, borne in zip(seuils, taux, bornes):
+        if resultat_avant_impot > seuil:
+            impot += (min(resultat_avant_impot, borne) - seuil) * taux_tranche
+    return impot
+
+
+def bases_apres_report(resultats) -> List[float]:
+    """Bases imposables après imputation des déficits antérieurs, exercice par exercice."""
+    deficit = 0.0
+    bases = []
+    for resultat in resultats:
+        if resultat < 0:
+            deficit -= resultat
+            bases.append(0.0)
+        else:
+            imputation = min(deficit, resultat)
+            deficit -= imputation
+            bases.append(resultat - imputation)
+    return bases
+
+
+def amortissements_annee(bien, annee: int, config: AmortissementConfig | None = None) -> Dict[str, float]:
+    """Dotations d'un bien pour une année, composante par composante."""
+    config = config or AmortissementConfig()
+    annees = annee - bien.annee_achat + 1
+
+    def dotation(base: float, duree: int, condition: bool = True) -> float:
+        return base / duree if condition and 1 <= annees <= duree else 0.0
+
+    return {
+        "murs": dotation(bien.prix_achat - bien.travaux, config.MURS),
+        "travaux": dotation(bien.travaux, config.TRAVAUX, bien.travaux > 0),
+        "meubles": dotation(bien.meubles, config.MEUBLES, bien.meubles > 0),
+        "frais_notaire": dotation(bien.frais_notaire, config.FRAIS_NOTAIRE),
+        "frais_agence": dotation(bien.frais_agence, config.FRAIS_AGENCE),
+    }
+
+
+def _revenus_bien(bien) -> float:
+    return sum(appartement.loyer_mensuel * 12 for appartement in bien.appartements)
+
+
+def _charges_bien(bien) -> float:
+    assurance_emprunt = bien.credit.capital_emprunte * bien.assurance_emprunt_taux if bien.credit else 0.0
+    return (
+        bien.prix_achat * bien.assurance_pno_taux
+        + assurance_emprunt
+        + bien.taxe_fonciere
+        + bien.charges_copro
+        + bien.autres_charges
+    )
+
+
+def _mensualite(credit) -> float:
+    if credit.capital_emprunte == 0:
+        return 0.0
+    taux = credit.taux_annuel / 12
+    duree_effective = credit.duree_annees * 12 - max(credit.differe_partiel_mois, credit.differe_total_mois)
+    if taux == 0:
+        return credit.capital_emprunte / duree_effective
+    return credit.capital_emprunte * (taux / (1 - (1 + taux) ** -duree_effective))
+
+
+def resultat_annee(sci, annee: int) -> Dict[str, float]:
+    """Compte de résultat d'une année, bien par bien."""
+    detenus = [bien for bien in sci.biens if annee >= bien.annee_achat]
+    revenus = sum(_revenus_bien(bien) for bien in detenus)
+    charges = (
+        sci.frais_comptable_annuel
+        + sci.frais_bancaire_annuel
+        + sum(_charges_bien(bien) for bien in detenus)
+        + revenus * sci.crl_taux
+    )
+    interets = 0.0
+    for bien in detenus:
+        if bien.credit:
+            tableau = tableau_credit(bien.credit)
+            interets += agregats_annee(tableau, annee - bien.annee_achat + 1)["interets"]
+    amortissements = sum(sum(amortissements_annee(bien, annee).values()) for bien in detenus)
+    frais_exceptionnels = sum(
+        bien.credit.frais_dossier + bien.credit.frais_garantie
+        for bien in sci.biens
+        if annee == bien.annee_achat and bien.credit
+    )
+
+    resultat_exploitation = revenus - charges - amortissements - frais_exceptionnels
+    resultat_avant_impot = resultat_exploitation - interets
+    impot_societes = calculer_is(resultat_avant_impot)
+    return {
+        "annee": annee,
+        "revenus_locatifs": revenus,
+        "charges_exploitation": charges,
+        "frais_exceptionnels": frais_exceptionnels,
+        "amortissements": amortissements,
+        "resultat_exploitation": resultat_exploitation,
+        "interets_credits": interets,
+        "resultat_avant_impot": resultat_avant_impot,
+        "impot_societes": impot_societes,
+        "resultat_net": resultat_avant_impot - impot_societes,
+    }
+
+
+def tresorerie_annee(sci, annee: int, reserves_precedentes: float = 0.0) -> Dict[str, float]:
+    """Trésorerie d'une année à partir de son compte de résultat."""
+    resultat = resultat_annee(sci, annee)
+    mensualites = sum(
+        _mensualite(bien.credit) * 12 for bien in sci.biens if bien.credit and annee >= bien.annee_achat
+    )
+    decaissements = (
+        resultat["charges_exploitation"] + resultat["frais_exceptionnels"] + resultat["impot_societes"] + mensualites
+    )
+    sorties_apport = sum(bien.apport_sci for bien in sci.biens if bien.annee_achat == annee)
+    apport_initial = 0.0
+    if annee == sci.annee_creation:
+        apport_initial = (
+            sci.capital_social
+            + sum(apport["montant"] for apport in sci.apports_cca if apport["annee"] == annee)
+            + sorties_apport
+        )
+
+    cashflow = resultat["revenus_locatifs"] - decaissements
+    return {
+        "annee": annee,
+        "encaissements": resultat["revenus_locatifs"],
+        "decaissements": decaissements,
+        "mensualites_credit": mensualites,
+        "cashflow": cashflow,
+        "apport_initial": apport_initial,
+        "tresorerie_realisee": cashflow + apport_initial - sorties_apport,
+        "reserves_debut": reserves_precedentes,
+        "resultat_net": resultat["resultat_net"],
+        "reserves_fin": reserves_precedentes + resultat["resultat_net"],
+    }
+
+
+def projection(sci, duree_annees: int = 20) -> pd.DataFrame:
+    """Projection complète, année après année, avec report des réserves."""
+    lignes = []
+    reserves = 0.0
+    for i in range(duree_annees):
+        annee = sci.annee_creation + i
+        tresorerie = tresorerie_annee(sci, annee, reserves)
+        lignes.append({**resultat_annee(sci, annee), **tresorerie})
+        reserves = tresorerie["reserves_fin"]
+    return pd.DataFrame(lignes)
+
+
+def van(flux, taux: float) -> float:
+    """Valeur actuelle nette, le premier flux à t = 0."""
+    return sum(montant / (1 + taux) ** t for t, montant in enumerate(flux))
+
+
+def tri(flux, bas: float = -0.99, haut: float = 10.0, iterations: int = 200) -> float:
+    """Taux de rendement interne par dichotomie ; ``NaN`` sans changement de signe de la VAN."""
+    van_bas = van(flux, bas)
+    if van_bas * van(flux, haut) > 0:
+        return float("nan")
+    for _ in range(iterations):
+        milieu = (bas + haut) / 2
+        valeur = van(flux, milieu)
+        if (valeur > 0) == (van_bas > 0):
+            bas, van_bas = milieu, valeur
+        else:
+            haut = milieu
+    return (bas + haut) / 2
+
+
+def apports_associes(sci, duree_annees: int) -> List[float]:
+    """Capital à la création, apports CCA et apports de la SCI aux acquisitions, par année."""
+    apports = []
+    for i in range(duree_annees):
+        annee = sci.annee_creation + i
+        montant = sum(apport["montant"] for apport in sci.apports_cca if apport["annee"] == annee)
+        montant += sum(bien.apport_sci for bien in sci.biens if bien.annee_achat == annee)
+        if i == 0:
+            montant += sci.capital_social
+        apports.append(montant)
+    return apports
@@ -0,0 +1,48 @@
+"""Matrice des dotations aux amortissements (bien × année × composante)."""
+import numpy as np
+import pytest
+
+from backend.core.calculators.amortissement import COMPOSANTES, AmortissementCalculator, AmortissementConfig
+from backend.core.models.bien import Bien
+from backend.tests import reference
+
+
+@pytest.fixture
+def biens():
+    return [
+        Bien(1, "Complet", 2025, 250_000, 9000, 18_000, travaux=30_000, meubles=7000),
+        Bien(2, "Sans travaux", 2031, 120_000, 0, 9000),
+        Bien(3, "Meublé ancien", 2010, 90_000, 4000, 7000, meubles=3000),
+    ]
+
+
+def test_dotations_identiques_au_calcul_par_annee(biens):
+    annees = np.arange(2005, 2075)
+    matrice = AmortissementCalculator().calculer_matrice(biens, annees)
+    assert matrice.dotations.shape == (len(biens), len(annees), len(COMPOSANTES))
+
+    for i, bien in enumerate(biens):
+        for j, annee in enumerate(annees):
+            attendu = reference.amortissements_annee(bien, int(annee))
+            np.testing.assert_allclose(matrice.dotations[i, j], [attendu[c] for c in COMPOSANTES], atol=1e-9)
+    np.testing.assert_allclose(matrice.dotations_annuelles, matrice.dotations.sum(axis=(0, 2)))
+
+
+def test_cumuls_et_valeurs_nettes(biens):
+    matrice = AmortissementCalculator().calculer_matrice(biens, np.arange(2005, 2075))
+    np.testing.assert_allclose(matrice.cumuls, np.cumsum(matrice.dotations, axis=1), atol=1e-6)
+    np.testing.assert_allclose(matrice.valeurs_nettes, matrice.bases[:, np.newaxis, :] - matrice.cumuls, atol=1e-6)
+    # Totalement amortis à la fin de la période
+    np.testing.assert_allclose(matrice.valeurs_nettes[:, -1], 0.0, atol=1e-6)
+
+
+def test_durees_configurees(biens):
+    config = AmortissementConfig(MURS=20, TRAVAUX=10, MEUBLES=5, FRAIS_NOTAIRE=1, FRAIS_AGENCE=3)
+    calculateur = AmortissementCalculator(config)
+    for bien in biens:
+        annees = calculateur.calculer_annees(bien, np.arange(bien.annee_achat - 1, bien.annee_achat + 25))
+        for j, annee in enumerate(range(bien.annee_achat - 1, bien.annee_achat + 25)):
+            attendu = reference.amortissements_annee(bien, annee, config)
+            for composante in COMPOSANTES:
+                assert annees[composante][j] == pytest.approx(attendu[composante]), (annee, composante)
+            assert calculateur.calculer_annee(bien, annee) == pytest.approx(attendu)
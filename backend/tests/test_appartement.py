@@ -0,0 +1,135 @@
+"""Lots d'un bien stockés par colonnes."""
+import copy
+import math
+import pickle
+
+import numpy as np
+import pytest
+
+from backend.core.models.appartement import AppartementLocation, LotsLocation
+
+
+def verifier_totaux(lots: LotsLocation) -> None:
+    """Totaux et colonnes égaux à ceux recalculés lot par lot."""
+    assert lots.loyer_mensuel_total == pytest.approx(sum(lot.loyer_mensuel for lot in lots))
+    assert lots.loyer_annuel_total == pytest.approx(sum(lot.loyer_annuel for lot in lots))
+    assert lots.surface_totale == pytest.approx(sum(lot.surface or 0.0 for lot in lots))
+    colonnes = lots.colonnes()
+    np.testing.assert_array_equal(colonnes["numero"], [lot.numero for lot in lots])
+    np.testing.assert_array_equal(colonnes["loyer_mensuel"], [lot.loyer_mensuel for lot in lots])
+    np.testing.assert_array_equal(
+        colonnes["surface"], [np.nan if lot.surface is None else lot.surface for lot in lots]
+    )
+    assert all(lot._lots is lots for lot in lots)
+    assert [lot._position for lot in lots] == list(range(len(lots)))
+
+
+@pytest.fixture
+def lots():
+    return LotsLocation([AppartementLocation(i, 400 + 50 * i, surface=30.0 + i if i % 2 else None) for i in range(5)])
+
+
+def test_mutations_de_liste(lots):
+    verifier_totaux(lots)
+    lots.append(AppartementLocation(10, 700, 55))
+    lots.insert(0, AppartementLocation(11, 300))
+    lots.insert(-1, AppartementLocation(12, 350, 20))
+    verifier_totaux(lots)
+
+    retire = lots.pop(2)
+    assert retire._lots is None
+    del lots[1:3]
+    verifier_totaux(lots)
+
+    lots[0] = AppartementLocation(13, 999, 99)
+    lots[1:3] = [AppartementLocation(14, 100), AppartementLocation(15, 200, 10)]
+    verifier_totaux(lots)
+
+    lots.reverse()
+    verifier_totaux(lots)
+    lots.sort(key=lambda lot: lot.loyer_mensuel)
+    assert [lot.loyer_mensuel for lot in lots] == sorted(lot.loyer_mensuel for lot in lots)
+    verifier_totaux(lots)
+
+    lots.clear()
+    assert len(lots) == 0
+    assert lots.loyer_mensuel_total == 0.0
+
+
+def test_modification_d_un_lot(lots):
+    version = lots.version
+    lots[2].loyer_mensuel = 1234
+    lots[1].surface = None
+    lots[0].surface = 12.5
+    lots[3].numero = 42
+    assert lots.version != version
+    verifier_totaux(lots)
+
+
+def test_reordonnancement_et_selection_de_ses_propres_lots(lots):
+    originaux = list(lots)
+    lots[:] = originaux[::-1]
+    verifier_totaux(lots)
+    lots[:] = [originaux[0], originaux[2]]
+    verifier_totaux(lots)
+    assert originaux[1]._lots is None
+    assert all(lot._lots is lots for lot in (originaux[0], originaux[2]))
+
+
+def test_appartenance_unique(lots):
+    autre = LotsLocation()
+    with pytest.raises(ValueError):
+        autre.append(lots[0])
+    with pytest.raises(ValueError):
+        lots.append(lots[0])
+    with pytest.raises(ValueError):
+        lots[0] = lots[1]
+    nouveau = AppartementLocation(20, 500)
+    with pytest.raises(ValueError):
+        lots[0:2] = [nouveau, nouveau]
+    # Aucune des tentatives refusées n'a modifié les lots
+    assert len(lots) == 5 and len(autre) == 0
+    verifier_totaux(lots)
+
+    retire = lots.pop()
+    autre.append(retire)
+    verifier_totaux(lots)
+    verifier_totaux(autre)
+
+
+def test_copies(lots):
+    for copie in (copy.deepcopy(lots), pickle.loads(pickle.dumps(lots))):
+        assert copie == lots
+        assert copie.version != lots.version
+        verifier_totaux(copie)
+        copie[0].loyer_mensuel = 1
+        verifier_totaux(copie)
+        assert lots[0].loyer_mensuel != 1
+
+
+
+def test_totaux_sans_derive(lots):
+    # Une somme courante de ces écarts s'éloignerait du total exact
+    for _ in range(1000):
+        for lot, loyer in zip(lots, (0.1, 1e16, 0.3, -1e16, 0.7)):
+            lot.loyer_mensuel = loyer
+        lots[1].loyer_mensuel = 1e-3
+        lots[3].loyer_mensuel = 1e-3
+    assert lots.loyer_mensuel_total == math.fsum(lot.loyer_mensuel for lot in lots)
+    lots[4].surface = 0.1
+    assert lots.surface_totale == math.fsum(lot.surface for lot in lots if lot.surface is not None)
+
+
+def test_modification_d_un_lot_sans_parcours(lots, monkeypatch):
+    for numero in range(5, 2000):
+        lots.append(AppartementLocation(numero, 500))
+    lot = lots[1500]
+
+    class SansParcours(list):
+        def __iter__(self):
+            pytest.fail("lots parcourus")
+
+    # Retrouver le rang d'un lot ne parcourt pas les lots
+    monkeypatch.setattr(lots, "_appartements", SansParcours(lots._appartements))
+    lot.loyer_mensuel = 800
+    assert lots.colonnes()["loyer_mensuel"][1500] == 800
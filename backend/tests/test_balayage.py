@@ -0,0 +1,123 @@
+"""Balayages de sensibilité sur un bien d'une SCI."""
+import copy
+import itertools
+
+import numpy as np
+import pytest
+
+from backend.core.models.appartement import AppartementLocation
+from backend.core.models.bien import Bien
+from backend.core.models.credit import Credit
+from backend.core.models.sci import SCI
+from backend.services.analysis_service import AnalysisService
+from backend.services.balayage_service import BalayageService, EvaluateurBien
+from backend.tests import reference
+
+
+@pytest.fixture
+def sci():
+    """Bien étudié acheté après la création, à côté d'un bien déjà détenu."""
+    sci = SCI("SCI balayage", 2025, 1000, 2)
+    sci.ajouter_apport_cca(2025, "A", 5000)
+    sci.ajouter_bien(
+        Bien(
+            1,
+            "Étudié",
+            2027,
+            230_000,
+            8000,
+            16_000,
+            travaux=20_000,
+            meubles=5000,
+            apport_sci=10_000,
+            credit=Credit(200_000, 0.035, 20, differe_partiel_mois=6, frais_dossier=1000),
+            appartements=[AppartementLocation(1, 640), AppartementLocation(2, 590)],
+            taxe_fonciere=1300,
+        )
+    )
+    sci.ajouter_bien(
+        Bien(
+            2,
+            "Existant",
+            2025,
+            150_000,
+            5000,
+            11_000,
+            credit=Credit(140_000, 0.028, 15, frais_garantie=1200),
+            appartements=[AppartementLocation(1, 820)],
+        )
+    )
+    return sci
+
+
+def variante(sci, prix_achat=None, taux_annuel=None, duree_annees=None, facteur_loyer=1.0, apport_sci=None):
+    """Copie de la SCI dont le premier bien porte les paramètres donnés.
+
+    Comme dans le balayage, une hausse du prix est financée par le crédit et
+    une hausse de l'apport le réduit d'autant.
+    """
+    sci = copy.deepcopy(sci)
+    bien = sci.biens[0]
+    if prix_achat is not None:
+        bien.credit.capital_emprunte += prix_achat - bien.prix_achat
+        bien.prix_achat = prix_achat
+    if apport_sci is not None:
+        bien.credit.capital_emprunte -= apport_sci - bien.apport_sci
+        bien.apport_sci = apport_sci
+    if taux_annuel is not None:
+        bien.credit.taux_annuel = taux_annuel
+    if duree_annees is not None:
+        bien.credit.duree_annees = duree_annees
+    for appartement in bien.appartements:
+        appartement.loyer_mensuel *= facteur_loyer
+    return sci
+
+
+def indicateurs_reference(sci, duree_annees=20):
+    projection = reference.projection(sci, duree_annees)
+    tresorerie = np.cumsum(projection["tresorerie_realisee"])
+    return {
+        "cashflow_premiere_annee": projection["cashflow"].iloc[0],
+        "cashflow_minimal": projection["cashflow"].min(),
+        "cashflow_cumule": projection["cashflow"].sum(),
+        "tresorerie_minimale": tresorerie.min(),
+        "tresorerie_finale": tresorerie.iloc[-1],
+        "resultat_net_cumule": projection["resultat_net"].sum(),
+        "impot_total": projection["impot_societes"].sum(),
+    }
+
+
+def test_projection_par_defaut_identique(sci):
+    evaluateur = EvaluateurBien(AnalysisService(sci), duree_annees=20)
+    projection = evaluateur.projeter()
+    attendu = reference.projection(sci, 20)
+    for colonne in ("cashflow", "impot_societes", "reserves_fin", "tresorerie_realisee"):
+        np.testing.assert_allclose(projection.colonnes[colonne], attendu[colonne], rtol=1e-9, atol=1e-6)
+
+
+def test_grille_identique_aux_projections_des_variantes(sci):
+    axes = {
+        "prix_achat": [sci.biens[0].prix_achat, sci.biens[0].prix_achat + 30_000],
+        "taux_annuel": [0.02, 0.045],
+        "duree_annees": [15, 25],
+        "facteur_loyer": [0.8, 1.1],
+        "apport_sci": [0, 20_000],
+    }
+    resultat = BalayageService.from_sci(sci).balayer(axes, taille_bloc=7)
+    assert resultat.indicateurs["cashflow_minimal"].shape == (2, 2, 2, 2, 2)
+    assert len(resultat.to_frame()) == 32
+
+    for indices in itertools.product(range(2), repeat=5):
+        valeurs = {nom: valeurs[i] for (nom, valeurs), i in zip(axes.items(), indices)}
+        attendu = indicateurs_reference(variante(sci, **valeurs))
+        for nom, valeur in attendu.items():
+            assert resultat.indicateurs[nom][indices] == pytest.approx(valeur, rel=1e-9, abs=1e-5), (valeurs, nom)
+
+
+def test_parametres_invalides(sci):
+    evaluateur = EvaluateurBien(AnalysisService(sci))
+    with pytest.raises(ValueError):
+        evaluateur.projeter(surface=[1, 2])
+    sci.biens[0].credit = None
+    with pytest.raises(ValueError):
+        EvaluateurBien(AnalysisService(sci)).projeter(taux_annuel=[0.02])
@@ -0,0 +1,61 @@
+"""Agrégats d'un bien mémorisés et invalidés par version."""
+import copy
+
+import pytest
+
+from backend.core.models.appartement import AppartementLocation
+from backend.core.models.bien import Bien
+from backend.core.models.credit import Credit
+
+
+def test_agregats_suivent_les_modifications():
+    credit = Credit(150_000, 0.03, 20, frais_dossier=800, frais_garantie=1200)
+    bien = Bien(1, "Bien", 2025, 200_000, 10_000, 15_000, travaux=5000, meubles=2000, apport_sci=20_000, credit=credit)
+
+    def verifier():
+        prix_total = bien.prix_achat + bien.frais_agence + bien.frais_notaire + bien.travaux + bien.meubles
+        frais_credit = bien.credit.frais_dossier + bien.credit.frais_garantie if bien.credit else 0.0
+        assurance_emprunt = bien.credit.capital_emprunte * bien.assurance_emprunt_taux if bien.credit else 0.0
+        assert bien.prix_total == pytest.approx(prix_total)
+        assert bien.besoin_financement == pytest.approx(prix_total + frais_credit - bien.apport_sci)
+        assert bien.charges_annuelles == pytest.approx(
+            bien.prix_achat * bien.assurance_pno_taux
+            + assurance_emprunt
+            + bien.taxe_fonciere
+            + bien.charges_copro
+            + bien.autres_charges
+        )
+        assert bien.revenus_annuels == pytest.approx(sum(lot.loyer_mensuel * 12 for lot in bien.appartements))
+
+    verifier()
+    bien.appartements = [AppartementLocation(1, 600), AppartementLocation(2, 650)]
+    verifier()
+    bien.appartements[0].loyer_mensuel = 700
+    bien.prix_achat = 210_000
+    bien.taxe_fonciere = 1300
+    verifier()
+    credit.capital_emprunte = 160_000
+    credit.frais_dossier = 500
+    verifier()
+    bien.credit = None
+    verifier()
+
+    versions = {bien.version}
+    bien.appartements.append(AppartementLocation(3, 400))
+    versions.add(bien.version)
+    bien.autres_charges = 100
+    versions.add(bien.version)
+    assert len(versions) == 3
+
+
+def test_copie_independante():
+    credit = Credit(90_000, 0.03, 15)
+    bien = Bien(1, "Bien", 2025, 100_000, 0, 8000, credit=credit, appartements=[AppartementLocation(1, 500)])
+    copie = copy.deepcopy(bien)
+    assert copie.version != bien.version
+    copie.appartements[0].loyer_mensuel = 800
+    copie.credit.capital_emprunte = 50_000
+    assert bien.revenus_annuels == 6000
+    charges = 100_000 * bien.assurance_pno_taux + 90_000 * bien.assurance_emprunt_taux
+    assert bien.charges_annuelles == pytest.approx(charges)
+    assert copie.revenus_annuels == 9600
@@ -0,0 +1,122 @@
+"""Échéancier en forme fermée, mémorisation et agrégats annuels de :class:`Credit`."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.core.models.credit import COLONNES_TABLEAU, Credit, agreger_par_annee
+from backend.tests import reference
+
+CREDITS = [
+    (150_000, 0.035, 20, 0, 0),
+    (200_000, 0.0, 15, 0, 0),
+    (123_456.7, 0.05, 25, 24, 0),
+    (80_000, 0.031, 10, 0, 12),
+    (100_000, 0.045, 20, 12, 6),
+    (100_000, 0.045, 20, 6, 12),
+    (50_000, 0.01, 1, 0, 0),
+    (1000, 0.12, 30, 6, 12),
+]
+
+
+@pytest.mark.parametrize("parametres", CREDITS)
+def test_tableau_identique_a_la_boucle_mensuelle(parametres):
+    attendu = reference.tableau_amortissement(*parametres)
+    tableau = Credit(*parametres).generer_tableau_amortissement()
+
+    assert list(tableau.columns) == list(COLONNES_TABLEAU)
+    assert len(tableau) == len(attendu)
+    np.testing.assert_array_equal(tableau["Mois"], attendu["Mois"])
+    for colonne in COLONNES_TABLEAU[1:]:
+        np.testing.assert_allclose(tableau[colonne], attendu[colonne], rtol=1e-9, atol=1e-6, err_msg=colonne)
+
+
+@pytest.mark.parametrize("parametres", CREDITS)
+def test_total_interets(parametres):
+    attendu = reference.tableau_amortissement(*parametres)["Intérêts"].sum()
+    assert Credit(*parametres).calculer_total_interets() == pytest.approx(attendu, rel=1e-9)
+
+
+def test_credit_sans_capital():
+    credit = Credit(0, 0.03, 20)
+    assert credit.generer_tableau_amortissement().empty
+    assert credit.calculer_total_interets() == 0
+
+
+def test_echeancier_memorise_puis_invalide():
+    credit = Credit(150_000, 0.035, 20)
+    echeancier = credit.echeancier
+    assert credit.echeancier is echeancier
+    assert credit.tableau_amortissement is credit.tableau_amortissement
+    with pytest.raises(ValueError):
+        echeancier["Intérêts"][0] = 0.0
+
+    version = credit.version
+    credit.taux_annuel = 0.05
+    assert credit.version != version
+    assert credit.echeancier is not echeancier
+    attendu = reference.tableau_amortissement(150_000, 0.05, 20)
+    np.testing.assert_allclose(credit.tableau_amortissement["Intérêts"], attendu["Intérêts"], rtol=1e-9)
+
+
+@pytest.mark.parametrize(
+    "attribut, valeur", [("capital_emprunte", 90_000), ("duree_annees", 12), ("differe_total_mois", 6)]
+)
+def test_chaque_parametre_invalide_l_echeancier(attribut, valeur):
+    credit = Credit(100_000, 0.03, 15)
+    echeancier = credit.echeancier
+    setattr(credit, attribut, valeur)
+    assert credit.echeancier is not echeancier
+    attendu = reference.tableau_credit(credit)
+    np.testing.assert_allclose(
+        credit.tableau_amortissement["Capital restant fin"], attendu["Capital restant fin"], atol=1e-6
+    )
+
+
+def test_tableau_partage_est_un_dataframe():
+    tableau = Credit(150_000, 0.035, 20).tableau_amortissement
+    assert isinstance(tableau, pd.DataFrame)
+    assert len(tableau) == 240
+
+
+@pytest.mark.parametrize("parametres", CREDITS)
+def test_agregats_annuels_egaux_aux_sommes_mensuelles(parametres):
+    credit = Credit(*parametres)
+    tableau = reference.tableau_amortissement(*parametres)
+    annees = np.arange(0, credit.duree_annees + 4)
+    agregats = credit.agreger_annees(annees)
+
+    for i, annee in enumerate(annees):
+        attendu = reference.agregats_annee(tableau, int(annee))
+        if annee > credit.duree_annees:
+            # Au-delà du terme : ni intérêts ni amortissement, le solde final est conservé
+            attendu = {**reference.agregats_annee(tableau, credit.duree_annees), "interets": 0.0, "capital_amorti": 0.0}
+        for cle, valeur in attendu.items():
+            assert agregats[cle][i] == pytest.approx(valeur, rel=1e-9, abs=1e-6), (annee, cle)
+
+    annee = min(3, credit.duree_annees)
+    assert credit.interets_annee(annee) == pytest.approx(agregats["interets"][annee])
+    assert credit.capital_amorti_annee(annee) == pytest.approx(agregats["capital_amorti"][annee])
+    assert credit.capital_restant_fin_annee(annee) == pytest.approx(agregats["capital_restant_fin"][annee])
+
+
+def test_agregats_credit_sans_capital():
+    credit = Credit(0, 0.03, 20)
+    assert credit.capital_restant_fin_annee(3) == 0
+    assert credit.interets_annee(3) == 0
+
+
+def test_agreger_par_annee_diffuse_plusieurs_credits():
+    capitaux = np.array([150_000.0, 80_000.0])
+    taux = np.array([0.035, 0.0]) / 12
+    durees = np.array([20, 10])
+    credits = [Credit(150_000, 0.035, 20), Credit(80_000, 0.0, 10)]
+    mensualites = np.array([credit.calculer_mensualite() for credit in credits])
+
+    annees = np.arange(1, 21)
+    agregats = agreger_par_annee(
+        capitaux[:, np.newaxis], taux[:, np.newaxis], mensualites[:, np.newaxis], durees[:, np.newaxis] * 12, annees
+    )
+    for ligne, credit in enumerate(credits):
+        attendus = credit.agreger_annees(annees)
+        for cle in ("interets", "capital_amorti", "capital_restant_fin"):
+            np.testing.assert_allclose(agregats[cle][ligne], attendus[cle], rtol=1e-12)
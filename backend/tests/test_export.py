@@ -0,0 +1,130 @@
+"""Classeurs Excel construits en mémoire par ExporteurSCI et ExportService."""
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from backend.core.calculators.projection import COLONNES_PROJECTION
+from backend.core.models.appartement import AppartementLocation
+from backend.core.models.bien import Bien
+from backend.core.models.credit import Credit
+from backend.core.models.sci import SCI
+from backend.exporteur_sci import COLONNES_CREDIT, ONGLET_CREDITS_ANNUELS, ONGLETS_PROJECTION, ExporteurSCI
+from backend.services.export_service import ExportService
+from backend.tests import reference
+
+
+@pytest.fixture
+def sci():
+    """Deux crédits dont un avec différé total, et un bien acheté comptant."""
+    sci = SCI("SCI export", 2025, 1000, 2)
+    sci.ajouter_apport_cca(2025, "A", 12_000)
+    biens = [
+        (1, "Immeuble centre-ville", 2025, 280_000, Credit(260_000, 0.037, 20, frais_dossier=900)),
+        (2, "Maison", 2027, 190_000, Credit(150_000, 0.029, 15, differe_total_mois=6, differe_partiel_mois=12)),
+        (3, "Studio", 2026, 65_000, None),
+    ]
+    for numero, nom, annee, prix, credit in biens:
+        sci.ajouter_bien(
+            Bien(
+                numero,
+                nom,
+                annee,
+                prix,
+                5000,
+                prix * 0.075,
+                apport_sci=prix * 0.1 if credit else prix * 1.08,
+                credit=credit,
+                appartements=[AppartementLocation(lot, 400 + 90 * lot) for lot in range(1, 4)],
+                taxe_fonciere=1200,
+            )
+        )
+    return sci
+
+
+def valeurs(flux):
+    """Valeurs de chaque onglet, une liste de lignes sans les lignes vides."""
+    classeur = load_workbook(flux)
+    return {
+        onglet.title: [list(ligne) for ligne in onglet.iter_rows(values_only=True) if any(v is not None for v in ligne)]
+        for onglet in classeur.worksheets
+    }
+
+
+def tableau(lignes, entetes):
+    """Lignes d'un onglet situées sous la ligne d'en-têtes ``entetes``."""
+    debut = next(i for i, ligne in enumerate(lignes) if ligne[: len(entetes)] == list(entetes))
+    return pd.DataFrame([ligne[: len(entetes)] for ligne in lignes[debut + 1 :]], columns=list(entetes))
+
+
+def test_modes_standard_et_ecriture_seule_identiques(sci):
+    standard = valeurs(ExporteurSCI(sci).generer_excel_flux(15))
+    ecriture_seule = valeurs(ExporteurSCI(sci, ecriture_seule=True).generer_excel_flux(15))
+    assert list(standard) == list(ecriture_seule)
+    for onglet in standard:
+        assert standard[onglet] == ecriture_seule[onglet], onglet
+
+
+@pytest.mark.parametrize("ecriture_seule", [False, True])
+def test_onglets_de_projection_identiques_a_la_boucle(sci, ecriture_seule):
+    flux = ExporteurSCI(sci, ecriture_seule=ecriture_seule).generer_excel_flux(15)
+    assert flux.tell() == 0
+    onglets = valeurs(flux)
+    attendu = reference.projection(sci, 15)
+    for titre, colonnes, _ in ONGLETS_PROJECTION:
+        obtenu = tableau(onglets[titre], [entete for _, entete in colonnes])
+        for nom, entete in colonnes:
+            np.testing.assert_allclose(obtenu[entete].astype(float), attendu[nom], rtol=1e-9, atol=1e-6)
+
+
+@pytest.mark.parametrize("ecriture_seule", [False, True])
+def test_onglets_credit_mensuels(sci, ecriture_seule):
+    onglets = valeurs(ExporteurSCI(sci, ecriture_seule=ecriture_seule).generer_excel_flux(10))
+    assert "💳 Crédit Studio" not in onglets
+    for bien in sci.biens[:2]:
+        obtenu = tableau(onglets[f"💳 Crédit {bien.nom[:15]}"], COLONNES_CREDIT)
+        attendu = reference.tableau_credit(bien.credit)
+        assert len(obtenu) == len(attendu)
+        np.testing.assert_array_equal(obtenu["Année"], (attendu["Mois"] - 1) // 12 + 1)
+        for colonne in COLONNES_CREDIT[2:]:
+            np.testing.assert_allclose(obtenu[colonne].astype(float), attendu[colonne], rtol=1e-9, atol=1e-6)
+
+
+
+@pytest.mark.parametrize("ecriture_seule", [False, True])
+def test_onglet_credits_annuels_et_detail_a_la_demande(sci, ecriture_seule):
+    exporteur = ExporteurSCI(sci, ecriture_seule=ecriture_seule, credits_annuels=True, detail_mensuel=[2])
+    onglets = valeurs(exporteur.generer_excel_flux(10))
+    assert [titre for titre in onglets if titre.startswith("💳 Crédit ")] == ["💳 Crédit Maison"]
+
+    credits = pd.DataFrame(onglets[ONGLET_CREDITS_ANNUELS][1:], columns=onglets[ONGLET_CREDITS_ANNUELS][0])
+    assert len(credits) == 20 + 15
+    for bien in sci.biens[:2]:
+        lignes = credits[credits["N°"] == bien.numero]
+        assert list(lignes["Année crédit"]) == list(range(1, bien.credit.duree_annees + 1))
+        table = reference.tableau_credit(bien.credit)
+        for _, ligne in lignes.iterrows():
+            attendu = reference.agregats_annee(table, ligne["Année crédit"])
+            assert ligne["Année"] == bien.annee_achat + ligne["Année crédit"] - 1
+            assert ligne["Intérêts"] == pytest.approx(attendu["interets"], rel=1e-9, abs=1e-6)
+            assert ligne["Capital amorti"] == pytest.approx(attendu["capital_amorti"], rel=1e-9, abs=1e-6)
+            assert ligne["Capital restant fin"] == pytest.approx(attendu["capital_restant_fin"], rel=1e-9, abs=1e-6)
+
+
+def test_export_service_en_memoire(sci, tmp_path):
+    flux = ExportService.from_sci(sci).export_excel_flux(12)
+    assert flux.tell() == 0
+    feuilles = pd.read_excel(flux, sheet_name=None)
+    assert list(feuilles)[:4] == ["Projection", "Compte de résultat", "Trésorerie", "Biens"]
+    attendu = reference.projection(sci, 12)[list(COLONNES_PROJECTION)]
+    np.testing.assert_allclose(feuilles["Projection"].to_numpy(dtype=float), attendu.to_numpy(dtype=float), atol=1e-6)
+
+    assert "Crédits" not in feuilles
+    annuels = ExportService.from_sci(sci).export_excel_flux(12, credits_annuels=True, detail_mensuel=[1, 3])
+    annuels = pd.read_excel(annuels, sheet_name=None)
+    assert [nom for nom in annuels if nom.startswith("Crédit")] == ["Crédits", "Crédit bien 1"]
+
+    chemin = ExportService.from_sci(sci).export_excel(tmp_path / "exports", duree_annees=12)
+    assert chemin.exists()
+    assert list(tmp_path.joinpath("exports").iterdir()) == [chemin]
+    assert pd.read_excel(chemin, sheet_name=None).keys() == feuilles.keys()
@@ -0,0 +1,115 @@
+"""Barèmes d'IS par exercice et report des déficits."""
+import numpy as np
+import pytest
+
+from backend.core.calculators.fiscal import BAREMES_IS_HISTORIQUES, BaremeIS, FiscalCalculator
+from backend.core.calculators.projection import COLONNES_PROJECTION
+from backend.core.models.appartement import AppartementLocation
+from backend.core.models.bien import Bien
+from backend.core.models.sci import SCI
+from backend.services.analysis_service import AnalysisService
+from backend.tests import reference
+
+RESULTATS = [-50_000, -1, 0, 0.01, 1000, 38_120, 42_499.99, 42_500, 42_500.01, 100_000, 499_999, 500_000, 2e6]
+
+
+@pytest.mark.parametrize("resultat", RESULTATS)
+def test_bareme_par_defaut(resultat):
+    assert FiscalCalculator().calculer_is(resultat) == pytest.approx(reference.calculer_is(resultat), abs=1e-9)
+
+
+def test_bareme_par_defaut_vectorise():
+    resultats = np.array(RESULTATS, dtype=float)
+    attendu = [reference.calculer_is(resultat) for resultat in RESULTATS]
+    np.testing.assert_allclose(FiscalCalculator().calculer_is_tableau(resultats), attendu, atol=1e-9)
+    np.testing.assert_allclose(
+        FiscalCalculator().calculer_is_tableau(np.tile(resultats, (3, 1))), np.tile(attendu, (3, 1)), atol=1e-9
+    )
+
+
+@pytest.mark.parametrize("annee", [2015, 2019, 2020, 2021, 2022, 2023, 2030])
+def test_baremes_historiques(annee):
+    calculateur = FiscalCalculator(BAREMES_IS_HISTORIQUES)
+    exercice = max([e for e in BAREMES_IS_HISTORIQUES if e <= annee] or [min(BAREMES_IS_HISTORIQUES)])
+    bareme = BAREMES_IS_HISTORIQUES[exercice]
+    assert calculateur.bareme(annee) == bareme
+
+    for resultat in RESULTATS:
+        attendu = reference.impot_bareme(resultat, bareme.seuils, bareme.taux)
+        assert calculateur.calculer_is(resultat, annee) == pytest.approx(attendu, abs=1e-9), resultat
+
+
+def test_baremes_historiques_vectorises():
+    calculateur = FiscalCalculator(BAREMES_IS_HISTORIQUES)
+    annees = np.arange(2017, 2027)
+    resultats = np.linspace(-20_000, 700_000, 6)[:, np.newaxis] + np.zeros(len(annees))
+    impots = calculateur.calculer_is_tableau(resultats, annees)
+    for i, j in np.ndindex(resultats.shape):
+        assert impots[i, j] == pytest.approx(calculateur.calculer_is(resultats[i, j], int(annees[j])), abs=1e-9)
+
+
+def test_bareme_invalide():
+    with pytest.raises(ValueError):
+        BaremeIS((0, 10_000), (0.15,))
+    with pytest.raises(ValueError):
+        BaremeIS((1000, 10_000), (0.15, 0.25))
+    with pytest.raises(ValueError):
+        BaremeIS((0, 10_000, 5000), (0.15, 0.25, 0.3))
+
+
+def test_report_des_deficits():
+    generateur = np.random.default_rng(3)
+    resultats = generateur.normal(5000, 40_000, (50, 25))
+    calculateur = FiscalCalculator(report_deficits=True)
+
+    bases = calculateur.imputer_deficits(resultats)
+    for ligne, valeurs in zip(bases, resultats):
+        np.testing.assert_allclose(ligne, reference.bases_apres_report(valeurs), atol=1e-6)
+
+    impots = calculateur.calculer_is_tableau(resultats)
+    attendu = [[reference.calculer_is(base) for base in reference.bases_apres_report(ligne)] for ligne in resultats]
+    np.testing.assert_allclose(impots, attendu, atol=1e-6)
+
+
+@pytest.fixture
+def sci():
+    """Déficitaire tant que les frais de notaire s'amortissent, bénéficiaire ensuite."""
+    sci = SCI("SCI déficits", 2025, 1000, 2)
+    sci.ajouter_bien(
+        Bien(
+            1,
+            "Immeuble",
+            2025,
+            300_000,
+            0,
+            100_000,
+            apport_sci=400_000,
+            appartements=[AppartementLocation(1, 1200), AppartementLocation(2, 1100)],
+            taxe_fonciere=2000,
+        )
+    )
+    return sci
+
+
+def test_report_des_deficits_dans_la_projection(sci):
+    service = AnalysisService(sci, fiscal_calculator=FiscalCalculator(report_deficits=True))
+    projection = service.generer_projection(25)
+
+    attendu = reference.projection(sci, 25)[list(COLONNES_PROJECTION)]
+    bases = reference.bases_apres_report(attendu["resultat_avant_impot"])
+    impots = np.array([reference.calculer_is(base) for base in bases])
+    assert (attendu["resultat_avant_impot"] < 0).any() and (attendu["resultat_avant_impot"] > 0).any()
+    assert impots.sum() < attendu["impot_societes"].sum()
+    np.testing.assert_allclose(projection["impot_societes"], impots, atol=1e-6)
+    np.testing.assert_allclose(projection["resultat_net"], attendu["resultat_avant_impot"] - impots, atol=1e-6)
+    np.testing.assert_allclose(
+        projection["reserves_fin"], np.cumsum(attendu["resultat_avant_impot"] - impots), atol=1e-6
+    )
+
+
+def test_report_des_deficits_par_annee(sci):
+    sci._fiscal_calculator.report_deficits = True
+    projection = sci.calculer_projection(25).colonnes
+    for i, annee in enumerate(projection["annee"]):
+        resultat = sci.calculer_resultat_annee(int(annee))
+        assert resultat["impot_societes"] == pytest.approx(projection["impot_societes"][i], abs=1e-6)
@@ -0,0 +1,107 @@
+"""Requêtes annuelles d'une SCI servies par l'index des acquisitions."""
+import copy
+
+import pytest
+
+from backend.core.models.appartement import AppartementLocation
+from backend.core.models.bien import Bien
+from backend.core.models.credit import Credit
+from backend.core.models.index_acquisitions import IndexAcquisitions
+from backend.core.models.sci import SCI
+from backend.tests import reference
+
+
+@pytest.fixture
+def sci():
+    sci = SCI("SCI index", 2024, 2000, 2)
+    achats = [(2030, 300_000, 0.04), (2024, 150_000, 0.0), (2027, 90_000, None), (2027, 210_000, 0.032)]
+    for numero, (annee, prix, taux) in enumerate(achats, start=1):
+        credit = Credit(prix * 0.9, taux, 20, frais_dossier=900, frais_garantie=1800) if taux is not None else None
+        sci.ajouter_bien(
+            Bien(
+                numero,
+                f"Bien {numero}",
+                annee,
+                prix,
+                6000,
+                prix * 0.07,
+                apport_sci=prix * 0.1,
+                credit=credit,
+                appartements=[AppartementLocation(1, prix / 300), AppartementLocation(2, 450)],
+                taxe_fonciere=1100,
+            )
+        )
+    sci.ajouter_apport_cca(2024, "A", 8000)
+    sci.ajouter_apport_cca(2027, "B", 3000)
+    sci.ajouter_apport_cca(2027, "A", 2000)
+    return sci
+
+
+def verifier_annees(sci, annees):
+    for annee in annees:
+        resultat = sci.calculer_resultat_annee(annee)
+        attendu = reference.resultat_annee(sci, annee)
+        assert resultat.keys() == attendu.keys()
+        for cle, valeur in attendu.items():
+            assert resultat[cle] == pytest.approx(valeur, rel=1e-9, abs=1e-6), (annee, cle)
+        tresorerie = sci.calculer_tresorerie_annee(annee, 1000.0)
+        for cle, valeur in reference.tresorerie_annee(sci, annee, 1000.0).items():
+            assert tresorerie[cle] == pytest.approx(valeur, rel=1e-9, abs=1e-6), (annee, cle)
+
+
+def test_requetes_annuelles_identiques_a_la_boucle(sci):
+    verifier_annees(sci, range(2022, 2036))
+
+
+def test_index_trie_par_annee_d_achat(sci):
+    index = IndexAcquisitions.construire(sci.biens, sci.apports_cca)
+    assert index.annees_achat == [2024, 2027, 2027, 2030]
+    assert index.nombre_detenus(2023) == 0
+    assert index.nombre_detenus(2027) == 3
+    assert [bien.numero for bien in index.biens_detenus(2029)] == [2, 3, 4]
+    assert index.revenus(2029) == pytest.approx(sum(sci.biens[i].revenus_annuels for i in (1, 2, 3)))
+    assert index.apports_cca == {2024: 8000, 2027: 5000}
+    assert index.frais_credit[2027] == pytest.approx(2700)
+
+
+def test_index_suit_les_modifications(sci):
+    verifier_annees(sci, [2027])
+    sci.biens[0].annee_achat = 2026
+    sci.biens[2].appartements[0].loyer_mensuel += 250
+    sci.biens[3].credit.taux_annuel = 0.05
+    verifier_annees(sci, range(2024, 2032))
+
+    sci.ajouter_bien(Bien(5, "Ajouté", 2025, 100_000, 0, 7000, appartements=[AppartementLocation(1, 600)]))
+    sci.ajouter_apport_cca(2025, "C", 1500)
+    verifier_annees(sci, range(2024, 2032))
+
+
+def test_cle_de_l_index_sans_parcours_des_biens(sci, monkeypatch):
+    index = sci.index_acquisitions()
+    with monkeypatch.context() as patch:
+        patch.setattr(Bien, "version", property(lambda bien: pytest.fail("biens parcourus")))
+        assert sci.index_acquisitions() is index
+    sci.biens[1].appartements[1].loyer_mensuel = 700
+    assert sci.index_acquisitions() is not index
+
+
+def test_index_apres_modifications_directes(sci):
+    index = sci.index_acquisitions()
+    sci.biens.append(Bien(5, "Ajouté", 2026, 80_000, 0, 5000, appartements=[AppartementLocation(1, 500)]))
+    assert sci.index_acquisitions() is not index
+    sci.biens = sci.biens[:3]
+    verifier_annees(sci, range(2024, 2032))
+
+    # Un apport modifié en place n'est visible qu'après invalidation
+    index = sci.index_acquisitions()
+    sci.apports_cca[0]["montant"] = 9000
+    assert sci.index_acquisitions() is index
+    sci.invalider_index()
+    assert sci.index_acquisitions().apports_cca[2024] == 9000
+
+
+def test_index_d_une_copie(sci):
+    index = sci.index_acquisitions()
+    copie = copy.deepcopy(sci)
+    assert copie.index_acquisitions() is not index
+    assert copie.index_acquisitions().biens_detenus(2027) == copie.biens[1:]
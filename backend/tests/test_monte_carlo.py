@@ -0,0 +1,115 @@
+"""Simulation Monte Carlo sur la projection d'une SCI."""
+import numpy as np
+import pytest
+
+from backend.core.models.appartement import AppartementLocation
+from backend.core.models.bien import Bien
+from backend.core.models.credit import Credit
+from backend.core.models.sci import SCI
+from backend.services import monte_carlo_service
+from backend.services.monte_carlo_service import (
+    HypothesesMonteCarlo,
+    MonteCarloService,
+    ResultatMonteCarlo,
+)
+from backend.tests import reference
+
+SANS_ALEA = HypothesesMonteCarlo(
+    vacance_moyenne=0.0,
+    vacance_ecart_type=0.0,
+    indexation_moyenne=0.0,
+    indexation_ecart_type=0.0,
+    inflation_moyenne=0.0,
+    inflation_ecart_type=0.0,
+)
+
+
+@pytest.fixture
+def sci():
+    """Deux biens dont un acheté plus tard, un crédit avec différé et un sans crédit."""
+    sci = SCI("SCI Monte Carlo", 2025, 1000, 2)
+    sci.ajouter_apport_cca(2025, "A", 10_000)
+    sci.ajouter_bien(
+        Bien(
+            1,
+            "Immeuble",
+            2025,
+            240_000,
+            9000,
+            17_000,
+            travaux=20_000,
+            apport_sci=15_000,
+            credit=Credit(250_000, 0.036, 20, differe_partiel_mois=6, frais_dossier=900),
+            appartements=[AppartementLocation(1, 620), AppartementLocation(2, 700), AppartementLocation(3, 540)],
+            taxe_fonciere=1600,
+        )
+    )
+    sci.ajouter_bien(
+        Bien(2, "Studio", 2029, 70_000, 0, 6000, apport_sci=76_000, appartements=[AppartementLocation(1, 450)])
+    )
+    return sci
+
+
+def test_scenarios_sans_alea_identiques_a_la_projection(sci):
+    resultat = MonteCarloService.from_sci(sci, SANS_ALEA).simuler(50, duree_annees=20, graine=0)
+    attendu = reference.projection(sci, 20)
+
+    assert resultat.cashflow.shape == (50, 20)
+    np.testing.assert_allclose(resultat.cashflow, np.tile(attendu["cashflow"], (50, 1)), rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(resultat.reserves, np.tile(attendu["reserves_fin"], (50, 1)), rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(
+        resultat.tresorerie, np.tile(np.cumsum(attendu["tresorerie_realisee"]), (50, 1)), rtol=1e-9, atol=1e-6
+    )
+
+    flux = attendu["cashflow"].to_numpy() - reference.apports_associes(sci, 20)
+    np.testing.assert_allclose(resultat.flux_fonds_propres(), np.tile(flux, (50, 1)), rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(resultat.rendements(0.04)["van"], reference.van(flux, 0.04), rtol=1e-9)
+
+
+def test_resultat_determine_par_la_graine(sci):
+    service = MonteCarloService.from_sci(sci, HypothesesMonteCarlo(volatilite_taux=0.002))
+    premier = service.simuler(500, 15, graine=42)
+    second = service.simuler(500, 15, graine=42)
+    autre = service.simuler(500, 15, graine=43)
+
+    np.testing.assert_array_equal(premier.tresorerie, second.tresorerie)
+    assert not np.array_equal(premier.tresorerie, autre.tresorerie)
+
+
+def test_resultat_independant_du_nombre_de_processus(sci, monkeypatch):
+    monkeypatch.setattr(monte_carlo_service, "TAILLE_BLOC", 100)
+    service = MonteCarloService.from_sci(sci)
+    sequentiel = service.simuler(250, 10, graine=7)
+    parallele = service.simuler(250, 10, graine=7, nombre_processus=2)
+    np.testing.assert_array_equal(sequentiel.cashflow, parallele.cashflow)
+    np.testing.assert_array_equal(sequentiel.tresorerie, parallele.tresorerie)
+
+
+def test_vacance_reduit_le_cashflow(sci):
+    base = MonteCarloService.from_sci(sci, SANS_ALEA).simuler(10, 20, graine=0)
+    vacance = HypothesesMonteCarlo(**{**SANS_ALEA.__dict__, "vacance_moyenne": 0.1})
+    degrade = MonteCarloService.from_sci(sci, vacance).simuler(10, 20, graine=0)
+    assert (degrade.cashflow <= base.cashflow + 1e-9).all()
+    assert (degrade.cashflow < base.cashflow).any()
+
+
+def test_synthese_et_percentiles(sci):
+    resultat = MonteCarloService.from_sci(sci).simuler(1000, 20, graine=1)
+    percentiles = resultat.percentiles((5, 50, 95))
+    assert list(percentiles.columns[:4]) == ["annee", "cashflow_p5", "cashflow_p50", "cashflow_p95"]
+    assert (percentiles["tresorerie_p5"] <= percentiles["tresorerie_p95"]).all()
+
+    synthese = resultat.synthese((5, 50))
+    assert synthese["tresorerie_minimale_p5"] == pytest.approx(np.percentile(resultat.tresorerie.min(axis=1), 5))
+    assert synthese["probabilite_tresorerie_negative"] == pytest.approx((resultat.tresorerie.min(axis=1) < 0).mean())
+
+
+def test_aucun_scenario(sci):
+    with pytest.raises(ValueError):
+        MonteCarloService.from_sci(sci).simuler(0)
+
+    vide = np.empty((0, 5))
+    resultat = ResultatMonteCarlo(np.arange(2025, 2030), vide, vide, vide)
+    assert np.isnan(resultat.probabilite_tresorerie_negative)
+    assert np.isnan(resultat.percentiles((5, 95)).drop(columns="annee").to_numpy()).all()
+    assert all(np.isnan(valeur) for valeur in resultat.synthese().values())
@@ -0,0 +1,119 @@
+"""Recherche d'objectif : prix maximal, loyer minimal et apport minimal d'un bien."""
+import copy
+
+import numpy as np
+import pytest
+
+from backend.core.models.appartement import AppartementLocation
+from backend.core.models.bien import Bien
+from backend.core.models.credit import Credit
+from backend.core.models.sci import SCI
+from backend.services.objectif_service import (
+    Contrainte,
+    ObjectifService,
+    SolveurObjectif,
+    cashflow_minimal,
+    tresorerie_positive,
+)
+from backend.tests import reference
+
+
+@pytest.fixture
+def sci():
+    sci = SCI("SCI objectif", 2025, 1000, 2)
+    sci.ajouter_bien(
+        Bien(
+            1,
+            "Immeuble",
+            2026,
+            210_000,
+            7000,
+            15_000,
+            travaux=10_000,
+            apport_sci=20_000,
+            credit=Credit(200_000, 0.035, 20, differe_partiel_mois=6, frais_dossier=1000),
+            appartements=[AppartementLocation(1, 600), AppartementLocation(2, 650)],
+            taxe_fonciere=1400,
+        )
+    )
+    sci.ajouter_bien(
+        Bien(2, "Garage", 2025, 20_000, 0, 2000, apport_sci=22_000, appartements=[AppartementLocation(1, 90)])
+    )
+    return sci
+
+
+def variante(sci, prix_achat=None, facteur_loyer=1.0):
+    """Copie de la SCI dont le premier bien a ce prix (surcoût financé par le crédit) et ces loyers."""
+    sci = copy.deepcopy(sci)
+    bien = sci.biens[0]
+    if prix_achat is not None:
+        bien.credit.capital_emprunte += prix_achat - bien.prix_achat
+        bien.prix_achat = prix_achat
+    for appartement in bien.appartements:
+        appartement.loyer_mensuel *= facteur_loyer
+    return sci
+
+
+def cashflow_detention(sci, duree_annees=20):
+    projection = reference.projection(sci, duree_annees)
+    return projection["cashflow"][projection["annee"] >= sci.biens[0].annee_achat].min()
+
+
+def test_loyer_minimal(sci):
+    resultat = ObjectifService.from_sci(sci).loyer_minimal(cashflow_minimal(0.0))
+    assert resultat.atteint
+    assert resultat.variable == "loyers_annuels"
+
+    facteur = resultat.valeur / sci.biens[0].revenus_annuels
+    assert cashflow_detention(variante(sci, facteur_loyer=facteur)) >= -1e-6
+    assert cashflow_detention(variante(sci, facteur_loyer=facteur * (1 - 1e-4))) < 0
+
+
+def test_prix_achat_maximal(sci):
+    resultat = ObjectifService.from_sci(sci).prix_achat_maximal(tresorerie_positive(-50_000))
+    assert resultat.atteint
+
+    def tresorerie_minimale(prix):
+        return np.cumsum(reference.projection(variante(sci, prix_achat=prix), 20)["tresorerie_realisee"]).min()
+
+    assert tresorerie_minimale(resultat.valeur) >= -50_000 - 1e-6
+    assert tresorerie_minimale(resultat.valeur * (1 + 1e-4)) < -50_000
+
+
+def test_apport_minimal_et_cas_limites(sci):
+    service = ObjectifService.from_sci(sci)
+    # Contrainte impossible : aucun apport ne suffit
+    assert not service.apport_minimal(cashflow_minimal(1e9)).atteint
+    # Contrainte toujours satisfaite : l'apport le plus faible de l'intervalle
+    resultat = service.apport_minimal(cashflow_minimal(-1e9))
+    assert resultat.valeur == 0.0
+    with pytest.raises(ValueError):
+        service.solveur().resoudre("surface", cashflow_minimal(), 0, 1)
+
+
+def contrainte_sur_variable(fonction):
+    """Contrainte dont la marge ne dépend que de la valeur du paramètre étudié."""
+    return Contrainte("marge analytique", lambda projection, evaluateur, valeurs: fonction(valeurs["facteur_loyer"]))
+
+
+def test_contrainte_non_monotone_respectee_au_depart(sci):
+    # Respectée sur [0, 1] et [3, 4] : la première frontière depuis la borne basse est 1
+    contrainte = contrainte_sur_variable(lambda x: -(x - 1) * (x - 3) * (x - 4))
+    resultat = ObjectifService.from_sci(sci).solveur().resoudre("facteur_loyer", contrainte, 0.0, 5.0, cherche="max")
+    assert resultat.valeur == pytest.approx(1.0, abs=1e-8)
+    assert resultat.valeur <= 1.0 and resultat.marge >= 0
+
+
+@pytest.mark.parametrize("cherche", ["max", "min"])
+def test_contrainte_non_monotone_enfreinte_au_depart(sci, cherche):
+    # Respectée seulement sur [1, 3], enfreinte aux deux bornes
+    contrainte = contrainte_sur_variable(lambda x: 1 - np.abs(x - 2))
+    with pytest.raises(ValueError, match="pas monotone"):
+        ObjectifService.from_sci(sci).solveur().resoudre("facteur_loyer", contrainte, 0.0, 5.0, cherche=cherche)
+
+
+def test_encadrement_sans_frontiere():
+    points = np.linspace(0.0, 1.0, 5)
+    assert SolveurObjectif._encadrement(points, np.array([-1.0, 1.0, 2.0, -1.0, 1.0])) is None
+    assert SolveurObjectif._encadrement(points, np.array([1.0, 1.0, 2.0, 0.0, 1.0])) is None
+    assert SolveurObjectif._encadrement(points, np.array([1.0, 2.0, -1.0, 1.0, -2.0])) == (0.25, 2.0, 0.5, -1.0)
@@ -0,0 +1,105 @@
+"""Échéanciers de portefeuilles de crédits calculés en une passe."""
+import numpy as np
+import pytest
+
+from backend.core.models.credit import Credit
+from backend.core.models.portefeuille_credits import (
+    calculer_echeanciers,
+    calculer_mensualites,
+    colonnes_credits,
+)
+from backend.tests import reference
+
+
+@pytest.fixture
+def credits():
+    return [
+        Credit(150_000, 0.035, 20),
+        Credit(200_000, 0.0, 15),
+        Credit(123_456.7, 0.05, 25, differe_partiel_mois=24),
+        Credit(80_000, 0.031, 10, differe_total_mois=12),
+        Credit(100_000, 0.045, 20, differe_partiel_mois=12, differe_total_mois=6),
+        Credit(0, 0.03, 10),
+    ]
+
+
+def test_mensualites(credits):
+    mensualites = calculer_mensualites(**colonnes_credits(credits))
+    np.testing.assert_allclose(mensualites, [credit.calculer_mensualite() for credit in credits], rtol=1e-12)
+
+
+def test_mensualites_differe_trop_long():
+    with pytest.raises(ValueError):
+        calculer_mensualites(100_000, 0.03, 1, differe_partiel_mois=12)
+
+
+def test_echeanciers_mensuels_identiques_aux_tableaux(credits):
+    echeanciers = calculer_echeanciers(**colonnes_credits(credits))
+    assert echeanciers.nombre_credits == len(credits)
+    assert echeanciers.nombre_periodes == 300
+    assert not echeanciers.par_annee
+
+    for ligne, credit in enumerate(credits):
+        tableau = reference.tableau_credit(credit)
+        duree = len(tableau)
+        assert echeanciers.actifs[ligne].sum() == credit.duree_mois
+        if credit.capital_emprunte == 0:
+            assert not echeanciers.interets[ligne].any()
+            assert not echeanciers.capital_restant[ligne].any()
+            continue
+        np.testing.assert_allclose(echeanciers.interets[ligne, :duree], tableau["Intérêts"], rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(
+            echeanciers.capital_amorti[ligne, :duree], tableau["Capital amorti"], rtol=1e-9, atol=1e-6
+        )
+        np.testing.assert_allclose(
+            echeanciers.capital_restant[ligne, :duree], tableau["Capital restant fin"], rtol=1e-9, atol=1e-6
+        )
+        # Au-delà du terme, aucun flux et un solde figé
+        assert not echeanciers.interets[ligne, duree:].any()
+        assert not echeanciers.capital_amorti[ligne, duree:].any()
+        np.testing.assert_array_equal(
+            echeanciers.capital_restant[ligne, duree:], echeanciers.capital_restant[ligne, duree - 1]
+        )
+
+
+def test_echeanciers_annuels_identiques_aux_sommes(credits):
+    echeanciers = calculer_echeanciers(**colonnes_credits(credits), par_annee=True)
+    assert echeanciers.nombre_periodes == 25
+    assert echeanciers.par_annee
+
+    for ligne, credit in enumerate(credits):
+        tableau = reference.tableau_credit(credit)
+        for annee in range(1, credit.duree_annees + 1):
+            attendu = reference.agregats_annee(tableau, annee)
+            assert echeanciers.interets[ligne, annee - 1] == pytest.approx(attendu["interets"], rel=1e-9, abs=1e-6)
+            assert echeanciers.capital_amorti[ligne, annee - 1] == pytest.approx(
+                attendu["capital_amorti"], rel=1e-9, abs=1e-6
+            )
+            assert echeanciers.capital_restant[ligne, annee - 1] == pytest.approx(
+                attendu["capital_restant_fin"], rel=1e-9, abs=1e-6
+            )
+
+
+def test_echeanciers_mensuels_et_annuels_coherents():
+    generateur = np.random.default_rng(0)
+    nombre = 200
+    parametres = {
+        "capital": generateur.uniform(5e4, 5e5, nombre),
+        "taux_annuel": generateur.uniform(0.0, 0.06, nombre),
+        "duree_annees": generateur.integers(10, 26, nombre),
+        "differe_partiel_mois": np.where(generateur.random(nombre) < 0.2, generateur.integers(0, 24, nombre), 0),
+        "differe_total_mois": np.where(generateur.random(nombre) < 0.1, generateur.integers(0, 12, nombre), 0),
+    }
+    mensuels = calculer_echeanciers(**parametres)
+    annuels = calculer_echeanciers(**parametres, par_annee=True)
+
+    annees = mensuels.nombre_periodes // 12
+    for nom in ("interets", "capital_amorti"):
+        sommes = getattr(mensuels, nom).reshape(nombre, annees, 12).sum(axis=2)
+        np.testing.assert_allclose(sommes, getattr(annuels, nom), rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(mensuels.capital_restant[:, 11::12], annuels.capital_restant, rtol=1e-9, atol=1e-6)
+
+
+def test_nombre_periodes_impose():
+    echeanciers = calculer_echeanciers([100_000, 50_000], 0.03, [20, 10], nombre_periodes=60)
+    assert echeanciers.interets.shape == (2, 60)
@@ -0,0 +1,185 @@
+"""Projection en colonnes d'une SCI comparée au calcul année par année.
+
+Couvre aussi le cache d'AnalysisService et sa mise à jour incrémentale.
+"""
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.core.calculators.projection import (
+    COLONNES_COMPTE_RESULTAT,
+    COLONNES_PROJECTION,
+    COLONNES_TRESORERIE,
+)
+from backend.core.models.appartement import AppartementLocation
+from backend.core.models.bien import Bien
+from backend.core.models.credit import Credit
+from backend.core.models.sci import SCI
+from backend.services.analysis_service import AnalysisService
+from backend.tests import reference
+
+
+def sci_aleatoire(graine: int, nombre_biens: int = 4) -> SCI:
+    """SCI dont les biens sont achetés sur plusieurs années, avec ou sans crédit ni différé."""
+    aleatoire = random.Random(graine)
+    sci = SCI("SCI test", 2025, 1000, 2)
+    for annee in range(3):
+        sci.ajouter_apport_cca(2025 + annee, f"Associé {annee}", 5000)
+    for numero in range(1, nombre_biens + 1):
+        credit = None
+        if aleatoire.random() < 0.8:
+            credit = Credit(
+                aleatoire.randint(50, 300) * 1000,
+                aleatoire.choice([0.0, 0.02, 0.031, 0.045]),
+                aleatoire.choice([10, 15, 20, 25]),
+                differe_partiel_mois=aleatoire.choice([0, 0, 6, 12]),
+                differe_total_mois=aleatoire.choice([0, 0, 3, 12]),
+                frais_dossier=1000,
+                frais_garantie=500,
+            )
+        sci.ajouter_bien(
+            Bien(
+                numero,
+                f"Bien {numero}",
+                2025 + aleatoire.randint(0, 8),
+                aleatoire.randint(80, 400) * 1000,
+                10_000,
+                15_000,
+                travaux=aleatoire.choice([0, 20_000]),
+                meubles=aleatoire.choice([0, 8000]),
+                apport_sci=aleatoire.choice([0, 10_000]),
+                credit=credit,
+                appartements=[
+                    AppartementLocation(lot, aleatoire.randint(300, 900)) for lot in range(aleatoire.randint(1, 6))
+                ],
+                taxe_fonciere=1200,
+                charges_copro=300,
+            )
+        )
+    return sci
+
+
+def comparer(obtenu: pd.DataFrame, attendu: pd.DataFrame) -> None:
+    assert list(obtenu.columns) == list(attendu.columns)
+    np.testing.assert_allclose(
+        obtenu.to_numpy(dtype=float), attendu.to_numpy(dtype=float), rtol=1e-9, atol=1e-6
+    )
+
+
+def projection_reference(sci: SCI, duree: int = 20) -> pd.DataFrame:
+    return reference.projection(sci, duree)[list(COLONNES_PROJECTION)]
+
+
+@pytest.mark.parametrize("graine", range(6))
+@pytest.mark.parametrize("duree", [1, 12, 30])
+def test_projection_identique_a_la_boucle_annuelle(graine, duree):
+    sci = sci_aleatoire(graine)
+    attendu = projection_reference(sci, duree)
+
+    comparer(sci.generer_projection(duree), attendu)
+    service = AnalysisService(sci)
+    comparer(service.generer_projection(duree), attendu)
+    comparer(service.generer_compte_resultat(duree), attendu[list(COLONNES_COMPTE_RESULTAT)])
+    comparer(service.generer_tresorerie(duree), attendu[list(COLONNES_TRESORERIE)])
+
+
+def test_projection_sans_bien():
+    sci = SCI("Vide", 2025, 1000, 2)
+    assert sci.generer_projection(0).empty
+    comparer(sci.generer_projection(5), projection_reference(sci, 5))
+
+
+def compter_calculs(service: AnalysisService, monkeypatch) -> list:
+    """Appels au calcul complet de la projection, enregistrés à partir de maintenant."""
+    appels = []
+    calculer = service.projection_calculator.calculer
+    monkeypatch.setattr(
+        service.projection_calculator, "calculer", lambda *args: appels.append(args) or calculer(*args)
+    )
+    return appels
+
+
+def test_cache_partage_entre_vues(monkeypatch):
+    service = AnalysisService(sci_aleatoire(0))
+    appels = compter_calculs(service, monkeypatch)
+
+    service.generer_projection(20)
+    service.generer_compte_resultat(20)
+    service.generer_tresorerie(12)
+    assert len(appels) == 1
+    service.generer_projection(25)
+    assert len(appels) == 2
+
+
+def test_modifications_invalident_le_cache():
+    sci = sci_aleatoire(4)
+    service = AnalysisService(sci)
+    service.generer_projection(20)
+
+    bien = next(bien for bien in sci.biens if bien.credit)
+    bien.prix_achat += 10_000
+    comparer(service.generer_projection(20), projection_reference(sci))
+
+    bien.appartements[0].loyer_mensuel += 100
+    comparer(service.generer_projection(20), projection_reference(sci))
+
+    bien.appartements.append(AppartementLocation(42, 555))
+    comparer(service.generer_projection(20), projection_reference(sci))
+
+    bien.credit.taux_annuel = 0.06
+    comparer(service.generer_projection(20), projection_reference(sci))
+
+    sci.frais_comptable_annuel = 2500
+    comparer(service.generer_projection(20), projection_reference(sci))
+
+
+def test_projection_memorisee_en_lecture_seule():
+    service = AnalysisService(sci_aleatoire(0))
+    projection = service.calculer_projection(10)
+    with pytest.raises(ValueError):
+        projection.colonnes["cashflow"][0] = 0.0
+
+
+def nouveau_bien(numero: int = 99, annee_achat: int = 2028) -> Bien:
+    return Bien(
+        numero,
+        "Ajouté",
+        annee_achat,
+        180_000,
+        8000,
+        14_000,
+        travaux=15_000,
+        apport_sci=12_000,
+        credit=Credit(170_000, 0.038, 20, differe_partiel_mois=6, frais_dossier=800, frais_garantie=1200),
+        appartements=[AppartementLocation(1, 650), AppartementLocation(2, 720)],
+        taxe_fonciere=1400,
+    )
+
+
+@pytest.mark.parametrize("incremental", [True, False])
+def test_ajouts_identiques_a_un_recalcul(monkeypatch, incremental):
+    sci = sci_aleatoire(2)
+    service = AnalysisService(sci, incremental=incremental)
+    service.generer_projection(20)
+    appels = compter_calculs(service, monkeypatch)
+
+    sci.ajouter_bien(nouveau_bien())
+    comparer(service.generer_projection(20), projection_reference(sci))
+    sci.ajouter_apport_cca(2030, "Associé tardif", 7000)
+    comparer(service.generer_projection(20), projection_reference(sci))
+    assert len(appels) == (0 if incremental else 2)
+
+
+def test_ajout_la_premiere_annee_et_apres_l_horizon(monkeypatch):
+    sci = sci_aleatoire(5)
+    service = AnalysisService(sci)
+    service.generer_projection(15)
+    appels = compter_calculs(service, monkeypatch)
+
+    sci.ajouter_bien(nouveau_bien(98, annee_achat=2045))
+    comparer(service.generer_projection(15), projection_reference(sci, 15))
+    sci.ajouter_bien(nouveau_bien(97, annee_achat=2025))
+    comparer(service.generer_projection(15), projection_reference(sci, 15))
+    assert len(appels) == 0
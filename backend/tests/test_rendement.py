@@ -0,0 +1,140 @@
+"""TRI, VAN, multiple et délai de récupération des associés."""
+import numpy as np
+import pytest
+
+from backend.core.calculators.rendement import (
+    RendementCalculator,
+    calculer_delai_recuperation,
+    calculer_multiple,
+    calculer_tri,
+    calculer_van,
+)
+from backend.core.models.appartement import AppartementLocation
+from backend.core.models.bien import Bien
+from backend.core.models.credit import Credit
+from backend.core.models.sci import SCI
+from backend.services.analysis_service import AnalysisService
+from backend.tests import reference
+
+FLUX = [
+    [-100.0, 110.0],
+    [-1000.0, 300.0, 400.0, 500.0],
+    [-50_000.0, 2000.0, 2000.0, 2000.0, 60_000.0],
+    [-10_000.0, -5000.0, 1000.0, 3000.0, 4000.0, 4000.0, 9000.0],
+    [-1000.0, 100.0, 100.0],
+    [1000.0, 100.0],
+]
+
+
+@pytest.mark.parametrize("flux", FLUX)
+def test_tri_identique_a_la_dichotomie(flux):
+    attendu = reference.tri(flux)
+    tri = float(calculer_tri(np.array(flux)))
+    if np.isnan(attendu):
+        assert np.isnan(tri)
+    else:
+        assert tri == pytest.approx(attendu, abs=1e-8)
+        assert reference.van(flux, tri) == pytest.approx(0.0, abs=1e-6 * np.abs(flux).sum())
+
+
+def test_tri_connu():
+    assert float(calculer_tri(np.array([-100.0, 110.0]))) == pytest.approx(0.10, abs=1e-9)
+    assert float(calculer_tri(np.array([-100.0, 0.0, 121.0]))) == pytest.approx(0.10, abs=1e-9)
+
+
+def test_tri_par_lot_identique_au_calcul_ligne_a_ligne():
+    generateur = np.random.default_rng(7)
+    flux = np.concatenate(
+        [-generateur.uniform(1e4, 1e5, (300, 1)), generateur.normal(8000, 6000, (300, 15))], axis=1
+    )
+    tris = calculer_tri(flux)
+    assert tris.shape == (300,)
+    for ligne, tri in zip(flux, tris):
+        attendu = reference.tri(ligne)
+        if np.isnan(attendu):
+            assert np.isnan(tri)
+        else:
+            assert tri == pytest.approx(attendu, abs=1e-7)
+    assert calculer_tri(flux.reshape(20, 15, 16)).shape == (20, 15)
+
+
+@pytest.mark.parametrize("flux", FLUX)
+def test_van(flux):
+    for taux in (0.0, 0.03, 0.08):
+        assert float(calculer_van(np.array(flux), taux)) == pytest.approx(reference.van(flux, taux), rel=1e-12)
+
+
+def test_van_courbe_de_taux():
+    flux = np.array([-1000.0, 300.0, 400.0, 500.0])
+    courbe = np.array([0.0, 0.01, 0.02, 0.03])
+    attendu = sum(montant / (1 + taux) ** t for t, (montant, taux) in enumerate(zip(flux, courbe)))
+    assert float(calculer_van(flux, courbe)) == pytest.approx(attendu, rel=1e-12)
+
+
+def test_multiple_et_delai():
+    flux = np.array([[-1000.0, 300.0, 400.0, 500.0], [-1000.0, 100.0, 100.0, 100.0], [100.0, 50.0, 0.0, 0.0]])
+    np.testing.assert_allclose(calculer_multiple(flux), [1.2, 0.3, np.nan])
+    np.testing.assert_allclose(calculer_delai_recuperation(flux), [2 + 300 / 500, np.nan, 0.0])
+
+
+@pytest.fixture
+def sci():
+    """Apports des associés étalés : capital, CCA sur deux exercices et apport à un achat ultérieur."""
+    sci = SCI("SCI rendement", 2025, 2000, 2)
+    sci.ajouter_apport_cca(2025, "A", 15_000)
+    sci.ajouter_apport_cca(2031, "Associé tardif", 8000)
+    sci.ajouter_bien(
+        Bien(
+            1,
+            "Immeuble",
+            2025,
+            260_000,
+            9000,
+            19_000,
+            apport_sci=15_000,
+            credit=Credit(275_000, 0.034, 20, frais_dossier=900),
+            appartements=[AppartementLocation(1, 700), AppartementLocation(2, 760), AppartementLocation(3, 610)],
+            taxe_fonciere=1700,
+        )
+    )
+    sci.ajouter_bien(
+        Bien(
+            2,
+            "Local",
+            2029,
+            90_000,
+            3000,
+            7000,
+            apport_sci=30_000,
+            credit=Credit(70_000, 0.04, 15),
+            appartements=[AppartementLocation(1, 750)],
+        )
+    )
+    return sci
+
+
+def test_flux_des_associes(sci):
+    service = AnalysisService(sci)
+    projection = service.calculer_projection(20)
+    calculateur = RendementCalculator()
+
+    apports = reference.apports_associes(sci, 20)
+    np.testing.assert_allclose(calculateur.apports(projection), apports)
+    cashflow = reference.projection(sci, 20)["cashflow"].to_numpy()
+    flux = calculateur.flux_fonds_propres(projection, valeur_terminale=50_000)
+    attendu = cashflow - apports
+    attendu[-1] += 50_000
+    np.testing.assert_allclose(flux, attendu, rtol=1e-9, atol=1e-6)
+
+
+def test_rendements_du_service(sci):
+    service = AnalysisService(sci)
+    rendements = service.calculer_rendements(20, taux_actualisation=0.04, revente=False)
+
+    flux = reference.projection(sci, 20)["cashflow"].to_numpy() - reference.apports_associes(sci, 20)
+    assert rendements["van"] == pytest.approx(reference.van(flux, 0.04), rel=1e-9)
+    tri = reference.tri(flux)
+    if np.isnan(tri):
+        assert np.isnan(rendements["tri"])
+    else:
+        assert rendements["tri"] == pytest.approx(tri, abs=1e-7)
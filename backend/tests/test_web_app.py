@@ -0,0 +1,460 @@
+"""API tests: analysis results, loan schedules, report store and report jobs."""
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+# web_app connects to its database at import time
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/web_app_tests.db")
+DEFAULT_REPORTS_DIR = Path(__file__).resolve().parents[1] / "reports"
+_REPORTS_DIR_EXISTED = DEFAULT_REPORTS_DIR.exists()
+
+from backend import web_app  # noqa: E402
+from backend.tests import reference  # noqa: E402
+
+# Results of analyse_projet before its vectorisation, for three typical payloads
+REFERENCE_RESULTS = Path(__file__).with_name("data") / "analyse_projet_reference.json"
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _remove_default_reports_dir():
+    yield
+    # Created empty by the import above; never remove a directory holding reports
+    if not _REPORTS_DIR_EXISTED and DEFAULT_REPORTS_DIR.exists() and not any(DEFAULT_REPORTS_DIR.iterdir()):
+        DEFAULT_REPORTS_DIR.rmdir()
+
+
+@pytest.fixture(autouse=True)
+def reports_dir(tmp_path, monkeypatch):
+    """Empty tables and caches, reports written under ``tmp_path``."""
+    directory = tmp_path / "reports"
+    directory.mkdir()
+    monkeypatch.setattr(web_app, "REPORTS_DIR", directory)
+    monkeypatch.setattr(web_app.REPORT_STORE, "directory", directory)
+    with web_app.session_scope() as session:
+        for model in (web_app.ReportJob, web_app.Project, web_app.StoredReport, web_app.AnalysisCacheEntry):
+            session.execute(web_app.delete(model))
+    web_app.ANALYSIS_CACHE.clear()
+    return directory
+
+
+@pytest.fixture
+def client():
+    return web_app.app.test_client()
+
+
+@pytest.fixture(scope="module")
+def reference_cases():
+    return json.loads(REFERENCE_RESULTS.read_text(encoding="utf-8"))
+
+
+def assert_same_result(actual, expected, path="result"):
+    """Equal structures, floats compared with a relative tolerance."""
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys(), path
+        for key in expected:
+            assert_same_result(actual[key], expected[key], f"{path}.{key}")
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), path
+        for index, (left, right) in enumerate(zip(actual, expected)):
+            assert_same_result(left, right, f"{path}[{index}]")
+    elif isinstance(expected, float) or isinstance(actual, float):
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-6), path
+    else:
+        assert actual == expected, path
+
+
+def test_analysis_matches_reference_results(reference_cases):
+    for name, case in reference_cases.items():
+        assert_same_result(web_app.analyse_projet(case["payload"]), case["resultat"], name)
+
+
+def test_analysis_without_loan_is_exactly_the_reference(reference_cases):
+    # Loan cases differ in the last bits only because the loan schedule is closed-form
+    case = reference_cases["achat_comptant"]
+    assert web_app.analyse_projet(case["payload"]) == case["resultat"]
+
+
+def test_projection_years_are_clamped(reference_cases):
+    payload = reference_cases["achat_comptant"]["payload"]
+    assert len(web_app.analyse_projet({**payload, "projection_years": 0})["projection"]) == 1
+    assert len(web_app.analyse_projet({**payload, "projection_years": 80})["projection"]) == 50
+
+
+@pytest.mark.parametrize(
+    "capital, rate_percent, years",
+    [(200_000, 3.5, 20), (150_000, 0.0, 15), (80_000, 4.2, 7), (50_000, 1.0, 1)],
+)
+def test_loan_schedule_matches_monthly_loop(capital, rate_percent, years):
+    web_app.LOAN_SCHEDULE_CACHE.clear()
+    schedule = web_app.build_loan_schedule(capital, rate_percent, years)
+    table = reference.tableau_amortissement(capital, rate_percent / 100, years)
+    expected = [reference.agregats_annee(table, year) for year in range(1, years + 3)]
+
+    interest, principal, balance = schedule.for_years(years + 2)
+    assert schedule.monthly_payment == pytest.approx(table["Mensualité"].iloc[0], rel=1e-12)
+    assert interest == pytest.approx([row["interets"] for row in expected], rel=1e-9, abs=1e-6)
+    assert principal == pytest.approx([row["capital_amorti"] for row in expected], rel=1e-9, abs=1e-6)
+    assert balance == pytest.approx([row["capital_restant_fin"] for row in expected], rel=1e-9, abs=1e-6)
+
+    assert web_app.build_loan_schedule(capital, rate_percent, years) is schedule
+    assert web_app.LOAN_SCHEDULE_CACHE.info()["hits"] == 1
+    with pytest.raises(ValueError):
+        schedule.interest_per_year[0] = 0.0
+
+
+def test_loan_schedule_without_capital():
+    schedule = web_app.build_loan_schedule(0, 3.0, 10)
+    assert web_app.build_loan_schedule(-5, 1.0, 10) is schedule
+    assert schedule.monthly_payment == 0.0
+    assert not schedule.for_years(12)[2].any()
+
+
+def test_loan_schedule_cache_is_bounded():
+    cache = web_app.LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_payload_hash_is_canonical():
+    payload = {"prix_achat": 200000, "appartements": [{"loyer_mensuel": 650.0}], "nom_sci": "SCI"}
+    reordered = {"nom_sci": "SCI", "appartements": [{"loyer_mensuel": "650"}], "prix_achat": 200000.0}
+    assert web_app.payload_hash(payload) == web_app.payload_hash(reordered)
+    assert web_app.payload_hash(payload) != web_app.payload_hash({**payload, "prix_achat": 200001})
+
+
+def age_analysis(digest, seconds):
+    with web_app.session_scope() as session:
+        entry = session.get(web_app.AnalysisCacheEntry, digest)
+        entry.last_used_at = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+
+
+def last_used(digest):
+    with web_app.session_scope() as session:
+        return session.get(web_app.AnalysisCacheEntry, digest).last_used_at.replace(tzinfo=timezone.utc)
+
+
+def test_analysis_cache_lookup_and_retention(monkeypatch):
+    web_app.store_analysis("a" * 64, {"value": 1}, "report-a")
+    assert web_app.lookup_analysis("a" * 64) == {"result": {"value": 1}, "report_id": "report-a"}
+    # The persisted row, not the in-memory tier, decides whether a result is live
+    web_app.ANALYSIS_CACHE.clear()
+    assert web_app.lookup_analysis("a" * 64)["report_id"] == "report-a"
+    assert web_app.lookup_analysis("b" * 64) is None
+
+    age_analysis("a" * 64, web_app.ANALYSIS_STORE_TTL_SECONDS + 60)
+    web_app.ANALYSIS_CACHE.clear()
+    assert web_app.lookup_analysis("a" * 64) is None
+
+    monkeypatch.setattr(web_app, "ANALYSIS_STORE_MAX_ROWS", 3)
+    for index in range(5):
+        web_app.store_analysis(str(index) * 64, {"value": index}, f"report-{index}")
+    web_app.ANALYSIS_CACHE.clear()
+    with web_app.session_scope() as session:
+        kept = set(session.scalars(web_app.select(web_app.AnalysisCacheEntry.payload_hash)))
+    assert kept == {"2" * 64, "3" * 64, "4" * 64}
+
+
+def test_memory_hits_touch_the_persisted_row_sparingly(monkeypatch):
+    web_app.store_analysis("a" * 64, {"value": 1}, "report-a")
+    age_analysis("a" * 64, 3600)
+    stale = last_used("a" * 64)
+    # Touched by this process a moment ago: served from memory without a write
+    assert web_app.lookup_analysis("a" * 64)["report_id"] == "report-a"
+    assert last_used("a" * 64) == stale
+
+    monkeypatch.setattr(web_app, "ANALYSIS_TOUCH_INTERVAL_SECONDS", 0)
+    assert web_app.lookup_analysis("a" * 64)["report_id"] == "report-a"
+    assert last_used("a" * 64) > stale
+
+    # A row expired meanwhile is no longer served, and leaves the memory tier
+    age_analysis("a" * 64, web_app.ANALYSIS_STORE_TTL_SECONDS + 60)
+    assert web_app.lookup_analysis("a" * 64) is None
+    assert web_app.ANALYSIS_CACHE.info()["size"] == 0
+
+
+def test_analyze_endpoint_serves_cached_results(client, reference_cases, monkeypatch):
+    case = reference_cases["credit_30_ans_vacance_indexation"]
+    first = client.post("/api/analyze", json=case["payload"]).get_json()
+    assert_same_result({key: first[key] for key in case["resultat"]}, case["resultat"])
+
+    monkeypatch.setattr(web_app, "analyse_projet", lambda payload: pytest.fail("analysis recomputed"))
+    reordered = dict(reversed(list(case["payload"].items())))
+    second = client.post("/api/analyze", json=reordered).get_json()
+    assert second == first
+
+
+def test_analyze_report_is_built_on_first_download(client, reference_cases, reports_dir, monkeypatch):
+    case = reference_cases["credit_30_ans_vacance_indexation"]
+    body = client.post("/api/analyze", json=case["payload"]).get_json()
+    assert body["excel_url"] == f"/api/reports/{body['report_id']}/excel"
+    assert not any(reports_dir.iterdir())
+
+    builds = []
+    excel_report_bytes = web_app.excel_report_bytes
+    monkeypatch.setattr(
+        web_app, "excel_report_bytes", lambda *args: builds.append(args) or excel_report_bytes(*args)
+    )
+    for _ in range(2):
+        download = client.get(body["excel_url"])
+        assert download.status_code == 200
+        assert download.mimetype == XLSX_MIMETYPE
+        workbook = load_workbook(BytesIO(download.data))
+        assert workbook.sheetnames == ["Indicateurs", "Projection"]
+        assert workbook["Projection"].max_row == len(body["projection"]) + 1
+    assert len(builds) == 1
+    assert [path.name for path in reports_dir.iterdir()] == [f"rapport_{body['report_id']}.xlsx"]
+
+    assert client.get("/api/reports/unknown/excel").status_code == 404
+
+
+class RecordingPool:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, function, *args):
+        self.submitted.append(args)
+
+
+def add_job(status, worker_id=None, lease_offset=None):
+    with web_app.session_scope() as session:
+        if session.get(web_app.Project, "p1") is None:
+            session.add(web_app.Project(id="p1", nom_sci="SCI", payload={}, indicateurs={}, projection=[]))
+        lease = None if lease_offset is None else datetime.now(timezone.utc) + timedelta(seconds=lease_offset)
+        job = web_app.ReportJob(
+            project_id="p1",
+            excel_filename="projet_p1.xlsx",
+            status=status,
+            worker_id=worker_id,
+            lease_expires_at=lease,
+        )
+        session.add(job)
+        session.flush()
+        return job.id
+
+
+def job_state(job_id):
+    with web_app.session_scope() as session:
+        job = session.get(web_app.ReportJob, job_id)
+        return job.status, job.worker_id
+
+
+def test_requeue_only_takes_over_abandoned_jobs(monkeypatch):
+    pool = RecordingPool()
+    monkeypatch.setattr(web_app, "REPORT_WORKERS", pool)
+    queued = add_job("queued")
+    expired = add_job("running", "gone:1", lease_offset=-10)
+    unleased = add_job("running", "gone:2")
+    live = add_job("running", "alive:3", lease_offset=600)
+    done = add_job("done")
+
+    web_app.requeue_report_jobs()
+
+    assert sorted(pool.submitted) == sorted([(queued,), (expired,), (unleased,)])
+    assert job_state(expired) == ("queued", None)
+    assert job_state(unleased) == ("queued", None)
+    assert job_state(live) == ("running", "alive:3")
+    assert job_state(done) == ("done", None)
+
+
+def test_finish_ignores_jobs_owned_by_another_worker():
+    mine = add_job("running", web_app.WORKER_ID, lease_offset=600)
+    theirs = add_job("running", "other:1", lease_offset=600)
+    web_app._finish_report_job(mine, "done")
+    web_app._finish_report_job(theirs, "failed", "lost lease")
+    assert job_state(mine) == ("done", web_app.WORKER_ID)
+    assert job_state(theirs) == ("running", "other:1")
+
+
+def test_startup_tasks_run_once_before_the_first_request(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(web_app, "_startup_done", False)
+    monkeypatch.setattr(web_app, "purge_stale_analyses", lambda: calls.append("purge"))
+    monkeypatch.setattr(web_app.REPORT_STORE, "cleanup", lambda: calls.append("cleanup"))
+    monkeypatch.setattr(web_app, "requeue_report_jobs", lambda: calls.append("requeue"))
+
+    client.get("/api/jobs/unknown")
+    client.get("/api/jobs/unknown")
+    assert calls == ["purge", "cleanup", "requeue"]
+
+
+def test_maintenance_command_requeues_abandoned_jobs(monkeypatch):
+    pool = RecordingPool()
+    monkeypatch.setattr(web_app, "REPORT_WORKERS", pool)
+    expired = add_job("running", "gone:1", lease_offset=-10)
+
+    result = web_app.app.test_cli_runner().invoke(args=["maintenance"])
+    assert result.exit_code == 0, result.output
+    assert pool.submitted == [(expired,)]
+    assert job_state(expired) == ("queued", None)
+
+
+def wait_for_job(client, job_id):
+    for _ in range(200):
+        job = client.get(f"/api/jobs/{job_id}").get_json()["job"]
+        if job["status"] not in web_app.JOB_PENDING_STATUSES:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"report job {job_id} did not finish")
+
+
+def test_project_report_export(client, reference_cases, reports_dir):
+    case = reference_cases["pret_taux_zero_et_cca"]
+    created = client.post("/api/projects", json=case["payload"])
+    assert created.status_code == 201
+    body = created.get_json()
+    assert_same_result(body["indicateurs"], case["resultat"]["indicateurs"])
+
+    assert wait_for_job(client, body["report_job"]["id"])["status"] == "done"
+    for url in (body["excel_url"], body["report_job"]["result_url"]):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.mimetype == XLSX_MIMETYPE
+        workbook = load_workbook(BytesIO(response.data))
+        assert workbook["Projection"].max_row == len(case["resultat"]["projection"]) + 1
+
+    assert client.delete(f"/api/projects/{body['project_id']}").status_code == 200
+    assert not any(reports_dir.iterdir())
+    assert client.get(body["excel_url"]).status_code == 404
+
+
+def test_pending_report_answers_202_until_the_job_is_done(client, reference_cases, monkeypatch):
+    # The frontend polls the same URL while it answers 202, after Retry-After seconds
+    pool = RecordingPool()
+    monkeypatch.setattr(web_app, "REPORT_WORKERS", pool)
+    body = client.post("/api/projects", json=reference_cases["achat_comptant"]["payload"]).get_json()
+    job_id = body["report_job"]["id"]
+
+    for url in (body["excel_url"], body["report_job"]["result_url"]):
+        pending = client.get(url)
+        assert pending.status_code == 202
+        assert pending.headers["Retry-After"] == "1"
+        assert pending.mimetype == "application/json"
+        job = pending.get_json().get("report_job") or pending.get_json()["job"]
+        assert (job["id"], job["status"]) == (job_id, "queued")
+
+    assert pool.submitted == [(job_id,)]
+    web_app.run_report_job(job_id)
+    for url in (body["excel_url"], body["report_job"]["result_url"]):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.mimetype == XLSX_MIMETYPE
+
+
+def drop_project_keeping_jobs(project_id):
+    """Delete a project row without the cascade, as on a database that does not enforce foreign keys."""
+    with web_app.engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        try:
+            connection.execute(web_app.delete(web_app.Project).where(web_app.Project.id == project_id))
+            connection.commit()
+        finally:
+            connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+
+
+def test_job_of_a_missing_project_fails(monkeypatch):
+    monkeypatch.setattr(web_app, "REPORT_WORKERS", RecordingPool())
+    job_id = add_job("queued")
+    drop_project_keeping_jobs("p1")
+
+    web_app.run_report_job(job_id)
+    assert job_state(job_id) == ("failed", web_app.WORKER_ID)
+    web_app.requeue_report_jobs()
+    assert web_app.REPORT_WORKERS.submitted == []
+
+
+def test_project_export_reports_a_failed_job(client, reference_cases, monkeypatch):
+    def fail(*args):
+        raise RuntimeError("disque plein")
+
+    monkeypatch.setattr(web_app, "REPORT_WORKERS", RecordingPool())
+    monkeypatch.setattr(web_app, "generate_excel_report", fail)
+    body = client.post("/api/projects", json=reference_cases["achat_comptant"]["payload"]).get_json()
+    web_app.run_report_job(body["report_job"]["id"])
+
+    for url in (body["excel_url"], body["report_job"]["result_url"]):
+        response = client.get(url)
+        assert response.status_code == 500
+        assert response.get_json()["error"] == "disque plein"
+
+
+def age_report(report_id, seconds):
+    with web_app.session_scope() as session:
+        entry = session.get(web_app.StoredReport, report_id)
+        entry.last_access_at = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+
+
+def build_report(store, report_id, size):
+    store.register(report_id)
+    path = store.path_for(report_id)
+    path.write_bytes(b"x" * size)
+    store.record_built(report_id, path)
+    return path
+
+
+def test_report_store_expiry(reports_dir):
+    store = web_app.ReportStore(reports_dir, max_bytes=10_000, ttl_seconds=3600)
+    path = build_report(store, "old", 100)
+    assert store.lookup("old") == path
+    assert store.lookup("unknown") is None
+
+    age_report("old", 3700)
+    assert store.lookup("old") is None
+    store.cleanup()
+    assert not path.exists()
+    with web_app.session_scope() as session:
+        assert session.get(web_app.StoredReport, "old") is None
+
+
+def test_report_store_quota_evicts_least_recently_used(reports_dir):
+    store = web_app.ReportStore(reports_dir, max_bytes=250, ttl_seconds=3600)
+    first = build_report(store, "first", 100)
+    second = build_report(store, "second", 100)
+    age_report("first", 20)
+    age_report("second", 10)
+    # Looking the first report up makes the second one the least recently used
+    store.lookup("first")
+    third = build_report(store, "third", 100)
+
+    assert first.exists() and third.exists()
+    assert not second.exists()
+    assert store.lookup("second") is None
+    # Registered but not built yet: not counted against the quota
+    store.register("pending")
+    assert store.lookup("pending") == store.path_for("pending")
+
+
+def test_report_store_removes_orphaned_files(reports_dir):
+    store = web_app.ReportStore(reports_dir, max_bytes=10_000, ttl_seconds=3600)
+    with web_app.session_scope() as session:
+        session.add(
+            web_app.Project(
+                id="p1", nom_sci="SCI", payload={}, indicateurs={}, projection=[], excel_filename="projet_p1.xlsx"
+            )
+        )
+    stale = time.time() - web_app.REPORT_ORPHAN_GRACE_SECONDS - 60
+    names = ("rapport_new.xlsx", "rapport_old.xlsx", "projet_p1.xlsx", "projet_new.xlsx", "projet_old.xlsx")
+    files = {name: reports_dir / name for name in names}
+    for path in files.values():
+        path.write_bytes(b"x")
+    for name in ("rapport_old.xlsx", "projet_p1.xlsx", "projet_old.xlsx"):
+        os.utime(files[name], (stale, stale))
+
+    # Unreferenced files are only removed once older than the grace period
+    store.cleanup()
+    assert sorted(path.name for path in reports_dir.iterdir()) == [
+        "projet_new.xlsx",
+        "projet_p1.xlsx",
+        "rapport_new.xlsx",
+    ]
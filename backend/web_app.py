@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import socket
+import sys
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from threading import Event, Lock, Thread
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 from flask import Flask, jsonify, request, send_file
 from flask_cors import CORS
@@ -22,8 +32,12 @@ from sqlalchemy import (
     Integer,
     String,
     create_engine,
+    delete,
     event,
+    func,
+    or_,
     select,
+    update,
 )
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import (
@@ -34,6 +48,14 @@ from sqlalchemy.orm import (
     sessionmaker,
 )
 
+CURRENT_DIR = Path(__file__).resolve().parent
+PARENT_DIR = CURRENT_DIR.parent
+if str(PARENT_DIR) not in sys.path:
+    sys.path.insert(0, str(PARENT_DIR))
+
+from backend.core.calculators.fiscal import FiscalCalculator  # noqa: E402
+from backend.core.models.credit import agreger_par_annee  # noqa: E402
+
 app = Flask(__name__)
 
 default_allowed_origins = {
@@ -91,8 +113,18 @@ def ensure_cors_headers(response):
 REPORTS_DIR = Path(__file__).resolve().parent / "reports"
 REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
-# In-memory mapping between a generated report identifier and its Excel path
-REPORT_STORAGE: Dict[str, Path] = {}
+# Ad-hoc analysis reports: disk quota, idle lifetime, and grace period before
+# an unindexed file in REPORTS_DIR is considered orphaned
+REPORT_STORE_MAX_BYTES = int(os.environ.get("REPORT_STORE_MAX_BYTES", str(500 * 1024 * 1024)))
+REPORT_STORE_TTL_SECONDS = int(os.environ.get("REPORT_STORE_TTL_SECONDS", str(24 * 3600)))
+REPORT_ORPHAN_GRACE_SECONDS = 3600
+
+# Persisted analysis results: idle lifetime and maximum number of rows. The
+# lifetime should exceed the report one, reports being rebuilt from them.
+ANALYSIS_STORE_TTL_SECONDS = int(os.environ.get("ANALYSIS_STORE_TTL_SECONDS", str(7 * 24 * 3600)))
+ANALYSIS_STORE_MAX_ROWS = int(os.environ.get("ANALYSIS_STORE_MAX_ROWS", "10000"))
+# A result served from memory refreshes its row at most this often
+ANALYSIS_TOUCH_INTERVAL_SECONDS = ANALYSIS_STORE_TTL_SECONDS / 10
 
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
@@ -348,6 +380,67 @@ class CalculationResult(Base):
     project: Mapped[Project] = relationship(back_populates="calculation_results")
 
 
+class AnalysisCacheEntry(Base):
+    """Persisted analysis result, addressed by the hash of its canonical payload."""
+
+    __tablename__ = "analysis_cache"
+
+    payload_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    engine_version: Mapped[str] = mapped_column(String(32), nullable=False)
+    result: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    report_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+    )
+
+
+class StoredReport(Base):
+    """Index of ad-hoc report workbooks, shared by every server process."""
+
+    __tablename__ = "report_store"
+
+    report_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Unknown until the workbook is built
+    size_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    last_access_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+    )
+
+
+class ReportJob(Base):
+    """Background generation of a project's Excel report."""
+
+    __tablename__ = "report_jobs"
+
+    id: Mapped[str] = mapped_column(
+        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
+    )
+    project_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    excel_filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")
+    # Process running the job and end of its lease, renewed while it runs
+    worker_id: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    error: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
 try:
     Base.metadata.create_all(engine)
 except Exception as exc:  # pragma: no cover - defensive startup guard
@@ -378,7 +471,7 @@ def serialize_project(
         "created_at": project.created_at.isoformat() if project.created_at else None,
         "updated_at": project.updated_at.isoformat() if project.updated_at else None,
         "excel_url": (
-            f"/projects/{project.id}/export" if project.excel_filename else None
+            f"/api/projects/{project.id}/export" if project.excel_filename else None
         ),
         "indicateurs": project.indicateurs,
         "annee_creation": (
@@ -410,15 +503,121 @@ def delete_excel_file(filename: str | None) -> None:
         path.unlink(missing_ok=True)
 
 
-@dataclass
+@dataclass(frozen=True)
 class LoanSchedule:
-    """Holds yearly aggregates of a loan amortisation schedule."""
+    """Yearly aggregates of a loan amortisation schedule over the loan term.
+
+    The arrays are read-only: schedules are shared between analyses through
+    ``LOAN_SCHEDULE_CACHE``.
+    """
 
-    interest_per_year: List[float]
-    principal_per_year: List[float]
-    balance_per_year: List[float]
+    interest_per_year: np.ndarray
+    principal_per_year: np.ndarray
+    balance_per_year: np.ndarray
     monthly_payment: float
 
+    def for_years(self, years: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Interest, principal and balance for ``years`` years from the first one.
+
+        Past the loan term there is no interest nor principal and the balance
+        stays at its final value.
+        """
+        padding = max(years - len(self.balance_per_year), 0)
+        return (
+            np.concatenate((self.interest_per_year[:years], np.zeros(padding))),
+            np.concatenate((self.principal_per_year[:years], np.zeros(padding))),
+            np.concatenate(
+                (self.balance_per_year[:years], np.full(padding, self.balance_per_year[-1]))
+            ),
+        )
+
+
+class LRUCache:
+    """Bounded, thread-safe LRU mapping with hit and miss counters."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Any) -> Any:
+        """Cached value for ``key`` (``None`` when absent), marked as most recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        """Forget ``key`` if it is cached."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+@dataclass
+class _PendingCall:
+    done: Event
+    value: Any = None
+    error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Runs a callable at most once at a time per key; concurrent callers share its result."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._calls: Dict[Any, _PendingCall] = {}
+
+    def do(self, key: Any, function: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _PendingCall(Event())
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = function()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
 
 def _safe_float(value: Any, default: float = 0.0) -> float:
     try:
@@ -431,16 +630,17 @@ def _safe_float(value: Any, default: float = 0.0) -> float:
         return default
 
 
-def build_loan_schedule(
+def _compute_loan_schedule(
     capital: float, rate_percent: float, duration_years: int
 ) -> LoanSchedule:
     """Compute yearly interest, principal and remaining balance for a loan."""
 
     months = max(int(duration_years) * 12, 1)
+    years = max(int(duration_years), 1)
     if capital <= 0:
-        years = max(int(duration_years), 1)
-        zero_array = [0.0 for _ in range(max(years, 50))]
-        return LoanSchedule(zero_array, zero_array[:], zero_array[:], 0.0)
+        zero_array = np.zeros(years)
+        zero_array.setflags(write=False)
+        return LoanSchedule(zero_array, zero_array, zero_array, 0.0)
 
     monthly_rate = (rate_percent / 100.0) / 12.0
     if monthly_rate == 0:
@@ -448,60 +648,181 @@ def build_loan_schedule(
     else:
         monthly_payment = capital * (monthly_rate / (1 - (1 + monthly_rate) ** -months))
 
-    schedule: List[Tuple[float, float, float]] = []
-    balance = capital
-    for _ in range(months):
-        interest = balance * monthly_rate
-        principal = monthly_payment - interest
-        # Handle last payment rounding
-        if principal > balance:
-            principal = balance
-        balance -= principal
-        balance = max(balance, 0.0)
-        schedule.append((interest, principal, balance))
-
-    years = max(int(duration_years), 1)
-    interest_per_year: List[float] = []
-    principal_per_year: List[float] = []
-    balance_per_year: List[float] = []
-
-    for year_index in range(years):
-        start = year_index * 12
-        end = min((year_index + 1) * 12, len(schedule))
-        if start >= len(schedule):
-            interest_per_year.append(0.0)
-            principal_per_year.append(0.0)
-            balance_per_year.append(0.0)
-            continue
-
-        interest_sum = sum(entry[0] for entry in schedule[start:end])
-        principal_sum = sum(entry[1] for entry in schedule[start:end])
-        balance_end = schedule[end - 1][2] if end > start else schedule[start - 1][2]
-
-        interest_per_year.append(interest_sum)
-        principal_per_year.append(principal_sum)
-        balance_per_year.append(balance_end)
-
-    # Extend arrays when projection is longer than loan duration
-    last_balance = balance_per_year[-1] if balance_per_year else 0.0
-    target_length = max(50, len(interest_per_year))
-    for _ in range(len(interest_per_year), target_length):
-        interest_per_year.append(0.0)
-        principal_per_year.append(0.0)
-        balance_per_year.append(last_balance)
+    aggregates = agreger_par_annee(
+        capital,
+        monthly_rate,
+        monthly_payment,
+        months,
+        np.arange(1, years + 1),
+    )
+    for values in aggregates.values():
+        values.setflags(write=False)
 
     return LoanSchedule(
-        interest_per_year, principal_per_year, balance_per_year, monthly_payment
+        aggregates["interets"],
+        aggregates["capital_amorti"],
+        aggregates["capital_restant_fin"],
+        monthly_payment,
+    )
+
+
+LOAN_SCHEDULE_CACHE = LRUCache(int(os.environ.get("LOAN_SCHEDULE_CACHE_SIZE", "256")))
+
+
+def build_loan_schedule(
+    capital: float, rate_percent: float, duration_years: int
+) -> LoanSchedule:
+    """Yearly loan aggregates, served from ``LOAN_SCHEDULE_CACHE`` when already computed."""
+
+    # The rate is irrelevant when nothing is borrowed
+    if capital <= 0:
+        key = (0.0, 0.0, int(duration_years))
+    else:
+        key = (float(capital), float(rate_percent), int(duration_years))
+    schedule = LOAN_SCHEDULE_CACHE.get(key)
+    if schedule is None:
+        schedule = _compute_loan_schedule(*key)
+        LOAN_SCHEDULE_CACHE.put(key, schedule)
+    return schedule
+
+
+IS_CALCULATOR = FiscalCalculator()
+
+
+def compute_is(amount: float, year: Optional[int] = None) -> float:
+    return IS_CALCULATOR.calculer_is(amount, year)
+
+
+# Bump whenever analyse_projet or the Excel report changes: cached results
+# computed by another engine version are never served and are purged at startup.
+ANALYSIS_ENGINE_VERSION = "1"
+
+# Payload fields echoed back verbatim in the result, hashed as sent
+TEXT_PAYLOAD_FIELDS = frozenset({"nom_sci"})
+
+ANALYSIS_CACHE = LRUCache(int(os.environ.get("ANALYSIS_CACHE_SIZE", "128")))
+
+
+def _canonical_value(value: Any, key: Optional[str] = None) -> Any:
+    """Normalise a payload value the way the analysis reads it.
+
+    Numbers and numeric strings become floats and blank strings become
+    ``None``, as ``_safe_float`` sees them; other values are kept as sent.
+    """
+    if isinstance(value, dict):
+        return {str(k): _canonical_value(v, str(k)) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical_value(item) for item in value]
+    if value is None or isinstance(value, bool) or key in TEXT_PAYLOAD_FIELDS:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        if not value.strip():
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def payload_hash(payload: Dict[str, Any]) -> str:
+    """SHA-256 of the canonical payload, independent of key order and number formatting."""
+    canonical = json.dumps(
+        _canonical_value(payload), sort_keys=True, separators=(",", ":"), ensure_ascii=False
     )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
 
+def _analysis_expiry_cutoff() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=ANALYSIS_STORE_TTL_SECONDS)
+
+
+def lookup_analysis(digest: str) -> Optional[Dict[str, Any]]:
+    """Cached ``{"result", "report_id"}`` for a payload hash, from memory then from the database.
+
+    A hit marks the persisted row as used, so that a result served from
+    memory is not expired or evicted while its report is still live. Rows
+    touched by this process less than ``ANALYSIS_TOUCH_INTERVAL_SECONDS`` ago
+    are far from expiry and are served from memory without a write.
+    """
+    cached = ANALYSIS_CACHE.get(digest)
+    if cached is not None:
+        entry, touched_at = cached
+        if time.monotonic() - touched_at < ANALYSIS_TOUCH_INTERVAL_SECONDS:
+            return entry
+    else:
+        entry = None
+
+    with session_scope() as session:
+        touched = session.execute(
+            update(AnalysisCacheEntry)
+            .where(
+                AnalysisCacheEntry.payload_hash == digest,
+                AnalysisCacheEntry.engine_version == ANALYSIS_ENGINE_VERSION,
+                AnalysisCacheEntry.last_used_at >= _analysis_expiry_cutoff(),
+            )
+            .values(last_used_at=datetime.now(timezone.utc))
+        ).rowcount
+        if not touched:
+            ANALYSIS_CACHE.pop(digest)
+            return None
+        if entry is None:
+            row = session.get(AnalysisCacheEntry, digest)
+            entry = {"result": row.result, "report_id": row.report_id}
+
+    ANALYSIS_CACHE.put(digest, (entry, time.monotonic()))
+    return entry
+
+
+def store_analysis(digest: str, result: Dict[str, Any], report_id: str) -> None:
+    """Record an analysis result in both cache tiers, then enforce the retention limits."""
+    ANALYSIS_CACHE.put(digest, ({"result": result, "report_id": report_id}, time.monotonic()))
+    now = datetime.now(timezone.utc)
+    with session_scope() as session:
+        session.merge(
+            AnalysisCacheEntry(
+                payload_hash=digest,
+                engine_version=ANALYSIS_ENGINE_VERSION,
+                result=result,
+                report_id=report_id,
+                created_at=now,
+                last_used_at=now,
+            )
+        )
+        session.flush()
+        _prune_analyses(session)
+
+
+def _prune_analyses(session) -> None:
+    """Drop results idle for longer than the TTL, then the least recently used beyond the row cap."""
+    session.execute(
+        delete(AnalysisCacheEntry).where(AnalysisCacheEntry.last_used_at < _analysis_expiry_cutoff())
+    )
+    excess = session.scalar(select(func.count()).select_from(AnalysisCacheEntry)) - ANALYSIS_STORE_MAX_ROWS
+    if excess > 0:
+        oldest = (
+            select(AnalysisCacheEntry.payload_hash)
+            .order_by(AnalysisCacheEntry.last_used_at)
+            .limit(excess)
+            .scalar_subquery()
+        )
+        session.execute(
+            delete(AnalysisCacheEntry).where(AnalysisCacheEntry.payload_hash.in_(oldest))
+        )
+
+
+def purge_stale_analyses() -> None:
+    """Delete persisted results computed by another engine version or past their retention."""
+    with session_scope() as session:
+        session.execute(
+            delete(AnalysisCacheEntry).where(
+                AnalysisCacheEntry.engine_version != ANALYSIS_ENGINE_VERSION
+            )
+        )
+        _prune_analyses(session)
 
-def compute_is(amount: float) -> float:
-    if amount <= 0:
-        return 0.0
-    reduced_threshold = 42500
-    if amount <= reduced_threshold:
-        return amount * 0.15
-    return reduced_threshold * 0.15 + (amount - reduced_threshold) * 0.25
 
 
 def format_percent(value: float) -> str:
@@ -509,9 +830,14 @@ def format_percent(value: float) -> str:
 
 
 def generate_excel_report(
-    indicateurs: Dict[str, Any], projection: List[Dict[str, Any]], output_path: Path
+    indicateurs: Dict[str, Any],
+    projection: List[Dict[str, Any]],
+    output_path: Union[Path, BinaryIO],
 ) -> None:
-    """Create a simple Excel workbook containing indicators and yearly projection."""
+    """Create a simple Excel workbook containing indicators and yearly projection.
+
+    ``output_path`` is a file path or a binary stream such as ``BytesIO``.
+    """
 
     df_projection = pd.DataFrame(projection)
     df_indicateurs = pd.DataFrame([indicateurs])
@@ -521,6 +847,350 @@ def generate_excel_report(
         df_projection.to_excel(writer, sheet_name="Projection", index=False)
 
 
+def excel_report_bytes(
+    indicateurs: Dict[str, Any], projection: List[Dict[str, Any]]
+) -> bytes:
+    """Excel report built in memory, ready to be sent as a response body."""
+    buffer = BytesIO()
+    generate_excel_report(indicateurs, projection, buffer)
+    return buffer.getvalue()
+
+
+REPORT_BUILDS = SingleFlight()
+
+
+def _utc(moment: datetime) -> datetime:
+    # SQLite returns naive datetimes even for timezone-aware columns
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+class ReportStore:
+    """Ad-hoc report workbooks in ``directory``, indexed in the ``report_store`` table.
+
+    The index is shared by all server processes, so a report can be
+    downloaded from any of them. Reports not accessed for ``ttl_seconds``
+    expire; beyond ``max_bytes`` of built workbooks the least recently used
+    are evicted. Workbook files are only removed by :meth:`cleanup`, which
+    also deletes files that no index entry nor project refers to once they
+    are older than ``REPORT_ORPHAN_GRACE_SECONDS``.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int,
+        ttl_seconds: int,
+        cleanup_interval_seconds: int = 300,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.cleanup_interval_seconds = cleanup_interval_seconds
+        self._next_cleanup = 0.0
+        self._lock = Lock()
+
+    def path_for(self, report_id: str) -> Path:
+        return self.directory / f"rapport_{report_id}.xlsx"
+
+    def register(self, report_id: str) -> None:
+        """Add or refresh a report; its workbook may be built later."""
+        now = datetime.now(timezone.utc)
+        with session_scope() as session:
+            entry = session.get(StoredReport, report_id)
+            if entry is None:
+                session.add(
+                    StoredReport(
+                        report_id=report_id,
+                        filename=self.path_for(report_id).name,
+                        created_at=now,
+                        last_access_at=now,
+                    )
+                )
+            else:
+                entry.last_access_at = now
+        self.cleanup_if_due()
+
+    def lookup(self, report_id: str) -> Optional[Path]:
+        """Workbook path of a live report, marking it as recently used; ``None`` if unknown or expired."""
+        now = datetime.now(timezone.utc)
+        with session_scope() as session:
+            entry = session.get(StoredReport, report_id)
+            if entry is None:
+                return None
+            if (now - _utc(entry.last_access_at)).total_seconds() > self.ttl_seconds:
+                return None
+            entry.last_access_at = now
+            return self.directory / entry.filename
+
+    def record_built(self, report_id: str, path: Path) -> None:
+        """Account for a freshly built workbook and enforce the disk quota."""
+        with session_scope() as session:
+            session.execute(
+                update(StoredReport)
+                .where(StoredReport.report_id == report_id)
+                .values(size_bytes=path.stat().st_size)
+            )
+        self.cleanup()
+
+    def cleanup_if_due(self) -> None:
+        if time.monotonic() >= self._next_cleanup:
+            self.cleanup()
+
+    def cleanup(self) -> None:
+        """Drop expired and over-quota reports, then orphaned files."""
+        with self._lock:
+            self._next_cleanup = time.monotonic() + self.cleanup_interval_seconds
+            now = datetime.now(timezone.utc)
+            with session_scope() as session:
+                entries = session.scalars(
+                    select(StoredReport).order_by(StoredReport.last_access_at.desc())
+                ).all()
+                used_bytes = 0
+                dropped = set()
+                for entry in entries:
+                    expired = (now - _utc(entry.last_access_at)).total_seconds() > self.ttl_seconds
+                    over_quota = used_bytes + (entry.size_bytes or 0) > self.max_bytes
+                    if expired or over_quota:
+                        dropped.add(entry.filename)
+                        session.delete(entry)
+                    else:
+                        used_bytes += entry.size_bytes or 0
+                session.flush()
+                referenced = set(session.scalars(select(StoredReport.filename)))
+                referenced.update(
+                    session.scalars(
+                        select(Project.excel_filename).where(Project.excel_filename.is_not(None))
+                    )
+                )
+
+            for path in self.directory.glob("*.xlsx"):
+                if path.name in referenced:
+                    continue
+                # A file written moments ago may not be indexed yet; the
+                # workbooks of the entries dropped above go right away
+                try:
+                    if path.name in dropped or time.time() - path.stat().st_mtime > REPORT_ORPHAN_GRACE_SECONDS:
+                        path.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+REPORT_STORE = ReportStore(REPORTS_DIR, REPORT_STORE_MAX_BYTES, REPORT_STORE_TTL_SECONDS)
+
+
+def register_report(report_id: str) -> None:
+    """Make a report downloadable; its workbook is built on first download."""
+    REPORT_STORE.register(report_id)
+
+
+def _report_source(report_id: str) -> Optional[Dict[str, Any]]:
+    with session_scope() as session:
+        return session.scalar(
+            select(AnalysisCacheEntry.result).where(
+                AnalysisCacheEntry.report_id == report_id,
+                AnalysisCacheEntry.engine_version == ANALYSIS_ENGINE_VERSION,
+            )
+        )
+
+
+def load_excel_report(report_id: str) -> Union[Path, bytes, None]:
+    """Workbook of a report: its cached file, or its content when built by this call.
+
+    The first request builds the workbook in memory, serves it from there and
+    persists it for the next ones; concurrent first requests share one build.
+    ``None`` for unknown or expired reports.
+    """
+    path = REPORT_STORE.lookup(report_id)
+    if path is None or path.exists():
+        return path
+
+    def build() -> Union[Path, bytes, None]:
+        if path.exists():
+            return path
+        source = _report_source(report_id)
+        if source is None:
+            return None
+        content = excel_report_bytes(source["indicateurs"], source["projection"])
+        # Written under a temporary name so that a partial file is never served
+        temporary = path.with_name(f".{uuid.uuid4()}.xlsx")
+        try:
+            temporary.write_bytes(content)
+            os.replace(temporary, path)
+        finally:
+            temporary.unlink(missing_ok=True)
+        REPORT_STORE.record_built(report_id, path)
+        return content
+
+    return REPORT_BUILDS.do(report_id, build)
+
+
+# Project reports are generated off the request path by a bounded pool of
+# worker threads; job state lives in the report_jobs table.
+REPORT_WORKERS = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("REPORT_WORKER_COUNT", "2")),
+    thread_name_prefix="report-worker",
+)
+JOB_PENDING_STATUSES = ("queued", "running")
+# Clients poll the same URL while a report job is pending (202)
+JOB_RETRY_AFTER = {"Retry-After": "1"}
+# A running job whose lease is not renewed for this long is considered
+# abandoned by its process and may be requeued
+REPORT_JOB_LEASE_SECONDS = int(os.environ.get("REPORT_JOB_LEASE_SECONDS", "120"))
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+_HEARTBEAT_GUARD = Lock()
+_heartbeat_thread: Optional[Thread] = None
+_PROJECT_REPORT_LOCKS: Dict[str, Lock] = {}
+_PROJECT_REPORT_LOCKS_GUARD = Lock()
+
+
+def _project_report_lock(project_id: str) -> Lock:
+    with _PROJECT_REPORT_LOCKS_GUARD:
+        return _PROJECT_REPORT_LOCKS.setdefault(project_id, Lock())
+
+
+def serialize_job(job: ReportJob) -> Dict[str, Any]:
+    return {
+        "id": job.id,
+        "project_id": job.project_id,
+        "status": job.status,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "status_url": f"/api/jobs/{job.id}",
+        "result_url": f"/api/jobs/{job.id}/result",
+    }
+
+
+def enqueue_report_job(project_id: str, excel_filename: str) -> ReportJob:
+    """Record a report job for a committed project and hand it to the worker pool."""
+    with session_scope() as session:
+        job = ReportJob(project_id=project_id, excel_filename=excel_filename)
+        session.add(job)
+        session.flush()
+    REPORT_WORKERS.submit(run_report_job, job.id)
+    return job
+
+
+def _lease_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=REPORT_JOB_LEASE_SECONDS)
+
+
+def _renew_leases_forever() -> None:
+    """Extend the lease of every job this process is running."""
+    while True:
+        time.sleep(REPORT_JOB_LEASE_SECONDS / 3)
+        try:
+            with session_scope() as session:
+                session.execute(
+                    update(ReportJob)
+                    .where(ReportJob.worker_id == WORKER_ID, ReportJob.status == "running")
+                    .values(lease_expires_at=_lease_expiry())
+                )
+        except Exception:  # pragma: no cover - retried on the next beat
+            pass
+
+
+def _ensure_heartbeat() -> None:
+    global _heartbeat_thread
+    with _HEARTBEAT_GUARD:
+        if _heartbeat_thread is None:
+            _heartbeat_thread = Thread(
+                target=_renew_leases_forever, name="report-heartbeat", daemon=True
+            )
+            _heartbeat_thread.start()
+
+
+def _finish_report_job(job_id: str, status: str, error: Optional[str] = None) -> None:
+    # A job requeued after this process lost its lease belongs to its new owner
+    with session_scope() as session:
+        session.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.worker_id == WORKER_ID)
+            .values(
+                status=status,
+                error=error,
+                finished_at=datetime.now(timezone.utc),
+                lease_expires_at=None,
+            )
+        )
+
+
+def run_report_job(job_id: str) -> None:
+    """Build the workbook of a queued job; no transaction is open during file I/O."""
+    # Claiming the job atomically keeps a re-queued job from running twice
+    _ensure_heartbeat()
+    with session_scope() as session:
+        claimed = session.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status == "queued")
+            .values(status="running", worker_id=WORKER_ID, lease_expires_at=_lease_expiry())
+        ).rowcount
+        job = session.get(ReportJob, job_id) if claimed else None
+
+    if job is None:
+        return
+
+    # Jobs of the same project run one after the other and read the project
+    # when they start, so the last one always writes the latest analysis.
+    with _project_report_lock(job.project_id):
+        try:
+            with session_scope() as session:
+                project = session.get(Project, job.project_id)
+            if project is None:
+                _finish_report_job(job_id, "failed", "Projet introuvable")
+                return
+
+            target = REPORTS_DIR / job.excel_filename
+            temporary = target.with_name(f".{job.id}.xlsx")
+            try:
+                generate_excel_report(project.indicateurs, project.projection, temporary)
+                os.replace(temporary, target)
+            finally:
+                temporary.unlink(missing_ok=True)
+        except Exception as exc:
+            _finish_report_job(job_id, "failed", str(exc)[:1024])
+            return
+
+    _finish_report_job(job_id, "done")
+
+
+def requeue_report_jobs() -> None:
+    """Hand queued jobs and running jobs whose lease expired back to the worker pool.
+
+    Jobs still leased by a live process are left alone; a queued job handed to
+    several pools is only run by the first worker to claim it.
+    """
+    with session_scope() as session:
+        session.execute(
+            update(ReportJob)
+            .where(
+                ReportJob.status == "running",
+                or_(
+                    ReportJob.lease_expires_at.is_(None),
+                    ReportJob.lease_expires_at < datetime.now(timezone.utc),
+                ),
+            )
+            .values(status="queued", worker_id=None, lease_expires_at=None)
+        )
+        job_ids = session.scalars(
+            select(ReportJob.id)
+            .where(ReportJob.status == "queued")
+            .order_by(ReportJob.created_at)
+        ).all()
+
+    for job_id in job_ids:
+        REPORT_WORKERS.submit(run_report_job, job_id)
+
+
+def latest_report_job(session, project_id: str) -> Optional[ReportJob]:
+    return session.scalar(
+        select(ReportJob)
+        .where(ReportJob.project_id == project_id)
+        .order_by(ReportJob.created_at.desc())
+        .limit(1)
+    )
+
+
 def analyse_projet(payload: Dict[str, Any]) -> Dict[str, Any]:
     projection_years = int(payload.get("projection_years", 30))
     projection_years = min(max(projection_years, 1), 50)
@@ -594,152 +1264,121 @@ def analyse_projet(payload: Dict[str, Any]) -> Dict[str, Any]:
     amort_base_meubles = meubles
 
     loan_schedule = build_loan_schedule(capital_emprunte, taux_interet, duree_pret)
+    interets, capital_pret, dette_restante = loan_schedule.for_years(projection_years)
 
     investissement_total = (
         prix_achat + frais_notaire + frais_agence + travaux_initiaux + meubles
     )
     apport_total = apport + apport_cca + capital_social
 
-    tresorerie_cumulee = -apport_total
-    amortissements_cumules = 0.0
-    projection: List[Dict[str, Any]] = []
-
-    for year_index in range(projection_years):
-        annee = annee_achat + year_index
-        rent_factor = (1 + rent_indexation) ** year_index
-        inflation_factor = (1 + inflation) ** year_index
-
-        loyers = total_rent_base * rent_factor
-        charges_recup = base_charges_recup * rent_factor
-
-        taxe = taxe_fonciere * inflation_factor
-        copro = charges_copro * inflation_factor
-        comptable = frais_comptable * inflation_factor
-        pno = assurance_pno * inflation_factor
-        gli = loyers * assurance_gli_taux
-        gestion = loyers * frais_gestion_taux
-        entretien = frais_entretien * inflation_factor
-        gerant = honoraires_gerant * inflation_factor
-        crl = loyers * crl_rate
-        cfe = 0.0
-        gros_entretien = 0.0
-        if year_index + 1 == 10:
-            gros_entretien += travaux_entretien_10 * inflation_factor
-        if year_index + 1 == 20:
-            gros_entretien += travaux_entretien_20 * inflation_factor
-
-        frais_exceptionnels = frais_dossier + frais_garantie if year_index == 0 else 0.0
-
-        charges_exploitation = (
-            taxe
-            + copro
-            + comptable
-            + pno
-            + gli
-            + gestion
-            + entretien
-            + gerant
-            + crl
-            + cfe
-            + gros_entretien
-            + frais_exceptionnels
-        )
-
-        assurance_emprunt = capital_emprunte * assurance_emprunteur_taux
-        cca_interets = apport_cca * taux_interet_cca
-        interets = (
-            loan_schedule.interest_per_year[year_index]
-            if year_index < len(loan_schedule.interest_per_year)
-            else 0.0
-        )
-        charges_financieres = interets + assurance_emprunt + cca_interets
-
-        amort_batiment = (
-            amort_base_bat / duree_amort_bat if year_index < duree_amort_bat else 0.0
-        )
-        amort_travaux = (
-            amort_base_travaux / duree_amort_travaux
-            if year_index < duree_amort_travaux
-            else 0.0
-        )
-        amort_frais = (
-            amort_base_frais / duree_amort_frais
-            if year_index < duree_amort_frais
-            else 0.0
-        )
-        amort_meubles = (
-            amort_base_meubles / duree_amort_meubles
-            if year_index < duree_amort_meubles
-            else 0.0
-        )
-        amortissements_total = (
-            amort_batiment + amort_travaux + amort_frais + amort_meubles
-        )
-        amortissements_cumules += amortissements_total
-
-        resultat_exploitation = loyers - charges_exploitation - amortissements_total
-        resultat_avant_is = resultat_exploitation - charges_financieres
-        is_amount = compute_is(resultat_avant_is)
-        resultat_net = resultat_avant_is - is_amount
-
-        capital_pret = (
-            loan_schedule.principal_per_year[year_index]
-            if year_index < len(loan_schedule.principal_per_year)
-            else 0.0
-        )
-        cash_flow = (
-            loyers
-            + charges_recup
-            - charges_exploitation
-            - charges_financieres
-            - capital_pret
-            - is_amount
-        )
-        tresorerie_cumulee += cash_flow
-
-        actif_brut = investissement_total
-        valeur_nette_comptable = max(actif_brut - amortissements_cumules, 0.0)
-        dette_restante = (
-            loan_schedule.balance_per_year[year_index]
-            if year_index < len(loan_schedule.balance_per_year)
-            else 0.0
-        )
-        capitaux_propres = valeur_nette_comptable + tresorerie_cumulee - dette_restante
-
-        projection.append(
-            {
-                "annee": annee,
-                "loyers": loyers,
-                "charges_recuperables": charges_recup,
-                "charges_exploitation": charges_exploitation,
-                "charges_financieres": charges_financieres,
-                "amortissements_total": amortissements_total,
-                "resultat_avant_is": resultat_avant_is,
-                "is": is_amount,
-                "resultat_net": resultat_net,
-                "cash_flow": cash_flow,
-                "capital_pret": capital_pret,
-                "tresorerie_cumulee": tresorerie_cumulee,
-                "tresorerie_bilan": tresorerie_cumulee,
-                "mensualite_credit": loan_schedule.monthly_payment * 12,
-                "actif_immobilise_brut": actif_brut,
-                "amortissements_cumules": amortissements_cumules,
-                "valeur_nette_comptable": valeur_nette_comptable,
-                "capitaux_propres": capitaux_propres,
-                "dette_restante": dette_restante,
-                "taxe_fonciere": taxe,
-                "charges_copro": copro,
-                "frais_comptable": comptable,
-                "assurance_pno": pno,
-                "assurance_gli": gli,
-                "crl": crl,
-                "cfe": cfe,
-            }
-        )
+    # Every column is computed for all projection years at once; rows are only
+    # built at the end, for JSON serialisation.
+    year_index = np.arange(projection_years)
+    annee = annee_achat + year_index
+    # Python's pow, as in the historical per-year computation: without a loan the
+    # results are the same floats as that loop, term for term and in the same order
+    rent_factor = np.array([(1 + rent_indexation) ** index for index in range(projection_years)])
+    inflation_factor = np.array([(1 + inflation) ** index for index in range(projection_years)])
+
+    loyers, charges_recup = np.multiply.outer([total_rent_base, base_charges_recup], rent_factor)
+    taxe, copro, comptable, pno, entretien, gerant = np.multiply.outer(
+        [taxe_fonciere, charges_copro, frais_comptable, assurance_pno, frais_entretien, honoraires_gerant],
+        inflation_factor,
+    )
+    gli, gestion, crl = np.multiply.outer([assurance_gli_taux, frais_gestion_taux, crl_rate], loyers)
+    cfe = np.zeros(projection_years)
+    gros_entretien = np.zeros(projection_years)
+    if projection_years >= 10:
+        gros_entretien[9] = travaux_entretien_10 * inflation_factor[9]
+    if projection_years >= 20:
+        gros_entretien[19] = travaux_entretien_20 * inflation_factor[19]
+
+    frais_exceptionnels = np.zeros(projection_years)
+    frais_exceptionnels[0] = frais_dossier + frais_garantie
+
+    charges_exploitation = (
+        taxe
+        + copro
+        + comptable
+        + pno
+        + gli
+        + gestion
+        + entretien
+        + gerant
+        + crl
+        + cfe
+        + gros_entretien
+        + frais_exceptionnels
+    )
 
-    cash_flow_cumule_final = projection[-1]["tresorerie_cumulee"] if projection else 0.0
-    total_loyers = sum(item["loyers"] for item in projection)
-    total_charges = sum(item["charges_exploitation"] for item in projection)
+    assurance_emprunt = capital_emprunte * assurance_emprunteur_taux
+    cca_interets = apport_cca * taux_interet_cca
+    charges_financieres = interets + assurance_emprunt + cca_interets
+
+    amort_batiment = np.where(year_index < duree_amort_bat, amort_base_bat / duree_amort_bat, 0.0)
+    amort_travaux = np.where(year_index < duree_amort_travaux, amort_base_travaux / duree_amort_travaux, 0.0)
+    amort_frais = np.where(year_index < duree_amort_frais, amort_base_frais / duree_amort_frais, 0.0)
+    amort_meubles = np.where(year_index < duree_amort_meubles, amort_base_meubles / duree_amort_meubles, 0.0)
+    amortissements_total = amort_batiment + amort_travaux + amort_frais + amort_meubles
+    amortissements_cumules = np.cumsum(amortissements_total)
+
+    resultat_exploitation = loyers - charges_exploitation - amortissements_total
+    resultat_avant_is = resultat_exploitation - charges_financieres
+    is_amount = IS_CALCULATOR.calculer_is_tableau(resultat_avant_is, annee)
+    resultat_net = resultat_avant_is - is_amount
+
+    cash_flow = (
+        loyers
+        + charges_recup
+        - charges_exploitation
+        - charges_financieres
+        - capital_pret
+        - is_amount
+    )
+    tresorerie_cumulee = np.cumsum(np.concatenate(([-apport_total], cash_flow)))[1:]
+
+    actif_brut = investissement_total
+    valeur_nette_comptable = np.maximum(actif_brut - amortissements_cumules, 0.0)
+    capitaux_propres = valeur_nette_comptable + tresorerie_cumulee - dette_restante
+
+    columns = {
+        "loyers": loyers,
+        "charges_recuperables": charges_recup,
+        "charges_exploitation": charges_exploitation,
+        "charges_financieres": charges_financieres,
+        "amortissements_total": amortissements_total,
+        "resultat_avant_is": resultat_avant_is,
+        "is": is_amount,
+        "resultat_net": resultat_net,
+        "cash_flow": cash_flow,
+        "capital_pret": capital_pret,
+        "tresorerie_cumulee": tresorerie_cumulee,
+        "tresorerie_bilan": tresorerie_cumulee,
+        "mensualite_credit": loan_schedule.monthly_payment * 12,
+        "actif_immobilise_brut": actif_brut,
+        "amortissements_cumules": amortissements_cumules,
+        "valeur_nette_comptable": valeur_nette_comptable,
+        "capitaux_propres": capitaux_propres,
+        "dette_restante": dette_restante,
+        "taxe_fonciere": taxe,
+        "charges_copro": copro,
+        "frais_comptable": comptable,
+        "assurance_pno": pno,
+        "assurance_gli": gli,
+        "crl": crl,
+        "cfe": cfe,
+    }
+    keys = ("annee", *columns)
+    table = np.empty((projection_years, len(columns)))
+    for position, column in enumerate(columns.values()):
+        table[:, position] = column
+    projection: List[Dict[str, Any]] = [
+        dict(zip(keys, (year, *row))) for year, row in zip(annee.tolist(), table.tolist())
+    ]
+
+    cash_flow_cumule_final = float(tresorerie_cumulee[-1]) if projection else 0.0
+    total_loyers = sum(table[:, 0].tolist())
+    total_charges = sum(table[:, 2].tolist())
 
     loyers_initial = projection[0]["loyers"] if projection else 0.0
     charges_initial = projection[0]["charges_exploitation"] if projection else 0.0
@@ -767,11 +1406,8 @@ def analyse_projet(payload: Dict[str, Any]) -> Dict[str, Any]:
         (capital_emprunte / investissement_total * 100) if investissement_total else 0.0
     )
 
-    delai_rentabilite = None
-    for index, item in enumerate(projection, start=1):
-        if item["tresorerie_cumulee"] >= 0:
-            delai_rentabilite = index
-            break
+    rentable = tresorerie_cumulee >= 0
+    delai_rentabilite = int(np.argmax(rentable)) + 1 if rentable.any() else None
 
     indicateurs = {
         "investissement_total": investissement_total,
@@ -806,7 +1442,16 @@ def analyse_projet(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 @app.get("/api/health")
 def healthcheck() -> Tuple[str, int]:
-    return jsonify({"status": "ok"}), 200
+    return (
+        jsonify(
+            {
+                "status": "ok",
+                "loan_schedule_cache": LOAN_SCHEDULE_CACHE.info(),
+                "analysis_cache": ANALYSIS_CACHE.info(),
+            }
+        ),
+        200,
+    )
 
 
 @app.post("/api/analyze")
@@ -819,15 +1464,19 @@ def analyze_endpoint() -> Tuple[str, int]:
     if not isinstance(payload, dict):
         return jsonify({"success": False, "error": "Format de données invalide"}), 400
 
-    try:
-        result = analyse_projet(payload)
-    except Exception as exc:  # pragma: no cover - defensive error handling
-        return jsonify({"success": False, "error": str(exc)}), 500
+    digest = payload_hash(payload)
+    cached = lookup_analysis(digest)
+    if cached is not None:
+        result, report_id = cached["result"], cached["report_id"]
+    else:
+        try:
+            result = analyse_projet(payload)
+        except Exception as exc:  # pragma: no cover - defensive error handling
+            return jsonify({"success": False, "error": str(exc)}), 500
 
-    report_id = str(uuid.uuid4())
-    excel_path = REPORTS_DIR / f"rapport_{report_id}.xlsx"
-    generate_excel_report(result["indicateurs"], result["projection"], excel_path)
-    REPORT_STORAGE[report_id] = excel_path
+        report_id = str(uuid.uuid4())
+        store_analysis(digest, result, report_id)
+    register_report(report_id)
 
     result = {
         **result,
@@ -864,9 +1513,6 @@ def create_project() -> Tuple[str, int]:
 
     project_id = str(uuid.uuid4())
     excel_filename = f"projet_{project_id}.xlsx"
-    generate_excel_report(
-        analysis["indicateurs"], analysis["projection"], REPORTS_DIR / excel_filename
-    )
 
     with session_scope() as session:
         project = Project(
@@ -880,10 +1526,13 @@ def create_project() -> Tuple[str, int]:
         session.add(project)
         session.flush()
 
+    job = enqueue_report_job(project_id, excel_filename)
+
     response = {
         **analysis,
         "project_id": project_id,
-        "excel_url": f"/projects/{project_id}/export",
+        "excel_url": f"/api/projects/{project_id}/export",
+        "report_job": serialize_job(job),
         "project": serialize_project(
             project, include_payload=True, include_projection=True
         ),
@@ -929,14 +1578,8 @@ def update_project(project_id: str) -> Tuple[str, int]:
             session.rollback()
             return jsonify({"success": False, "error": str(exc)}), 500
 
-        delete_excel_file(project.excel_filename)
-
+        previous_excel = project.excel_filename
         excel_filename = f"projet_{project_id}.xlsx"
-        generate_excel_report(
-            analysis["indicateurs"],
-            analysis["projection"],
-            REPORTS_DIR / excel_filename,
-        )
 
         project.nom_sci = (
             analysis.get("nom_sci") or payload.get("nom_sci") or project.nom_sci
@@ -949,10 +1592,16 @@ def update_project(project_id: str) -> Tuple[str, int]:
         session.add(project)
         session.flush()
 
+    # The outdated workbook is removed once the transaction is committed so
+    # that it cannot be downloaded while the new one is being generated.
+    delete_excel_file(previous_excel)
+    job = enqueue_report_job(project_id, excel_filename)
+
     response = {
         **analysis,
         "project_id": project_id,
-        "excel_url": f"/projects/{project_id}/export",
+        "excel_url": f"/api/projects/{project_id}/export",
+        "report_job": serialize_job(job),
         "project": serialize_project(
             project, include_payload=True, include_projection=True
         ),
@@ -978,11 +1627,61 @@ def delete_project(project_id: str) -> Tuple[str, int]:
 def export_project_excel(project_id: str):
     with session_scope() as session:
         project = session.get(Project, project_id)
+        job = latest_report_job(session, project_id) if project else None
 
     if not project or not project.excel_filename:
         return jsonify({"success": False, "error": "Rapport introuvable"}), 404
 
     excel_path = REPORTS_DIR / project.excel_filename
+    if not excel_path.exists():
+        if job is not None and job.status in JOB_PENDING_STATUSES:
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": "Rapport en cours de génération",
+                        "report_job": serialize_job(job),
+                    }
+                ),
+                202,
+                JOB_RETRY_AFTER,
+            )
+        if job is not None and job.status == "failed":
+            return jsonify({"success": False, "error": job.error, "report_job": serialize_job(job)}), 500
+        return jsonify({"success": False, "error": "Rapport introuvable"}), 404
+
+    return send_file(
+        excel_path,
+        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        as_attachment=True,
+        download_name=excel_path.name,
+    )
+
+
+@app.get("/api/jobs/<job_id>")
+def get_job(job_id: str) -> Tuple[str, int]:
+    with session_scope() as session:
+        job = session.get(ReportJob, job_id)
+
+    if not job:
+        return jsonify({"success": False, "error": "Tâche introuvable"}), 404
+
+    return jsonify({"success": True, "job": serialize_job(job)}), 200
+
+
+@app.get("/api/jobs/<job_id>/result")
+def get_job_result(job_id: str):
+    with session_scope() as session:
+        job = session.get(ReportJob, job_id)
+
+    if not job:
+        return jsonify({"success": False, "error": "Tâche introuvable"}), 404
+    if job.status in JOB_PENDING_STATUSES:
+        return jsonify({"success": False, "job": serialize_job(job)}), 202, JOB_RETRY_AFTER
+    if job.status == "failed":
+        return jsonify({"success": False, "error": job.error, "job": serialize_job(job)}), 500
+
+    excel_path = REPORTS_DIR / job.excel_filename
     if not excel_path.exists():
         return jsonify({"success": False, "error": "Rapport introuvable"}), 404
 
@@ -996,17 +1695,53 @@ def export_project_excel(project_id: str):
 
 @app.get("/api/reports/<report_id>/excel")
 def download_excel(report_id: str):
-    path = REPORT_STORAGE.get(report_id)
-    if not path or not path.exists():
+    report = load_excel_report(report_id)
+    if report is None:
         return jsonify({"success": False, "error": "Rapport introuvable"}), 404
 
+    # send_file sets Content-Length for both paths and BytesIO
     return send_file(
-        path,
+        BytesIO(report) if isinstance(report, bytes) else report,
         mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         as_attachment=True,
-        download_name=path.name,
+        download_name=REPORT_STORE.path_for(report_id).name,
     )
 
 
+_STARTUP_GUARD = Lock()
+_startup_done = False
+
+
+def run_startup_tasks() -> None:
+    """Housekeeping run once per server process, before it serves its first request."""
+    global _startup_done
+    with _STARTUP_GUARD:
+        if _startup_done:
+            return
+        purge_stale_analyses()
+        REPORT_STORE.cleanup()
+        requeue_report_jobs()
+        _startup_done = True
+
+
+# Runs under ``python web_app.py`` and any WSGI server alike; the debug
+# reloader's watcher process never serves requests, so it never runs them.
+@app.before_request
+def _startup_before_first_request() -> None:
+    if not _startup_done:
+        run_startup_tasks()
+
+
+@app.cli.command("maintenance")
+def maintenance_command() -> None:
+    """Purge stale analyses and expired reports, requeue abandoned report jobs.
+
+    Run with ``flask --app web_app maintenance``.
+    """
+    purge_stale_analyses()
+    REPORT_STORE.cleanup()
+    requeue_report_jobs()
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5010, debug=True)
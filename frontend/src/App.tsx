@@ -13,6 +13,8 @@ import {
 import { useCallback, useEffect, useMemo, useState } from 'react';
 import { DarkResultsTabs } from './components/DarkResultsTabs';
 import { SCIForm } from './components/SCIForm';
+import { resolveApiUrl } from './lib/api-url';
+import { fetchReport } from './lib/report-download';
 
 type ViewState = 'list' | 'form' | 'results';
 
@@ -44,13 +46,7 @@ const formatDate = (value?: string | null) => {
 };
 
 const downloadExcelFile = async (url: string, filename?: string) => {
-  const response = await fetch(url);
-  if (!response.ok) {
-    const errorText = await response.text();
-    throw new Error(errorText || `Erreur ${response.status}`);
-  }
-
-  const blob = await response.blob();
+  const blob = await fetchReport(url);
   const objectUrl = window.URL.createObjectURL(blob);
   const link = document.createElement('a');
   link.href = objectUrl;
@@ -268,7 +264,7 @@ export default function App() {
       const safeName = project.nom_sci
         ? project.nom_sci.replace(/[^a-z0-9]+/gi, '_').replace(/^_+|_+$/g, '').toLowerCase()
         : 'rapport_sci';
-      await downloadExcelFile(`${baseUrl}${project.excel_url}`, `${safeName || 'rapport_sci'}_${project.id}.xlsx`);
+      await downloadExcelFile(resolveApiUrl(baseUrl, project.excel_url), `${safeName || 'rapport_sci'}_${project.id}.xlsx`);
     } catch (error: any) {
       setActionError(error.message || "Erreur lors de l'export Excel");
     } finally {
@@ -2,6 +2,8 @@ import { ArrowLeft, BarChart3, Brain, Building2, Download, Edit2, FileText, Tren
 import { useState } from 'react';
 import { AIProjectAnalysis } from './AIProjectAnalysis';
 import { BarChart, DonutChart, LineChart } from './ChartComponents';
+import { resolveApiUrl } from '../lib/api-url';
+import { fetchReport } from '../lib/report-download';
 
 interface DarkResultsTabsProps {
   data: any;
@@ -44,11 +46,7 @@ export function DarkResultsTabs({ data, onBack, onEdit }: DarkResultsTabsProps)
 
     try {
       setDownloading(true);
-      const response = await fetch(`${data.apiBaseUrl}${data.excel_url}`);
-      if (!response.ok) {
-        throw new Error(`Erreur téléchargement ${response.status}`);
-      }
-      const blob = await response.blob();
+      const blob = await fetchReport(resolveApiUrl(data.apiBaseUrl, data.excel_url));
       const url = window.URL.createObjectURL(blob);
       const link = document.createElement('a');
       link.href = url;
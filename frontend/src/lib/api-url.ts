@@ -0,0 +1,9 @@
+// Les URLs renvoyées par l'API (excel_url, status_url…) sont des chemins
+// absolus du serveur ("/api/…") : on les résout par rapport à l'origine de
+// l'API pour ne pas doubler le préfixe "/api" de VITE_API_URL.
+export const resolveApiUrl = (baseUrl: string, path: string): string => {
+  if (!path.startsWith('/api/')) {
+    return `${baseUrl}${path}`;
+  }
+  return new URL(path, new URL(baseUrl, window.location.origin)).toString();
+};
@@ -0,0 +1,26 @@
+// Le rapport Excel d'un projet est généré en tâche de fond : tant qu'il
+// n'est pas prêt, l'API répond 202 avec la tâche et un en-tête Retry-After.
+// On interroge alors la même URL jusqu'à obtenir le fichier ou une erreur.
+const MAX_ATTENTE_MS = 120_000;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+export const fetchReport = async (url: string): Promise<Blob> => {
+  const limite = Date.now() + MAX_ATTENTE_MS;
+  for (;;) {
+    const response = await fetch(url);
+    if (response.status !== 202) {
+      if (!response.ok) {
+        const errorText = await response.text();
+        throw new Error(errorText || `Erreur ${response.status}`);
+      }
+      return response.blob();
+    }
+
+    if (Date.now() >= limite) {
+      throw new Error('Le rapport Excel est toujours en cours de génération, réessayez plus tard.');
+    }
+    const retryAfter = Number(response.headers.get('Retry-After'));
+    await sleep(Number.isFinite(retryAfter) && retryAfter > 0 ? retryAfter * 1000 : 1000);
+  }
+};